@@ -1,13 +1,17 @@
 import ArticleGrid from "@/components/ArticleGrid";
 import Header from "@/components/Header";
 import { fetchArticles, getFilters } from "@/lib/supabase";
+import { fetchHomeSnapshot } from "@/lib/snapshot";
 
-export const dynamic = 'force-dynamic'; // Always fetch fresh data
+export const revalidate = 60; // Snapshot pointer is re-checked every minute
 
 export default async function HomePage() {
+  // Precomputed snapshot from the last scraper run; live queries as fallback
+  const snapshot = await fetchHomeSnapshot();
+
   // Fetch articles from last week (filtering happens client-side)
-  const articles = await fetchArticles({ hours: 168 });
-  const filters = await getFilters();
+  const articles = snapshot?.articles ?? await fetchArticles({ hours: 168 });
+  const filters = snapshot?.filters ?? await getFilters();
 
   return (
     <div className="min-h-screen bg-dark">
@@ -60,7 +64,7 @@ export default async function HomePage() {
       <footer className="bg-darker border-t border-gray-700 mt-12">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-6">
           <p className="text-text-tertiary text-sm text-center">
-            Last updated: {new Date().toLocaleString()}
+            Last updated: {new Date(snapshot?.generated_at ?? Date.now()).toLocaleString()}
           </p>
         </div>
       </footer>
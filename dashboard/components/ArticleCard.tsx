@@ -23,8 +23,17 @@ export default function ArticleCard({ article, initialSaved = false }: ArticleCa
       {article.image_url && (
         <div className="mb-4 rounded overflow-hidden">
           <img
-            src={article.image_url}
+            src={article.thumbnail_url || article.image_url}
             alt={article.title}
+            width={article.thumbnail_width ?? undefined}
+            height={article.thumbnail_height ?? undefined}
+            loading="lazy"
+            onError={(e) => {
+              // Fall back to the original if the thumbnail is unavailable
+              if (article.image_url && e.currentTarget.src !== article.image_url) {
+                e.currentTarget.src = article.image_url;
+              }
+            }}
             className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
           />
         </div>
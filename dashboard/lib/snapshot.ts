@@ -0,0 +1,61 @@
+import { gunzipSync } from 'node:zlib';
+import type { Article } from '@/lib/supabase';
+
+// Precomputed home page data published by tools/export_snapshot.py
+// (server-only: decompresses with node:zlib)
+
+const SNAPSHOT_VERSION = 1;
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
+const bucketUrl = `${supabaseUrl}/storage/v1/object/public/snapshots`;
+
+export interface HomeSnapshot {
+  version: number;
+  generated_at: string;
+  window_hours: number;
+  articles: Article[];
+  filters: {
+    competitors: string[];
+    sources: string[];
+  };
+  stats: {
+    total_articles: number;
+    competitors_tracked: number;
+    data_sources: number;
+    mentions: Record<string, number>;
+  };
+}
+
+// Fetch the latest snapshot, or null if none is published (or on any error)
+export async function fetchHomeSnapshot(): Promise<HomeSnapshot | null> {
+  if (!supabaseUrl) return null;
+
+  try {
+    // Small pointer file, replaced after each run
+    const pointerResponse = await fetch(`${bucketUrl}/home/latest.json`, {
+      next: { revalidate: 60 },
+    });
+    if (!pointerResponse.ok) return null;
+
+    const pointer = await pointerResponse.json();
+    if (pointer.version !== SNAPSHOT_VERSION) return null;
+
+    // Content-addressed snapshot file, never changes once written
+    const response = await fetch(`${bucketUrl}/${pointer.path}`, { cache: 'force-cache' });
+    if (!response.ok) return null;
+
+    const body = gunzipSync(Buffer.from(await response.arrayBuffer()));
+    const snapshot = JSON.parse(body.toString('utf-8')) as HomeSnapshot;
+    if (snapshot.version !== SNAPSHOT_VERSION) return null;
+
+    // Drop articles that aged out of the window since the snapshot was built
+    const cutoff = Date.now() - snapshot.window_hours * 3600 * 1000;
+    snapshot.articles = snapshot.articles.filter(
+      (article) => new Date(article.published_at).getTime() >= cutoff
+    );
+
+    return snapshot;
+  } catch (error) {
+    console.error('Error fetching snapshot:', error);
+    return null;
+  }
+}
@@ -20,8 +20,15 @@ export interface Article {
   scraped_at: string;
   summary: string | null;
   image_url: string | null;
+  image_width: number | null;
+  image_height: number | null;
+  thumbnail_url: string | null;
+  thumbnail_width: number | null;
+  thumbnail_height: number | null;
   author: string | null;
   created_at: string;
+  relevance_score: number | null;
+  relevance_scores: Record<string, number> | null;
 }
 
 export interface SavedArticle {
@@ -90,6 +97,25 @@ export async function fetchArticles(filters?: {
 
 // Get unique competitors and sources for filters
 export async function getFilters() {
+  // Distinct values from the competitor rollup (a few hundred rows at most)
+  const { data: rollup, error: rollupError } = await supabase
+    .from('article_filter_values')
+    .select('kind, value');
+
+  if (!rollupError && rollup?.length) {
+    const values = (kind: string) =>
+      rollup
+        .filter((row: any) => row.kind === kind)
+        .map((row: any) => row.value as string)
+        .sort();
+
+    return {
+      competitors: values('competitor'),
+      sources: values('source'),
+    };
+  }
+
+  // Fallback: rollup not migrated or not backfilled yet
   const { data, error } = await supabase
     .from('articles')
     .select('competitors, source');
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Parquet Article Archive
+Optional sink that keeps every fetched article, relevant or not, for offline
+analytics (e.g. which sources produce the most noise).
+
+- Enabled by setting ARCHIVE_DIR; scrapers call archive_articles() after scoring
+- One zstd-compressed Parquet file per scraper run, in Hive-style daily
+  partitions: ARCHIVE_DIR/date=YYYY-MM-DD/<source>-<time>-<id>.parquet
+- Each row has the normalized fields, the raw record as JSON, the best
+  relevance score and the filter decision
+- read_archive() uses pyarrow.dataset, so only the requested columns are read
+  and date/row-group filters skip whole files
+
+Needs pyarrow (pip install pyarrow); scrapers run unchanged without it.
+
+Usage:
+    python3 tools/article_archive.py --noise              # Noise ratio per source
+    python3 tools/article_archive.py --noise 2026-10-01   # ...since a date
+"""
+
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Rows per Parquet row group (unit of predicate pushdown within a file)
+ROW_GROUP_SIZE = 50_000
+
+# Filter decisions
+RELEVANT = "relevant"
+BELOW_THRESHOLD = "below_threshold"
+NO_MENTION = "no_mention"
+
+def get_archive_dir():
+    """Return the archive directory, or None if the sink is disabled."""
+    return os.getenv('ARCHIVE_DIR') or None
+
+def archive_schema():
+    """Arrow schema of archived rows."""
+    import pyarrow as pa
+
+    return pa.schema([
+        ("fetched_at", pa.timestamp("us", tz="UTC")),
+        ("scraper", pa.dictionary(pa.int32(), pa.string())),
+        ("source", pa.dictionary(pa.int32(), pa.string())),
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("summary", pa.string()),
+        ("author", pa.string()),
+        ("published_at", pa.timestamp("us", tz="UTC")),
+        ("competitors", pa.list_(pa.string())),
+        ("relevance_score", pa.float32()),
+        ("top_raw_score", pa.float32()),
+        ("relevant", pa.bool_()),
+        ("filter_decision", pa.dictionary(pa.int32(), pa.string())),
+        ("raw", pa.string()),
+    ])
+
+def parse_time(value):
+    """Parse an ISO timestamp into an aware datetime (None if missing/invalid)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def build_rows(scraper: str, raw_articles: list, normalized: list, scores, fetched_at: datetime) -> list:
+    """Turn one run's raw and scored articles into archive rows.
+
+    Args:
+        scraper: Scraper name (SOURCE_NAME)
+        raw_articles: Raw records from the source
+        normalized: Normalized articles after apply_scores()
+        scores: Score matrix from score_articles() (articles x competitors)
+        fetched_at: Run timestamp
+
+    Returns:
+        list: Row dicts matching archive_schema()
+    """
+    rows = []
+    for raw, article, row in zip(raw_articles, normalized, scores):
+        top = float(row.max()) if len(row) else 0.0
+        relevant = bool(article.get('competitors'))
+        rows.append({
+            "fetched_at": fetched_at,
+            "scraper": scraper,
+            "source": article.get('source'),
+            "url": article.get('url'),
+            "title": article.get('title'),
+            "summary": article.get('summary'),
+            "author": article.get('author'),
+            "published_at": parse_time(article.get('published_at')),
+            "competitors": article.get('competitors') or [],
+            "relevance_score": article.get('relevance_score', 0.0),
+            "top_raw_score": top,
+            "relevant": relevant,
+            "filter_decision": RELEVANT if relevant else (BELOW_THRESHOLD if top > 0 else NO_MENTION),
+            "raw": json.dumps(raw, default=str),
+        })
+    return rows
+
+def archive_articles(scraper: str, raw_articles: list, normalized: list, scores, fetched_at: datetime = None):
+    """Append one run's articles to the archive (no-op unless ARCHIVE_DIR is set).
+
+    Never raises: a failing archive write must not fail the scrape.
+
+    Args:
+        scraper: Scraper name (SOURCE_NAME)
+        raw_articles: Raw records from the source
+        normalized: Normalized articles after apply_scores()
+        scores: Score matrix from score_articles()
+        fetched_at: Run timestamp, defaults to now
+
+    Returns:
+        str or None: Path of the written file
+    """
+    archive_dir = get_archive_dir()
+    if not archive_dir or not raw_articles:
+        return None
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print(f"   ⚠️  ARCHIVE_DIR is set but pyarrow is not installed; skipping archive")
+        return None
+
+    try:
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        rows = build_rows(scraper, raw_articles, normalized, scores, fetched_at)
+        table = pa.Table.from_pylist(rows, schema=archive_schema())
+
+        partition = os.path.join(archive_dir, f"date={fetched_at.strftime('%Y-%m-%d')}")
+        os.makedirs(partition, exist_ok=True)
+        slug = ''.join(c if c.isalnum() else '-' for c in scraper.lower()).strip('-')
+        path = os.path.join(partition, f"{slug}-{fetched_at.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+
+        # Write under a hidden name so readers never see a partial file
+        tmp_path = os.path.join(partition, '.' + os.path.basename(path) + '.tmp')
+        pq.write_table(table, tmp_path, compression='zstd', row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+        return path
+    except Exception as e:
+        print(f"   ⚠️  Failed to archive articles: {e}")
+        return None
+
+def open_archive(archive_dir: str = None):
+    """Open the archive as a pyarrow dataset (partitioned by date)."""
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        archive_dir or get_archive_dir(),
+        format="parquet",
+        partitioning="hive",
+    )
+
+def read_archive(columns: list = None, filter=None, archive_dir: str = None):
+    """Read archived rows with column projection and predicate pushdown.
+
+    Args:
+        columns: Columns to read (None for all)
+        filter: pyarrow.dataset expression, e.g.
+            (ds.field('date') >= '2026-10-01') & (ds.field('relevant') == False)
+        archive_dir: Archive directory, defaults to ARCHIVE_DIR
+
+    Returns:
+        pyarrow.Table: Matching rows
+    """
+    return open_archive(archive_dir).to_table(columns=columns, filter=filter)
+
+def noise_by_source(since: str = None, archive_dir: str = None):
+    """Count fetched vs relevant articles per source.
+
+    Args:
+        since: Only include partitions on or after this date (YYYY-MM-DD)
+        archive_dir: Archive directory, defaults to ARCHIVE_DIR
+
+    Returns:
+        list: (source, fetched, relevant, noise_ratio) sorted by noise ratio
+    """
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    where = ds.field('date') >= since if since else None
+    table = read_archive(['source', 'relevant'], where, archive_dir)
+    table = table.set_column(0, 'source', pc.cast(table['source'], 'string'))
+    table = table.append_column('hit', pc.cast(table['relevant'], 'int64'))
+
+    grouped = table.group_by('source').aggregate([('hit', 'count'), ('hit', 'sum')]).to_pylist()
+    report = [
+        (g['source'], g['hit_count'], g['hit_sum'], 1 - g['hit_sum'] / g['hit_count'])
+        for g in grouped if g['hit_count']
+    ]
+    return sorted(report, key=lambda r: (-r[3], -r[1]))
+
+def main():
+    """Print the per-source noise report."""
+    if '--noise' not in sys.argv:
+        print("Usage: article_archive.py --noise [SINCE_DATE]")
+        sys.exit(2)
+
+    if not get_archive_dir():
+        print("❌ ARCHIVE_DIR is not set")
+        sys.exit(1)
+
+    idx = sys.argv.index('--noise')
+    since = sys.argv[idx + 1] if len(sys.argv) > idx + 1 else None
+
+    report = noise_by_source(since)
+
+    print(f"\n{'='*60}")
+    print(f"📦 Archive Noise Report{f' (since {since})' if since else ''}")
+    print(f"{'='*60}")
+    print(f"   {'Source':<30} {'Fetched':>8} {'Relevant':>9} {'Noise':>7}")
+    for source, fetched, relevant, noise in report:
+        print(f"   {str(source)[:30]:<30} {fetched:>8} {relevant:>9} {noise:>6.1%}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Historical Backfill Runner
+Splits a date range into chunks, fetches them in a process pool and streams
+each completed chunk into storage. Chunks stored without errors are
+checkpointed in the local state database, so re-running the same backfill
+resumes where it stopped and retries chunks that failed.
+
+Sources that can only be read newest first from page 1 (feed archives) use
+run_archive_backfill(): each feed is walked once over the whole range and its
+entries are split into the same chunks, instead of re-reading the first
+pages once per chunk.
+
+Used by the scrapers' `--backfill FROM TO` mode, e.g.:
+    python3 tools/scrape_rss.py --backfill 2026-01-01 2026-02-01
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone, timedelta
+from dateutil import parser
+
+from local_state import open_state
+
+# Defaults (override with BACKFILL_CHUNK_HOURS / BACKFILL_WORKERS)
+DEFAULT_CHUNK_HOURS = 24
+DEFAULT_WORKERS = 4
+
+def ensure_schema(conn):
+    """Create the backfill checkpoint table if missing."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backfill_chunks (
+            job TEXT NOT NULL,
+            chunk_start TEXT NOT NULL,
+            chunk_end TEXT NOT NULL,
+            articles INTEGER NOT NULL,
+            inserted INTEGER NOT NULL,
+            completed_at TEXT NOT NULL,
+            PRIMARY KEY (job, chunk_start)
+        )
+    """)
+
+def parse_backfill_args(argv: list):
+    """Return (start, end) datetimes for `--backfill FROM TO`, or None.
+
+    Raises:
+        ValueError: If --backfill is given without two valid dates
+    """
+    if '--backfill' not in argv:
+        return None
+
+    idx = argv.index('--backfill')
+    if len(argv) < idx + 3:
+        raise ValueError("Usage: --backfill FROM TO (e.g. --backfill 2026-01-01 2026-02-01)")
+
+    start, end = (to_utc(parser.parse(value)) for value in argv[idx + 1:idx + 3])
+    if start >= end:
+        raise ValueError("Backfill FROM must be before TO")
+
+    return start, end
+
+def to_utc(dt: datetime) -> datetime:
+    """Return dt as an aware UTC datetime."""
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def split_range(start: datetime, end: datetime, chunk_hours: int) -> list:
+    """Split [start, end) into consecutive chunks, newest first.
+
+    Returns:
+        list: (chunk_start, chunk_end) datetime tuples
+    """
+    chunks = []
+    chunk_end = end
+    while chunk_end > start:
+        chunk_start = max(start, chunk_end - timedelta(hours=chunk_hours))
+        chunks.append((chunk_start, chunk_end))
+        chunk_end = chunk_start
+    return chunks
+
+def chunk_of(dt: datetime, start: datetime, end: datetime, chunk_hours: int):
+    """Return the split_range() chunk containing dt (None if outside [start, end))."""
+    if not start <= dt < end:
+        return None
+    size = timedelta(hours=chunk_hours)
+    # Chunks counted back from end; a chunk includes its start, not its end
+    chunk_end = end - size * ((end - dt - timedelta(microseconds=1)) // size)
+    return (max(start, chunk_end - size), chunk_end)
+
+def completed_chunks(conn, job: str) -> set:
+    """Return the chunk start timestamps already checkpointed for a job."""
+    ensure_schema(conn)
+    rows = conn.execute("SELECT chunk_start FROM backfill_chunks WHERE job = ?", (job,)).fetchall()
+    return {row['chunk_start'] for row in rows}
+
+def checkpoint_chunk(conn, job: str, chunk: tuple, articles: int, inserted: int):
+    """Mark a chunk as completed."""
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO backfill_chunks
+                (job, chunk_start, chunk_end, articles, inserted, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (job, chunk[0].isoformat(), chunk[1].isoformat(), articles, inserted,
+              datetime.now(timezone.utc).isoformat()))
+
+def backfill_job(source_name: str, start: datetime, end: datetime, chunk_hours: int) -> str:
+    """Checkpoint key of a backfill."""
+    return f"{source_name}:{start.isoformat()}:{end.isoformat()}:{chunk_hours}h"
+
+def store_chunk(conn, job: str, chunk: tuple, raw_articles: list, process_fn, totals: dict,
+                checkpoint: bool = True) -> dict:
+    """Store one chunk and checkpoint it if every article was stored.
+
+    Args:
+        conn: Local state connection
+        job: Key from backfill_job()
+        chunk: (chunk_start, chunk_end)
+        raw_articles: Raw articles fetched for the chunk
+        process_fn: Function raw articles -> storage stats
+        totals: Running totals, updated in place
+        checkpoint: False if the chunk's articles may be incomplete
+
+    Returns:
+        dict: Storage statistics of the chunk
+    """
+    stats = process_fn(raw_articles) if raw_articles else {"inserted": 0, "errors": 0}
+    if checkpoint and not stats.get('errors'):
+        checkpoint_chunk(conn, job, chunk, len(raw_articles), stats.get('inserted', 0))
+    elif stats.get('errors'):
+        print(f"   ⚠️  Chunk {chunk[0]:%Y-%m-%d %H:%M}: {stats['errors']} storage errors "
+              f"(will retry on next run)")
+
+    totals['chunks'] += 1
+    totals['articles'] += len(raw_articles)
+    totals['inserted'] += stats.get('inserted', 0)
+    totals['errors'] += stats.get('errors', 0)
+    return stats
+
+def print_chunk_progress(chunk: tuple, raw_articles: list, stats: dict, totals: dict,
+                         chunk_count: int, started: float):
+    """Print one progress line after a chunk was stored."""
+    elapsed = time.monotonic() - started
+    rate = totals['articles'] / elapsed if elapsed else 0.0
+    eta = elapsed / totals['chunks'] * (chunk_count - totals['chunks'])
+    print(f"   ✅ Chunk {chunk[0]:%Y-%m-%d %H:%M}: {len(raw_articles)} articles, "
+          f"{stats.get('inserted', 0)} new | {totals['chunks']}/{chunk_count} chunks, "
+          f"{rate:.1f} articles/s, ETA {eta:.0f}s")
+
+def run_backfill(source_name: str, fetch_fn, process_fn, start: datetime, end: datetime) -> dict:
+    """Backfill a date range chunk by chunk.
+
+    Args:
+        source_name: Scraper name (part of the checkpoint job key)
+        fetch_fn: Picklable module-level function (start_iso, end_iso) -> raw articles,
+            run in worker processes
+        process_fn: Function raw articles -> storage stats, run in this process
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+
+    Returns:
+        dict: Totals (chunks, skipped_chunks, articles, inserted, errors, seconds)
+    """
+    chunk_hours = int(os.getenv('BACKFILL_CHUNK_HOURS', DEFAULT_CHUNK_HOURS))
+    workers = int(os.getenv('BACKFILL_WORKERS', DEFAULT_WORKERS))
+    job = backfill_job(source_name, start, end, chunk_hours)
+
+    conn = open_state()
+    done = completed_chunks(conn, job)
+    chunks = [c for c in split_range(start, end, chunk_hours) if c[0].isoformat() not in done]
+
+    totals = {"chunks": 0, "skipped_chunks": len(done), "articles": 0, "inserted": 0, "errors": 0}
+    print(f"📦 Backfill {start.date()} → {end.date()}: {len(chunks)} chunks to fetch, "
+          f"{len(done)} already done ({workers} workers)\n")
+
+    started = time.monotonic()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(fetch_fn, chunk[0].isoformat(), chunk[1].isoformat()): chunk
+                for chunk in chunks
+            }
+
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    raw_articles = future.result()
+                except Exception as e:
+                    print(f"   ❌ Chunk {chunk[0]:%Y-%m-%d %H:%M} failed: {e} (will retry on next run)")
+                    totals['errors'] += 1
+                    continue
+
+                stats = store_chunk(conn, job, chunk, raw_articles, process_fn, totals)
+                print_chunk_progress(chunk, raw_articles, stats, totals, len(chunks), started)
+    finally:
+        conn.close()
+
+    totals['seconds'] = time.monotonic() - started
+    return totals
+
+def run_archive_backfill(source_name: str, walk_fn, units: list, process_fn,
+                         start: datetime, end: datetime) -> dict:
+    """Backfill sources read newest first (feed archives) with one walk per source.
+
+    Every unit is walked once, in worker processes, over the span of the
+    chunks still to do; the entries are then split into the usual chunks and
+    stored and checkpointed chunk by chunk (same checkpoints as run_backfill).
+    If a walk fails, the chunks are still stored but not checkpointed.
+
+    Args:
+        source_name: Scraper name (part of the checkpoint job key)
+        walk_fn: Picklable module-level function (unit, start_iso, end_iso) ->
+            [(published ISO timestamp, raw article)] for articles in the range
+        units: What to walk (e.g. catalog feeds), each passed to walk_fn
+        process_fn: Function raw articles -> storage stats, run in this process
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+
+    Returns:
+        dict: Totals (chunks, skipped_chunks, articles, inserted, errors, seconds)
+    """
+    chunk_hours = int(os.getenv('BACKFILL_CHUNK_HOURS', DEFAULT_CHUNK_HOURS))
+    workers = int(os.getenv('BACKFILL_WORKERS', DEFAULT_WORKERS))
+    job = backfill_job(source_name, start, end, chunk_hours)
+
+    conn = open_state()
+    done = completed_chunks(conn, job)
+    chunks = [c for c in split_range(start, end, chunk_hours) if c[0].isoformat() not in done]
+
+    totals = {"chunks": 0, "skipped_chunks": len(done), "articles": 0, "inserted": 0, "errors": 0}
+    print(f"📦 Backfill {start.date()} → {end.date()}: {len(chunks)} chunks to fetch, "
+          f"{len(done)} already done; walking {len(units)} archives once ({workers} workers)\n")
+
+    started = time.monotonic()
+    try:
+        if not chunks:
+            totals['seconds'] = time.monotonic() - started
+            return totals
+
+        # Chunks are newest first; only walk the span they cover
+        span_start, span_end = chunks[-1][0].isoformat(), chunks[0][1].isoformat()
+        by_chunk = {chunk: [] for chunk in chunks}
+        complete = True
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(walk_fn, unit, span_start, span_end) for unit in units]
+            for future in as_completed(futures):
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    print(f"   ❌ Archive walk failed: {e} (chunks will retry on next run)")
+                    totals['errors'] += 1
+                    complete = False
+                    continue
+
+                for published, entry in entries:
+                    chunk = chunk_of(to_utc(parser.parse(published)), start, end, chunk_hours)
+                    if chunk in by_chunk:
+                        by_chunk[chunk].append(entry)
+
+        for chunk in chunks:
+            stats = store_chunk(conn, job, chunk, by_chunk[chunk], process_fn, totals, checkpoint=complete)
+            print_chunk_progress(chunk, by_chunk[chunk], stats, totals, len(chunks), started)
+    finally:
+        conn.close()
+
+    totals['seconds'] = time.monotonic() - started
+    return totals
+
+def print_backfill_summary(source_name: str, totals: dict):
+    """Print the final backfill report."""
+    rate = totals['articles'] / totals['seconds'] if totals['seconds'] else 0.0
+
+    print(f"\n{'='*60}")
+    print(f"✅ {source_name} Backfill Complete")
+    print(f"{'='*60}")
+    print(f"   Chunks Processed: {totals['chunks']} (resumed past {totals['skipped_chunks']})")
+    print(f"   Articles Fetched: {totals['articles']}")
+    print(f"   New Articles Stored: {totals['inserted']}")
+    print(f"   Errors: {totals['errors']}")
+    print(f"   Throughput: {rate:.1f} articles/s over {totals['seconds']:.1f}s")
+    print(f"\n")
+
+if __name__ == "__main__":
+    print(__doc__)
+    sys.exit(0)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+CPU Pool Scaling Benchmark
+Parses, normalizes and matches synthetic RSS feed payloads the way
+`CPU_WORKERS=N scrape_rss.py` does (cpu_pool.py), in process and with 1..N
+pool workers, and reports the scaling curve and the IPC volume per article.
+Also checks that every worker count gives the same records.
+
+Usage:
+    python3 tools/benchmark_cpu_pool.py             # 120 feeds, 1..cpu_count workers
+    python3 tools/benchmark_cpu_pool.py 400 16      # 400 feeds, 1..16 workers
+"""
+
+import os
+import pickle
+import random
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from competitors import COMPETITORS, RULE_TERMS
+from cpu_pool import CPUPool, chunk_payloads, CHUNK_BYTES
+from scrape_rss import parse_payloads
+
+ITEMS_PER_FEED = 40
+BODY_WORDS = 400
+
+FILLER = ("market price users update security release support team report new the and of to in "
+          "for with on exchange device app firmware backup recovery payments card bank").split()
+
+def make_feed(rng: random.Random, index: int, now: datetime) -> bytes:
+    """One RSS 2.0 document with HTML bodies, newest first."""
+    items = []
+    for i in range(ITEMS_PER_FEED):
+        words = [rng.choice(FILLER) for _ in range(BODY_WORDS)]
+        for _ in range(3):
+            words[rng.randrange(BODY_WORDS)] = rng.choice(COMPETITORS)
+            words[rng.randrange(BODY_WORDS)] = rng.choice(RULE_TERMS["crypto"])
+        body = "".join(f"<p>{' '.join(words[j:j + 50])}</p>" for j in range(0, BODY_WORDS, 50))
+        published = format_datetime(now - timedelta(minutes=17 * i + index))
+        items.append(f"""<item><title>{' '.join(rng.choice(FILLER) for _ in range(6))} {rng.choice(COMPETITORS)}</title>
+<link>https://feed{index}.example.com/post/{i}</link><pubDate>{published}</pubDate>
+<description>{' '.join(words[:30])}</description>
+<content:encoded><![CDATA[{body}]]></content:encoded></item>""")
+    return (f"""<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>Feed {index}</title>{''.join(items)}</channel></rss>""").encode()
+
+def make_payloads(count: int) -> list:
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    return [({"id": i, "name": f"Feed {i}", "url": f"https://feed{i}.example.com/rss", "parser": None,
+              "competitor_hints": [], "links": {}}, make_feed(rng, i, now)) for i in range(count)]
+
+def benchmark_cpu_pool(feed_count: int, max_workers: int):
+    """Report the parse/normalize/match scaling curve."""
+
+    print("\n" + "="*60)
+    print(f"🧪 Benchmarking CPU Pool Scaling ({feed_count} feeds, {os.cpu_count()} cores)")
+    print("="*60 + "\n")
+
+    payloads = make_payloads(feed_count)
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+    total_bytes = sum(len(body) for _, body in payloads)
+    parse = partial(parse_payloads, cutoff, False)
+
+    parse(payloads[:1])  # compile the matchers outside the timing, like the pool initializer
+    started = time.perf_counter()
+    expected, _ = parse(payloads)
+    inline = time.perf_counter() - started
+    articles = len(expected)
+    returned = len(pickle.dumps(expected, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f"   {articles:,} articles in {total_bytes / 1e6:.1f} MB of feeds; "
+          f"IPC per article: {total_bytes / articles / 1024:.1f} KB in, {returned / articles / 1024:.1f} KB out\n")
+    print(f"   {'Workers':>7} {'Tasks':>6} {'Time':>8} {'Articles/s':>11} {'Speedup':>8} {'Efficiency':>10}")
+    print(f"   {'inline':>7} {1:>6} {inline:>7.2f}s {articles / inline:>11,.0f} {1.0:>7.2f}x {'-':>10}")
+
+    failed = 0
+    for workers in range(1, max_workers + 1):
+        pool = CPUPool(workers)
+        try:
+            pool.map(parse, [[]] * workers)  # start and initialize every worker
+            chunks = chunk_payloads(payloads, pool.chunk_size(total_bytes, CHUNK_BYTES),
+                                    size_of=lambda payload: len(payload[1]))
+            started = time.perf_counter()
+            outputs = pool.map(parse, chunks)
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.close()
+
+        records = [record for chunk_records, _ in outputs for record in chunk_records]
+        failed += records != expected
+        speedup = inline / elapsed
+        print(f"   {workers:>7} {len(chunks):>6} {elapsed:>7.2f}s {articles / elapsed:>11,.0f} "
+              f"{speedup:>7.2f}x {speedup / min(workers, os.cpu_count() or 1):>9.0%}")
+    print()
+
+    if failed:
+        print(f"❌ {failed} worker count(s) returned different records\n")
+        sys.exit(1)
+
+    print("✅ Same records for every worker count\n")
+
+if __name__ == "__main__":
+    benchmark_cpu_pool(int(sys.argv[1]) if len(sys.argv) > 1 else 120,
+                       int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Feed Parser Benchmark
+Generates large RSS 2.0 and Atom fixtures (newest-first, full content:encoded
+bodies) and compares feedparser with the streaming parser (feed_stream.py):
+time and peak Python memory, for the normal lookback window and for a full
+read of the document. Checks that both return the same entries.
+
+Usage:
+    python3 tools/benchmark_feed_stream.py             # 1,000 entries per feed
+    python3 tools/benchmark_feed_stream.py 5000
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import feedparser
+
+from feed_stream import parse_feed_stream, parse_date, CHUNK_SIZE
+
+LOOKBACK_HOURS = 24
+HOURS_BETWEEN_ENTRIES = 2
+
+def body(i: int) -> str:
+    """Article body of roughly 4 KB, like a full-text WordPress feed."""
+    paragraph = f"<p>Hardware wallet update {i}: firmware, seed phrase backup and staking support. </p>"
+    return paragraph * 50
+
+def make_rss(count: int, now: datetime) -> bytes:
+    items = "".join(f"""
+    <item>
+      <title>Wallet news {i}</title>
+      <link>https://example.com/news/{i}</link>
+      <guid>https://example.com/news/{i}</guid>
+      <pubDate>{format_datetime(now - timedelta(hours=i * HOURS_BETWEEN_ENTRIES))}</pubDate>
+      <dc:creator>Author {i % 7}</dc:creator>
+      <description><![CDATA[Summary of article {i} about Ledger and Trezor.]]></description>
+      <content:encoded><![CDATA[{body(i)}]]></content:encoded>
+      <enclosure url="https://example.com/img/{i}.jpg" type="image/jpeg" length="0"/>
+    </item>""" for i in range(count))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel><title>Example</title><link>https://example.com</link><description>News</description>{items}
+  </channel>
+</rss>""".encode('utf-8')
+
+def make_atom(count: int, now: datetime) -> bytes:
+    entries = "".join(f"""
+  <entry>
+    <title>Wallet news {i}</title>
+    <link rel="alternate" href="https://example.com/atom/{i}"/>
+    <id>urn:example:{i}</id>
+    <published>{(now - timedelta(hours=i * HOURS_BETWEEN_ENTRIES)).isoformat()}</published>
+    <updated>{(now - timedelta(hours=i * HOURS_BETWEEN_ENTRIES)).isoformat()}</updated>
+    <author><name>Author {i % 7}</name></author>
+    <summary>Summary of article {i} about Ledger and Trezor.</summary>
+    <content type="html"><![CDATA[{body(i)}]]></content>
+  </entry>""" for i in range(count))
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Example</title><id>urn:example</id>
+  <updated>{now.isoformat()}</updated>{entries}
+</feed>""".encode('utf-8')
+
+def with_feedparser(data: bytes, cutoff: datetime) -> list:
+    """Baseline: what fetch_articles_from_feed did before (parse everything, then filter)."""
+    parsed = feedparser.parse(data)
+    return [e for e in parsed.entries
+            if cutoff is None or parse_date(e.get('published') or e.get('updated')) >= cutoff]
+
+def with_stream(data: bytes, cutoff: datetime) -> list:
+    chunks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return parse_feed_stream(chunks, cutoff)[0]
+
+def measure(func, *args) -> tuple:
+    """Return (result, seconds, peak traced memory in MB).
+
+    Timed and traced in separate runs (tracing slows pure-Python code a lot).
+    """
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def benchmark_feed_stream(count: int):
+    """Compare feedparser and the streaming parser on large feeds."""
+
+    print("\n" + "="*60)
+    print(f"🧪 Benchmarking Feed Parsers ({count:,} entries per feed)")
+    print("="*60 + "\n")
+
+    now = datetime.now(timezone.utc)
+    window = now - timedelta(hours=LOOKBACK_HOURS, minutes=1)
+    fixtures = {"RSS 2.0": make_rss(count, now), "Atom": make_atom(count, now)}
+
+    print(f"   {'Feed':<8} {'Read':<8} {'MB':>5} {'Entries':>8} {'feedparser':>18} {'streaming':>18} {'Speedup':>8}")
+    failed = 0
+    for name, data in fixtures.items():
+        for label, cutoff in (("window", window), ("full", None)):
+            baseline, base_s, base_mb = measure(with_feedparser, data, cutoff)
+            streamed, stream_s, stream_mb = measure(with_stream, data, cutoff)
+
+            same = [(e['title'], e['link']) for e in baseline] == [(e['title'], e['link']) for e in streamed]
+            if not same:
+                print(f"   ❌ {name} ({label}): entries differ ({len(baseline)} vs {len(streamed)})")
+                failed += 1
+                continue
+
+            print(f"   {name:<8} {label:<8} {len(data) / 1e6:>5.1f} {len(streamed):>8} "
+                  f"{base_s * 1000:>8.0f} ms {base_mb:>5.1f} MB "
+                  f"{stream_s * 1000:>8.1f} ms {stream_mb:>5.1f} MB {base_s / stream_s:>7.0f}x")
+
+    print()
+    if failed:
+        print(f"❌ {failed} comparison(s) failed\n")
+        sys.exit(1)
+
+    print("✅ Streaming parser returns the same entries\n")
+
+if __name__ == "__main__":
+    benchmark_feed_stream(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
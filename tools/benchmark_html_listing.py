@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+HTML Listing Benchmark
+Parses the saved listing pages in tools/fixtures/listings/ with the compiled
+lxml engine (html_listing.py) and with the SOP's BeautifulSoup html.parser
+pattern, checks that both extract the same articles, and reports the time
+per page.
+
+Usage:
+    python3 tools/benchmark_html_listing.py
+"""
+
+import os
+import statistics
+import sys
+import time
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from html_listing import compile_site, parse_listing
+from scrape_blogs import LISTING_SITES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'listings')
+RUNS = 30
+
+# Fixture file -> (site config, page URL, expected item count)
+FIXTURES = {
+    "ledger_blog_page1.html": ("Ledger Blog", "https://www.ledger.com/blog", 24),
+    "ledger_blog_page2.html": ("Ledger Blog", "https://www.ledger.com/blog/page/2", 24),
+    "tangem_blog.html": ("Tangem Blog", "https://tangem.com/en/blog/", 30),
+    "coinbase_blog.html": ("Coinbase Blog", "https://www.coinbase.com/blog", 20),
+}
+
+# The same fields written as one-off BeautifulSoup code (01_scraper_sop.md)
+SOUP_SELECTORS = {
+    "Ledger Blog": ("article.post-card", "h3", "a", "time", "p"),
+    "Tangem Blog": (".blog-card", ".blog-card__title", "a", "time", ".blog-card__description"),
+    "Coinbase Blog": ("a.cds-link", "h2", None, "time", "p"),
+}
+
+def parse_with_soup(name: str, page_url: str, content: bytes) -> list:
+    """Baseline: BeautifulSoup with the pure-Python html.parser."""
+    item_sel, title_sel, link_sel, time_sel, summary_sel = SOUP_SELECTORS[name]
+    soup = BeautifulSoup(content, 'html.parser')
+
+    articles = []
+    for item in soup.select(item_sel):
+        link = item.select_one(link_sel) if link_sel else item
+        published = item.select_one(time_sel)
+        articles.append({
+            "title": " ".join(item.select_one(title_sel).get_text().split()),
+            "link": urljoin(page_url, link['href']),
+            "published": published['datetime'] if published else None,
+            "summary": " ".join(item.select_one(summary_sel).get_text().split()),
+        })
+    return articles
+
+def time_ms(func) -> float:
+    """Median wall time of func() over RUNS runs, in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def benchmark_html_listing():
+    """Benchmark listing parsing on the saved fixtures."""
+
+    print("\n" + "="*60)
+    print("🧪 Benchmarking HTML Listing Engine")
+    print("="*60 + "\n")
+
+    started = time.perf_counter()
+    sites = {name: compile_site(name, config) for name, config in LISTING_SITES.items()}
+    print(f"   Compiled {len(sites)} site configs in {(time.perf_counter() - started) * 1000:.2f} ms\n")
+
+    print(f"   {'Fixture':<24} {'KB':>5} {'Items':>6} {'soup ms':>8} {'lxml ms':>8} {'Speedup':>8}")
+    failed = 0
+    speedups = []
+    for filename, (name, page_url, expected) in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+            content = f.read()
+
+        articles, next_url = parse_listing(sites[name], page_url, content)
+        baseline = parse_with_soup(name, page_url, content)
+
+        same = [(a['title'], a['link'], a.get('published'), a.get('summary')) for a in articles] == \
+               [(a['title'], a['link'], a['published'], a['summary']) for a in baseline]
+        if len(articles) != expected or not same:
+            print(f"   ❌ {filename}: {len(articles)} items (expected {expected}), matches baseline: {same}")
+            failed += 1
+            continue
+
+        soup_ms = time_ms(lambda: parse_with_soup(name, page_url, content))
+        lxml_ms = time_ms(lambda: parse_listing(sites[name], page_url, content))
+        speedups.append(soup_ms / lxml_ms)
+        print(f"   {filename:<24} {len(content) / 1024:>5.0f} {len(articles):>6} "
+              f"{soup_ms:>8.2f} {lxml_ms:>8.2f} {soup_ms / lxml_ms:>7.1f}x")
+
+    print()
+    if failed:
+        print(f"❌ {failed} fixture(s) parsed incorrectly\n")
+        sys.exit(1)
+
+    print(f"✅ All fixtures parsed identically, median speedup {statistics.median(speedups):.1f}x\n")
+
+if __name__ == "__main__":
+    benchmark_html_listing()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Search Index Benchmark
+Builds a synthetic index (default 1,000,000 articles over two years) and
+measures query latency for typical analyst queries: rare terms, phrases,
+boolean queries, and competitor and date facets.
+
+Usage:
+    python3 tools/benchmark_search_index.py            # 1M articles
+    python3 tools/benchmark_search_index.py 200000     # Smaller corpus
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_index import open_index, index_articles, search
+
+# Stored articles all mention a competitor; big names are mentioned far more often
+COMPETITORS = ["Coinbase", "Metamask", "Ledger", "Trezor", "Phantom", "Revolut", "Tangem", "Raby"]
+COMPETITOR_WEIGHTS = [30, 20, 20, 10, 10, 5, 3, 2]
+SOURCES = [f"source-{i}" for i in range(40)]
+BATCH = 20_000
+RUNS = 50
+
+# Selective queries (what analysts run); the target is < 10 ms at 1M articles
+QUERIES = [
+    ("rare term", dict(query="term12345")),
+    ("phrase", dict(query='"tangem card"')),
+    ("boolean", dict(query='(tangem OR trezor) AND firmware NOT seed')),
+    ("competitor facet", dict(query="firmware", competitor="Trezor")),
+    ("last month", dict(query="tangem AND card", since="{month_ago}")),
+    ("last week + facet", dict(query="security", competitor="Ledger", since="{week_ago}")),
+    ("prefix, last week", dict(query="stak*", since="{week_ago}")),
+]
+
+# Broad queries: cost grows with the length of the terms' posting lists
+BROAD_QUERIES = [
+    ("common term", dict(query="wallet")),
+    ("common phrase", dict(query='"crypto wallet"')),
+    ("common AND common", dict(query="bitcoin AND exchange")),
+    ("common term, rank all", dict(query="wallet", since="{month_ago}", rank_window=None)),
+]
+
+def build_vocabulary(rng: random.Random) -> list:
+    """Zipf-like vocabulary: a few very common words, a long tail of rare ones.
+
+    Per article (47 words): each common word appears in ~60% of articles, each
+    mid word in ~2%, each tail word in ~0.2%.
+    """
+    common = ["crypto", "wallet", "bitcoin", "price", "market", "exchange", "security", "update", "token", "user"]
+    mid = ["seed", "firmware", "staking", "card", "hardware", "mobile", "defi", "nft", "bridge", "swap"]
+    tail = [f"term{i}" for i in range(20_000)]
+    return common * 500 + mid * 10 + tail
+
+def make_article(i: int, rng: random.Random, vocabulary: list, start: datetime, span: float) -> dict:
+    tagged = sorted(set(rng.choices(COMPETITORS, COMPETITOR_WEIGHTS, k=rng.choice([1, 1, 1, 2]))))
+    words = lambda n: " ".join(rng.choice(vocabulary) for _ in range(n))
+    title = f"{' '.join(c.lower() for c in tagged)} {words(7)}"
+    if "Tangem" in tagged and rng.random() < 0.05:
+        title += " tangem card"
+    return {
+        "url": f"https://example.com/a/{i}",
+        "title": title,
+        "summary": words(40),
+        "competitors": tagged,
+        "source": rng.choice(SOURCES),
+        "published_at": (start + timedelta(seconds=rng.random() * span)).isoformat(),
+        "content_hash": str(i),
+    }
+
+def benchmark_search_index(count: int):
+    """Build the index and report query latencies."""
+
+    print("\n" + "="*60)
+    print(f"🧪 Benchmarking Search Index ({count:,} articles)")
+    print("="*60 + "\n")
+
+    rng = random.Random(7)
+    vocabulary = build_vocabulary(rng)
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(days=730)
+    span = (now - start).total_seconds()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'search.db')
+        conn = open_index(path)
+
+        started = time.perf_counter()
+        for offset in range(0, count, BATCH):
+            batch = [make_article(i, rng, vocabulary, start, span) for i in range(offset, min(count, offset + BATCH))]
+            index_articles(conn, batch)
+        conn.execute("INSERT INTO docs_fts(docs_fts) VALUES ('optimize')")
+        conn.commit()
+        build = time.perf_counter() - started
+        size = os.path.getsize(path) / 1e6
+        print(f"   Indexed {count:,} articles in {build:.1f}s ({count / build:,.0f}/s), {size:,.0f} MB\n")
+
+        dates = {"month_ago": (now - timedelta(days=30)).date().isoformat(),
+                 "week_ago": (now - timedelta(days=7)).date().isoformat()}
+
+        print(f"   {'Query':<24} {'Hits':>5} {'p50 ms':>8} {'p95 ms':>8}")
+        worst = 0.0
+        for label, queries in (("selective", QUERIES), ("broad", BROAD_QUERIES)):
+            for name, params in queries:
+                params = {k: v.format(**dates) if isinstance(v, str) else v for k, v in params.items()}
+                timings = []
+                for _ in range(RUNS):
+                    t = time.perf_counter()
+                    results = search(conn, **params)
+                    timings.append((time.perf_counter() - t) * 1000)
+                timings.sort()
+                p50, p95 = statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+                if label == "selective":
+                    worst = max(worst, p50)
+                print(f"   {name:<24} {len(results):>5} {p50:>8.2f} {p95:>8.2f}")
+            print()
+
+        conn.close()
+
+    print(f"{'✅' if worst < 10 else '⚠️ '} Slowest selective query (median): {worst:.2f} ms\n")
+
+if __name__ == "__main__":
+    benchmark_search_index(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Watchlist Matching Benchmark
+Times tagging synthetic articles against a growing number of team watchlists
+(watchlists.py): one combined matcher versus one matcher per watchlist (what
+running a scraper copy per team costs in matching alone). Also checks that
+both give the same tags.
+
+Usage:
+    python3 tools/benchmark_watchlists.py          # 300 articles
+    python3 tools/benchmark_watchlists.py 1000
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from competitors import RULE_TERMS
+from competitor_rules import RuleMatcher
+from watchlists import WatchlistMatcher
+
+WATCHLIST_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+LIST_SIZE = 12
+POOL_SIZE = 300
+BODY_WORDS = 600
+
+FILLER = ("market price users update security release support team report new the and of to in "
+          "for with on exchange device app firmware backup recovery payments card bank").split()
+
+def synthetic_watchlists(count: int, seed: int = 3) -> dict:
+    """Watchlists drawn from a shared pool of brands, so teams overlap."""
+    rng = random.Random(seed)
+    pool = [f"brand{i:03d}" for i in range(POOL_SIZE)]
+    watchlists = {}
+    for w in range(count):
+        names = rng.sample(pool, LIST_SIZE)
+        rules = {name: f"{name} NEAR/6 $crypto" for name in names[:3]}
+        watchlists[f"team{w:02d}"] = {"competitors": names, "aliases": {names[0]: [f"{names[0]} labs"]},
+                                      "rules": rules, "terms": {}}
+    return watchlists
+
+def make_articles(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    pool = [f"brand{i:03d}" for i in range(POOL_SIZE)]
+    crypto = RULE_TERMS["crypto"]
+    articles = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(BODY_WORDS)]
+        for _ in range(4):
+            words[rng.randrange(BODY_WORDS)] = rng.choice(pool)
+            words[rng.randrange(BODY_WORDS)] = rng.choice(crypto)
+        title = " ".join(rng.choice(FILLER) for _ in range(8)) + " " + rng.choice(pool)
+        articles.append((title, " ".join(words[:40]), " ".join(words)))
+    return articles
+
+def separate_matchers(watchlists: dict) -> list:
+    """Baseline: one compiled matcher per watchlist."""
+    return [(name, RuleMatcher(spec["competitors"], spec["rules"], spec["aliases"]))
+            for name, spec in watchlists.items()]
+
+def tag_separately(matchers: list, fields: tuple) -> dict:
+    tags = {}
+    for name, matcher in matchers:
+        found = matcher.detect(fields)
+        if found:
+            tags[name] = found
+    return tags
+
+def time_per_article(fn, articles: list) -> float:
+    started = time.perf_counter()
+    for fields in articles:
+        fn(fields)
+    return (time.perf_counter() - started) / len(articles) * 1e6
+
+def benchmark_watchlists(count: int):
+    """Time watchlist tagging as watchlists are added."""
+
+    print("\n" + "="*60)
+    print(f"🧪 Benchmarking Watchlist Matching ({count:,} articles, {BODY_WORDS} words)")
+    print("="*60 + "\n")
+
+    articles = make_articles(count)
+    mismatches = 0
+
+    print(f"   {'Lists':>5} {'Entries':>8} {'Combined':>11} {'Separate':>11} {'Speedup':>8}")
+    for watchlist_count in WATCHLIST_COUNTS:
+        watchlists = synthetic_watchlists(watchlist_count)
+        combined = WatchlistMatcher(watchlists)
+        separate = separate_matchers(watchlists)
+
+        mismatches += sum(combined.tag(fields) != tag_separately(separate, fields) for fields in articles)
+
+        combined_us = time_per_article(combined.tag, articles)
+        separate_us = time_per_article(lambda fields: tag_separately(separate, fields), articles)
+        print(f"   {watchlist_count:>5} {combined.entries:>8} {combined_us:>8.0f} µs {separate_us:>8.0f} µs "
+              f"{separate_us / combined_us:>7.1f}x")
+    print()
+
+    if mismatches:
+        print(f"❌ {mismatches} article(s) tagged differently by the combined matcher\n")
+        sys.exit(1)
+
+    print("✅ Same tags either way; combined cost follows distinct entries, not watchlist count\n")
+
+if __name__ == "__main__":
+    benchmark_watchlists(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
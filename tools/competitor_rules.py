@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Competitor Rule Matching
+Compiles the competitor rules (competitors.py) into one matcher shared by
+every scraper and by relevance scoring.
+
+Rule language:
+    ledger                  a word; a competitor name also matches its aliases
+    "general ledger"        a phrase (consecutive words)
+    $crypto                 a named term list (RULE_TERMS)
+    a AND b, a OR b, NOT a  boolean operators (adjacent operands mean AND)
+    a NEAR/5 b              a within 5 words of b, in the same field
+    title:a, body:(...)     field scoping (title, summary, body)
+    ( ... )                 grouping
+Precedence, tightest first: field scope, NOT, NEAR, AND, OR. NEAR operands
+must be words, phrases, term lists, OR groups of those, or NEAR expressions.
+
+Evaluation plan:
+- Every word and phrase used by any rule is interned once; phrases are
+  indexed by their first word
+- Each field is tokenized once (lowercase words); a set intersection finds
+  the vocabulary words present and only their positions are recorded, so
+  scan cost depends on text length, not on rule count
+- Only competitors whose name or aliases occur have their rule evaluated,
+  as compiled closures over the recorded positions
+- Rules decide whether an article is about the competitor; mentions of the
+  name and aliases are what relevance scoring counts
+- Further lists (watchlists.py) can be added to the same matcher; identical
+  entries are shared and the scan stays one pass per field
+
+Usage:
+    python3 tools/competitor_rules.py "Ledger Live adds Solana staking"
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+from competitors import COMPETITORS, COMPETITOR_ALIASES, COMPETITOR_RULES, RULE_TERMS
+
+FIELDS = ("title", "summary", "body")
+
+# Tokenizer: ASCII letters and digits (lowercased) form words, every other
+# byte separates them; non-ASCII characters become "?" first. Works on bytes,
+# several times faster than a regex over the text.
+WORD_BYTES = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c + 32 if 65 <= c <= 90 else c if 48 <= c <= 57 or 97 <= c <= 122 else 32 for c in range(256)))
+
+# Rule syntax tokens
+SYNTAX = re.compile(r"""
+    \s*(?:
+        (?P<open>\() | (?P<close>\)) |
+        "(?P<phrase>[^"]*)" |
+        NEAR/(?P<near>\d+) |
+        (?P<field>title|summary|body): |
+        \$(?P<list>\w+) |
+        (?P<word>[^\s()"]+)
+    )""", re.VERBOSE)
+OPERATORS = {"AND", "OR", "NOT"}
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens (bytes) of a text."""
+    return text.encode('ascii', 'replace').translate(WORD_BYTES).split()
+
+def words(text: str) -> tuple:
+    """Lowercase word tokens of a rule term."""
+    return tuple(tokenize(text))
+
+def lex(rule: str) -> list:
+    """Split a rule into (kind, value) tokens.
+
+    Raises:
+        ValueError: On characters the rule language doesn't allow
+    """
+    tokens, pos = [], 0
+    rule = rule.rstrip()
+    while pos < len(rule):
+        match = SYNTAX.match(rule, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unexpected text at {rule[pos:]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'word' and value in OPERATORS:
+            kind = value
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+class RuleCompiler:
+    """Recursive-descent parser that compiles rules to closures over term hits.
+
+    Compiled nodes are (positional, fn): positional nodes return a list of
+    (field, position) hits, the others a bool. `hits` maps a term id to the
+    hits of that word or phrase in the article.
+    """
+
+    def __init__(self, intern, expand, term_lists: dict = None):
+        self.intern = intern    # phrase tuple -> term id
+        self.expand = expand    # word -> phrase tuples (competitor aliases)
+        self.term_lists = RULE_TERMS if term_lists is None else term_lists
+
+    def compile(self, rule: str):
+        """Compile a rule to a function hits -> bool.
+
+        Raises:
+            ValueError: If the rule is invalid
+        """
+        self.tokens = lex(rule)
+        self.pos = 0
+        node = self.parse_or(None)
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.pos][1]!r} in rule {rule!r}")
+        return truth(node)
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse_or(self, fields):
+        nodes = [self.parse_and(fields)]
+        while self.peek() == 'OR':
+            self.take()
+            nodes.append(self.parse_and(fields))
+        if len(nodes) == 1:
+            return nodes[0]
+        if all(positional for positional, _ in nodes):
+            fns = [fn for _, fn in nodes]
+            return True, lambda hits: [hit for fn in fns for hit in fn(hits)]
+        tests = [truth(node) for node in nodes]
+        return False, lambda hits: any(test(hits) for test in tests)
+
+    def parse_and(self, fields):
+        nodes = [self.parse_near(fields)]
+        while self.peek() not in (None, 'OR', 'close'):
+            if self.peek() == 'AND':
+                self.take()
+            nodes.append(self.parse_near(fields))
+        if len(nodes) == 1:
+            return nodes[0]
+        tests = [truth(node) for node in nodes]
+        return False, lambda hits: all(test(hits) for test in tests)
+
+    def parse_near(self, fields):
+        node = self.parse_not(fields)
+        while self.peek() == 'near':
+            distance = int(self.take()[1])
+            right = self.parse_not(fields)
+            if not (node[0] and right[0]):
+                raise ValueError("NEAR needs words, phrases or term lists on both sides")
+            node = (True, near(node[1], right[1], distance))
+        return node
+
+    def parse_not(self, fields):
+        if self.peek() == 'NOT':
+            self.take()
+            test = truth(self.parse_not(fields))
+            return False, lambda hits: not test(hits)
+        return self.parse_atom(fields)
+
+    def parse_atom(self, fields):
+        kind = self.peek()
+        if kind is None:
+            raise ValueError("Rule ends unexpectedly")
+        _, value = self.take()
+
+        if kind == 'field':
+            return self.parse_atom(frozenset([FIELDS.index(value)]))
+        if kind == 'open':
+            node = self.parse_or(fields)
+            if self.peek() != 'close':
+                raise ValueError("Missing closing parenthesis")
+            self.take()
+            return node
+        if kind == 'phrase':
+            phrases = [words(value)]
+        elif kind == 'list':
+            if value not in self.term_lists:
+                raise ValueError(f"Unknown term list ${value}")
+            phrases = [words(term) for term in self.term_lists[value]]
+        elif kind == 'word':
+            phrases = self.expand(value)
+        else:
+            raise ValueError(f"Unexpected {value!r}")
+
+        ids = sorted({self.intern(p) for p in phrases if p})
+        if not ids:
+            raise ValueError(f"No words in {value!r}")
+        return True, terms(ids, fields)
+
+def truth(node):
+    """Boolean test for a compiled node."""
+    positional, fn = node
+    return (lambda hits: bool(fn(hits))) if positional else fn
+
+def terms(ids: list, fields: frozenset):
+    """Hits of any of the term ids (in the given fields, None for all)."""
+    if fields is None:
+        if len(ids) == 1:
+            term = ids[0]
+            return lambda hits: hits.get(term, ())
+        return lambda hits: [hit for term in ids for hit in hits.get(term, ())]
+    return lambda hits: [hit for term in ids for hit in hits.get(term, ()) if hit[0] in fields]
+
+def near(left, right, distance: int):
+    """Hits of left with a hit of right within distance words in the same field."""
+    def fn(hits):
+        others = right(hits)
+        if not others:
+            return []
+        return [hit for hit in left(hits)
+                if any(other[0] == hit[0] and abs(other[1] - hit[1]) <= distance for other in others)]
+    return fn
+
+class RuleMatcher:
+    """Matches articles against every competitor rule in one scan per field."""
+
+    def __init__(self, competitors: list = None, rules: dict = None, aliases: dict = None):
+        """Compile the rules.
+
+        Args:
+            competitors: Competitor names (default COMPETITORS; [] for an
+                empty matcher to fill with add_list())
+            rules: Rule per lowercase competitor name (default COMPETITOR_RULES);
+                competitors without one match their name or aliases
+            aliases: Extra spellings per lowercase name (default COMPETITOR_ALIASES)
+
+        Raises:
+            ValueError: If a rule is invalid
+        """
+        self.competitors = []  # per entry: lowercase name
+        self.mention_ids = []  # per entry: term ids of its name and aliases
+        self.rules = []        # per entry: compiled rule (None = any mention)
+        self.term_ids = {}     # phrase tuple -> term id
+        self.index = {}        # first word -> [(term id, rest of phrase)]
+        self.by_mention = {}   # name/alias term id -> entry indexes
+        self.signatures = {}   # (name, aliases, rule, terms) -> entry index
+
+        self.add_list(COMPETITORS if competitors is None else competitors,
+                      COMPETITOR_RULES if rules is None else rules,
+                      COMPETITOR_ALIASES if aliases is None else aliases)
+
+    def intern(self, phrase: tuple) -> int:
+        """Term id of a word or phrase, indexed by its first word."""
+        if phrase not in self.term_ids:
+            self.term_ids[phrase] = len(self.term_ids)
+            self.index.setdefault(phrase[0], []).append((self.term_ids[phrase], list(phrase[1:])))
+        return self.term_ids[phrase]
+
+    def add_list(self, competitors: list, rules: dict = None, aliases: dict = None,
+                 terms: dict = None) -> list:
+        """Add another list of competitors to the same scan.
+
+        Entries with the same name, aliases and rule as an existing one are
+        shared, so overlapping lists cost nothing extra to match.
+
+        Args:
+            competitors: Competitor names
+            rules: Rule per lowercase name (none by default)
+            aliases: Extra spellings per lowercase name (none by default)
+            terms: Extra named term lists for these rules (on top of RULE_TERMS)
+
+        Returns:
+            list: Entry index of each competitor, in order
+
+        Raises:
+            ValueError: If a rule is invalid
+        """
+        rules, aliases, terms = rules or {}, aliases or {}, terms or {}
+        spellings = {}
+        for competitor in competitors:
+            name = competitor.lower()
+            spellings[name] = [words(name)] + [words(a) for a in aliases.get(name, [])]
+
+        compiler = RuleCompiler(self.intern, lambda word: spellings.get(word.lower()) or [words(word)],
+                                {**RULE_TERMS, **terms})
+        entries = []
+        for name in [c.lower() for c in competitors]:
+            phrases = spellings[name]
+            rule = rules.get(name)
+            signature = (name, tuple(sorted(p for p in phrases if p)), rule,
+                         tuple(sorted((k, tuple(v)) for k, v in terms.items())) if rule else ())
+            if signature not in self.signatures:
+                try:
+                    compiled = compiler.compile(rule) if rule else None
+                except ValueError as e:
+                    raise ValueError(f"Invalid rule for {name}: {e}") from None
+
+                entry = len(self.competitors)
+                self.competitors.append(name)
+                self.mention_ids.append(sorted({self.intern(p) for p in phrases if p}))
+                self.rules.append(compiled)
+                for term in self.mention_ids[entry]:
+                    self.by_mention.setdefault(term, []).append(entry)
+                self.signatures[signature] = entry
+            entries.append(self.signatures[signature])
+
+        self.vocabulary = frozenset(self.index)
+        return entries
+
+    def scan(self, fields: tuple) -> dict:
+        """Find the hits of every rule term in an article.
+
+        Args:
+            fields: (title, summary, body) strings
+
+        Returns:
+            tuple: (term id -> [(field index, word position)], word count per field)
+        """
+        hits = {}
+        lengths = []
+        index = self.index
+        for f, text in enumerate(fields):
+            tokens = tokenize(text) if text else []
+            lengths.append(len(tokens))
+            present = self.vocabulary.intersection(tokens)
+            if not present:
+                continue
+            for pos in [i for i, token in enumerate(tokens) if token in present]:
+                for term, rest in index[tokens[pos]]:
+                    if not rest or tokens[pos + 1:pos + 1 + len(rest)] == rest:
+                        hits.setdefault(term, []).append((f, pos))
+        return hits, lengths
+
+    def match(self, fields: tuple) -> dict:
+        """Match an article against every competitor.
+
+        Args:
+            fields: (title, summary, body) strings
+
+        Returns:
+            tuple: (competitor index -> name/alias hits [(field index, word
+                position)] for competitors whose rule holds, word count per field)
+        """
+        hits, lengths = self.scan(fields)
+        candidates = sorted({c for term in hits for c in self.by_mention.get(term, ())})
+
+        matched = {}
+        for c in candidates:
+            rule = self.rules[c]
+            if rule is None or rule(hits):
+                matched[c] = sorted(hit for term in self.mention_ids[c] for hit in hits.get(term, ()))
+        return matched, lengths
+
+    def mentions(self, fields: tuple) -> dict:
+        """Per-field mention counts and first relative positions.
+
+        Returns:
+            dict: competitor index -> {field index: (count, first position 0..1)}
+        """
+        matched, lengths = self.match(fields)
+        result = {}
+        for c, found in matched.items():
+            per_field = {}
+            for f, pos in found:
+                count, first = per_field.get(f, (0, pos / max(lengths[f], 1)))
+                per_field[f] = (count + 1, first)
+            result[c] = per_field
+        return result
+
+    def detect(self, fields: tuple) -> list:
+        """Competitors (capitalized, in config order) whose rule matches."""
+        matched, _ = self.match(fields)
+        return [self.competitors[c].capitalize() for c in matched]
+
+@lru_cache(maxsize=8)
+def cached_matcher(competitors: tuple) -> RuleMatcher:
+    return RuleMatcher(list(competitors))
+
+def get_matcher(competitors: list = None) -> RuleMatcher:
+    """Shared compiled matcher for a competitor list (compiled once per process)."""
+    return cached_matcher(tuple(c.lower() for c in competitors or COMPETITORS))
+
+def matched_competitors(fields: tuple, competitors: list = None) -> list:
+    """Competitors mentioned in (title, summary, body) according to their rules."""
+    return get_matcher(competitors).detect(fields)
+
+def main():
+    """Show which competitors a text matches."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+    text = " ".join(sys.argv[1:])
+    found = matched_competitors((text, '', ''))
+    print(f"{'✅ ' + ', '.join(found) if found else 'ℹ️  No competitor matched'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Competitor Configuration
+Single source of truth for the tracked competitors, their aliases and their
+matching rules, shared by every scraper. TAG_VERSION hashes this config;
+stored articles carry the version they were tagged with, so
+retag_articles.py can skip rows that are already up to date.
+
+Rules use the language described in competitor_rules.py; competitors without
+a rule match any mention of their name or aliases.
+"""
+
+import hashlib
+import json
+
+COMPETITORS = [
+    "ledger", "trezor", "tangem", "coinbase",
+    "metamask", "revolut", "raby", "phantom"
+]
+
+# Extra spellings that count as a mention of the competitor
+COMPETITOR_ALIASES = {
+    "raby": ["rabby"],
+    "metamask": ["meta mask"],
+}
+
+# Named term lists, used in rules as $name
+RULE_TERMS = {
+    "crypto": ["crypto", "cryptocurrency", "cryptocurrencies", "bitcoin", "btc", "ethereum", "eth",
+               "solana", "sol", "blockchain", "wallet", "wallets", "token", "tokens", "defi", "nft",
+               "nfts", "stablecoin", "stablecoins", "web3", "staking", "seed phrase", "self custody"],
+    "ledger_products": ["ledger nano", "ledger live", "ledger stax", "ledger flex", "ledger recover"],
+    "ledger_company": ["ledger wallet", "ledger wallets", "ledger sas", "ledger ceo", "ledger cto",
+                       "ledger hardware", "ledger device", "ledger devices", "ledger donjon"],
+    "accounting": ["general ledger", "distributed ledger", "public ledger", "accounting ledger",
+                   "ledger entry", "ledger entries", "ledger balance", "ledger account", "bookkeeping"],
+}
+
+# Rules for names that are also ordinary words or non-crypto brands. Accounting
+# terms only rule out "ledger" when nothing points at the company itself.
+COMPETITOR_RULES = {
+    "ledger": "$ledger_products OR $ledger_company OR (ledger AND NOT $accounting)",
+    "phantom": "phantom NEAR/8 ($crypto OR app OR extension)",
+    "revolut": "revolut AND $crypto",
+}
+
+def competitor_terms(competitors: list = None) -> dict:
+    """Map every lowercase search term (name or alias) to its competitor."""
+    terms = {}
+    for competitor in competitors or COMPETITORS:
+        name = competitor.lower()
+        terms[name] = name
+        for alias in COMPETITOR_ALIASES.get(name, []):
+            terms[alias.lower()] = name
+    return terms
+
+def config_hash(competitors: list = None) -> str:
+    """Return a short, stable hash of the competitor config."""
+    names = {c.lower() for c in competitors or COMPETITORS}
+    payload = json.dumps([
+        sorted(competitor_terms(competitors).items()),
+        sorted((name, rule) for name, rule in COMPETITOR_RULES.items() if name in names),
+        sorted(RULE_TERMS.items()),
+    ])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+TAG_VERSION = config_hash()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Parallel CPU Stages
+Runs the CPU-bound part of a scrape (feed parsing, timestamp parsing,
+normalization and competitor/watchlist matching) in a persistent process
+pool, so it uses every core instead of one (the GIL).
+
+- Enabled with CPU_WORKERS (a number, or "auto" for one per core); unset or
+  0 keeps everything in the scraper process
+- The pool is started once per process and reused by every batch; each
+  worker compiles the competitor matcher and the watchlists on start-up
+- Work is shipped in chunks (up to CHUNK_ARTICLES raw articles or
+  CHUNK_BYTES of raw feed payloads per task, fewer for small runs so every
+  worker gets some), never one article per round trip
+- Workers send back compact records: the normalized row, the match fields,
+  the per-field mention counts relevance scoring needs and the watchlist
+  tags; raw records only come back when the Parquet archive is enabled
+
+Usage:
+    CPU_WORKERS=auto python3 tools/scrape_rss.py
+    python3 tools/benchmark_cpu_pool.py    # Scaling curve for 1..N workers
+"""
+
+import atexit
+import importlib
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from competitors import COMPETITORS
+from competitor_rules import get_matcher
+from watchlists import get_watchlist_matcher
+from article_archive import get_archive_dir
+
+# Raw articles per task
+CHUNK_ARTICLES = 256
+
+# Raw payload bytes per task (a single larger payload gets its own task)
+CHUNK_BYTES = 4 * 1024 * 1024
+
+# Smaller runs are split into about this many tasks per worker, so every
+# worker gets work and a slow chunk doesn't hold up the others for long
+TASKS_PER_WORKER = 4
+
+# Output of a prepare stage, one list entry per article
+Prepared = namedtuple('Prepared', 'raw normalized fields mentions tags')
+
+_pool = None
+
+def get_cpu_workers() -> int:
+    """Return the worker count from CPU_WORKERS (0 = run in process)."""
+    value = os.getenv('CPU_WORKERS', '0').strip().lower()
+    if value == 'auto':
+        return os.cpu_count() or 1
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return 0
+
+def init_worker():
+    """Compile the shared matchers once per worker process."""
+    get_matcher(COMPETITORS)
+    get_watchlist_matcher()
+
+class CPUPool:
+    """Persistent process pool for chunked CPU stages."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+    def map(self, fn, chunks: list) -> list:
+        """Run fn on every chunk in the pool.
+
+        Args:
+            fn: Picklable function taking one chunk
+            chunks: Work items, one task each
+
+        Returns:
+            list: fn results in chunk order
+        """
+        return list(self.executor.map(fn, chunks))
+
+    def chunk_size(self, total: int, cap: int) -> int:
+        """Items (or bytes) per task for a run of the given total size."""
+        return max(1, min(cap, -(-total // (self.workers * TASKS_PER_WORKER))))
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def get_pool(workers: int = None):
+    """Shared pool for this process (None when CPU_WORKERS is 0).
+
+    Args:
+        workers: Worker count, defaults to get_cpu_workers()
+
+    Returns:
+        CPUPool or None
+    """
+    global _pool
+    workers = get_cpu_workers() if workers is None else workers
+    if not workers:
+        return None
+    if _pool is None or _pool.workers != workers:
+        if _pool is not None:
+            _pool.close()
+        _pool = CPUPool(workers)
+        atexit.register(_pool.close)
+    return _pool
+
+def chunk_items(items: list, size: int = CHUNK_ARTICLES) -> list:
+    """Split a list into chunks of at most size items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def chunk_payloads(payloads: list, max_bytes: int = CHUNK_BYTES, size_of=len) -> list:
+    """Group payloads into chunks of about max_bytes.
+
+    Args:
+        payloads: Items to group, order kept
+        max_bytes: Target bytes per chunk
+        size_of: Size of one item
+
+    Returns:
+        list: Lists of payloads
+    """
+    chunks, current, current_bytes = [], [], 0
+    for payload in payloads:
+        size = size_of(payload)
+        if current and current_bytes + size > max_bytes:
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(payload)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+def prepare_records(module_name: str, raw_articles: list, keep_raw: bool = False) -> list:
+    """Normalize and match raw articles with a scraper's functions.
+
+    Runs in worker processes, or in the scraper process without a pool.
+
+    Args:
+        module_name: Scraper module with normalize_article() and extract_fields()
+        raw_articles: Raw records from the source
+        keep_raw: Return the raw records too (for the archive)
+
+    Returns:
+        list: (raw or None, normalized, fields, mentions, watchlist tags or None)
+            per article; mentions are RuleMatcher.mentions() of the fields
+    """
+    module = importlib.import_module(module_name)
+    matcher = get_matcher(COMPETITORS)
+    watchlists = get_watchlist_matcher()
+
+    records = []
+    for raw in raw_articles:
+        fields = module.extract_fields(raw)
+        records.append((
+            raw if keep_raw else None,
+            module.normalize_article(raw),
+            fields,
+            matcher.mentions(fields),
+            watchlists.tag(fields) if watchlists.matcher else None,
+        ))
+    return records
+
+def collect(records: list, raw_articles: list = None) -> Prepared:
+    """Turn prepare_records() output into a Prepared of parallel lists.
+
+    Args:
+        records: Records in article order
+        raw_articles: Raw records, when the caller still has them
+    """
+    if not records:
+        return Prepared([], [], [], [], [])
+    raw, normalized, fields, mentions, tags = (list(column) for column in zip(*records))
+    return Prepared(raw_articles if raw_articles is not None else raw, normalized, fields, mentions, tags)
+
+def prepare_articles(module_name: str, raw_articles: list, pool: CPUPool = None) -> Prepared:
+    """Normalize and match raw articles, in the pool if there is one.
+
+    Args:
+        module_name: Scraper module (e.g. 'scrape_newsdata')
+        raw_articles: Raw records from the source
+        pool: Pool from get_pool(), None to run in this process
+
+    Returns:
+        Prepared: raw, normalized, fields, mentions and watchlist tags per article
+    """
+    if pool is None:
+        return collect(prepare_records(module_name, raw_articles), raw_articles)
+
+    size = pool.chunk_size(len(raw_articles), CHUNK_ARTICLES)
+    results = pool.map(partial(prepare_records, module_name), chunk_items(raw_articles, size))
+    return collect([record for chunk in results for record in chunk], raw_articles)
+
+def keep_raw_records() -> bool:
+    """Whether workers must return raw records (only the archive reads them)."""
+    return get_archive_dir() is not None
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Dashboard Snapshot Export
+Precomputes the dashboard home page data (articles of the last 168 hours,
+filter values and stats) after a scraper run, so page views don't query
+Supabase.
+
+- Articles are pre-sorted by published_at (newest first), like fetchArticles()
+- The snapshot is compact, gzip-compressed JSON with a format version
+- Published atomically to the public `snapshots` Storage bucket (migration 009):
+  the content-addressed file home/<sha1>.json.gz is uploaded first (immutable,
+  cached for a year), then the small home/latest.json pointer is replaced, so
+  readers see either the old or the new snapshot, never a partial one
+- Older snapshot files beyond SNAPSHOT_KEEP are removed
+
+Usage:
+    python3 tools/export_snapshot.py                          # Publish to Storage
+    python3 tools/export_snapshot.py --output snapshot.json.gz  # Write a local file
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+# Load environment
+load_dotenv()
+
+# Snapshot settings
+SNAPSHOT_VERSION = 1
+WINDOW_HOURS = 168
+MAX_ARTICLES = 100  # Same default limit as fetchArticles() (override with SNAPSHOT_MAX_ARTICLES)
+BUCKET = "snapshots"
+PREFIX = "home"
+SNAPSHOT_KEEP = 5
+POINTER_CACHE_SECONDS = 60
+IMMUTABLE_CACHE_SECONDS = 31536000
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def fetch_filters(supabase: Client, articles: list) -> dict:
+    """Return sorted distinct competitors and sources.
+
+    Reads the article_filter_values view (migration 004); falls back to the
+    values present in the exported articles.
+    """
+    try:
+        rows = supabase.table('article_filter_values').select('kind, value').execute().data or []
+    except Exception:
+        rows = []
+
+    if rows:
+        return {
+            "competitors": sorted(r['value'] for r in rows if r['kind'] == 'competitor'),
+            "sources": sorted(r['value'] for r in rows if r['kind'] == 'source'),
+        }
+
+    return {
+        "competitors": sorted({c for a in articles for c in a.get('competitors') or []}),
+        "sources": sorted({a['source'] for a in articles if a.get('source')}),
+    }
+
+def build_snapshot(supabase: Client, hours: int = WINDOW_HOURS, limit: int = None) -> dict:
+    """Build the home page snapshot.
+
+    Args:
+        supabase: Supabase client
+        hours: Time window in hours
+        limit: Maximum number of articles, defaults to SNAPSHOT_MAX_ARTICLES
+
+    Returns:
+        dict: Snapshot (version, generated_at, articles, filters, stats)
+    """
+    limit = limit or int(os.getenv('SNAPSHOT_MAX_ARTICLES', MAX_ARTICLES))
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(hours=hours)).isoformat()
+
+    articles = supabase.table('articles').select('*') \
+        .gte('published_at', cutoff) \
+        .order('published_at', desc=True) \
+        .limit(limit).execute().data or []
+
+    filters = fetch_filters(supabase, articles)
+
+    mentions = {}
+    for article in articles:
+        for competitor in article.get('competitors') or []:
+            mentions[competitor] = mentions.get(competitor, 0) + 1
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "generated_at": now.isoformat(),
+        "window_hours": hours,
+        "articles": articles,
+        "filters": filters,
+        "stats": {
+            "total_articles": len(articles),
+            "competitors_tracked": len(filters['competitors']),
+            "data_sources": len(filters['sources']),
+            "mentions": dict(sorted(mentions.items(), key=lambda kv: -kv[1])),
+        },
+    }
+
+def encode_snapshot(snapshot: dict) -> tuple:
+    """Serialize a snapshot to gzip-compressed compact JSON.
+
+    Returns:
+        tuple: (compressed bytes, sha1 of the uncompressed JSON)
+    """
+    payload = json.dumps(snapshot, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    # mtime=0 keeps the output byte-identical for identical snapshots
+    return gzip.compress(payload, compresslevel=9, mtime=0), hashlib.sha1(payload).hexdigest()
+
+def write_local(path: str, data: bytes):
+    """Write a snapshot file atomically (temp file + rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def publish(supabase: Client, snapshot: dict, data: bytes, digest: str) -> str:
+    """Upload a snapshot and switch the latest pointer to it.
+
+    Returns:
+        str: Storage path of the snapshot file
+    """
+    bucket = supabase.storage.from_(BUCKET)
+    path = f"{PREFIX}/{digest}.json.gz"
+
+    bucket.upload(path, data, file_options={
+        "content-type": "application/gzip",
+        "cache-control": str(IMMUTABLE_CACHE_SECONDS),
+        "upsert": "true",
+    })
+
+    pointer = {
+        "version": SNAPSHOT_VERSION,
+        "path": path,
+        "sha1": digest,
+        "generated_at": snapshot['generated_at'],
+        "articles": snapshot['stats']['total_articles'],
+    }
+    bucket.upload(f"{PREFIX}/latest.json", json.dumps(pointer).encode('utf-8'), file_options={
+        "content-type": "application/json",
+        "cache-control": str(POINTER_CACHE_SECONDS),
+        "upsert": "true",
+    })
+
+    prune_old_snapshots(bucket, keep=path)
+    return path
+
+def prune_old_snapshots(bucket, keep: str):
+    """Remove all but the newest SNAPSHOT_KEEP snapshot files (best effort)."""
+    try:
+        files = [
+            f for f in bucket.list(PREFIX, {"limit": 1000, "sortBy": {"column": "created_at", "order": "desc"}})
+            if f['name'].endswith('.json.gz')
+        ]
+        stale = [f"{PREFIX}/{f['name']}" for f in files[SNAPSHOT_KEEP:] if f"{PREFIX}/{f['name']}" != keep]
+        if stale:
+            bucket.remove(stale)
+    except Exception as e:
+        print(f"   ⚠️  Could not prune old snapshots: {e}")
+
+def export_snapshot(supabase: Client = None, output: str = None) -> dict:
+    """Build and publish the home page snapshot.
+
+    Args:
+        supabase: Supabase client (created if omitted)
+        output: Local file path instead of Storage
+
+    Returns:
+        dict: Result (articles, bytes, sha1, path)
+    """
+    supabase = supabase or init_supabase()
+    snapshot = build_snapshot(supabase)
+    data, digest = encode_snapshot(snapshot)
+
+    if output:
+        write_local(output, data)
+        path = output
+    else:
+        path = publish(supabase, snapshot, data, digest)
+
+    return {"articles": snapshot['stats']['total_articles'], "bytes": len(data), "sha1": digest, "path": path}
+
+def main():
+    """Export the snapshot from the command line."""
+    output = None
+    if '--output' in sys.argv:
+        idx = sys.argv.index('--output')
+        if len(sys.argv) <= idx + 1:
+            print("Usage: export_snapshot.py [--output PATH]")
+            sys.exit(2)
+        output = sys.argv[idx + 1]
+
+    try:
+        result = export_snapshot(output=output)
+        print(f"✅ Snapshot exported: {result['articles']} articles, "
+              f"{result['bytes'] / 1024:.1f} KB → {result['path']}")
+    except Exception as e:
+        print(f"❌ Snapshot export failed: {e}")
+        print(f"   Error type: {type(e).__name__}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
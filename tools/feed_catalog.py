@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Feed Catalog
+SQLite catalog of RSS/Atom feeds (in the local state DB) with per-feed
+settings and runtime state, replacing the hard-coded feed dict.
+
+Settings: name, priority, interval (minutes), competitor hints, parser
+("stream" = feed_stream.py, "feedparser" for feeds that need it), enabled.
+Runtime state: next due time, ETag / Last-Modified validators, last
+success, last error, error streak, average latency, and the WebSub hub and
+push lease (see websub.py).
+
+- due_feeds() selects the feeds due now with one query on a partial index
+  (enabled feeds by next_due_at), so a run never loads the whole catalog
+- Failing feeds back off exponentially (interval x 2^streak, up to
+  MAX_BACKOFF_MINUTES)
+- Feeds with an active WebSub subscription are not due until their lease
+  ends (a safety poll), so pushed feeds leave the poll schedule
+- OPML import (upsert by URL, keeps runtime state) and export; settings are
+  stored as extra <outline> attributes (priority, interval, competitors,
+  parser, enabled)
+- An empty catalog is seeded from tools/feeds.opml
+
+Usage:
+    python3 tools/feed_catalog.py --list
+    python3 tools/feed_catalog.py --import feeds.opml
+    python3 tools/feed_catalog.py --export feeds.opml
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+
+from local_state import open_state
+
+DEFAULT_OPML = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feeds.opml')
+DEFAULT_PRIORITY = 1
+DEFAULT_INTERVAL_MINUTES = 60
+MAX_BACKOFF_MINUTES = 24 * 60
+LATENCY_SMOOTHING = 0.2  # Weight of the newest sample in the average latency
+PARSERS = ("stream", "feedparser")
+
+# Columns added for WebSub push (catalogs created before are migrated)
+PUSH_COLUMNS = {
+    "hub_url": "TEXT",
+    "topic_url": "TEXT",
+    "push_secret": "TEXT",
+    "push_until": "REAL NOT NULL DEFAULT 0",
+}
+
+def ensure_schema(conn):
+    """Create the feed catalog table and its due-feeds index."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS feeds (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 1,
+            interval_minutes INTEGER NOT NULL DEFAULT 60,
+            competitor_hints TEXT NOT NULL DEFAULT '',
+            parser TEXT NOT NULL DEFAULT 'stream',
+            enabled INTEGER NOT NULL DEFAULT 1,
+            next_due_at REAL NOT NULL DEFAULT 0,
+            etag TEXT,
+            last_modified TEXT,
+            last_success_at TEXT,
+            last_error TEXT,
+            error_streak INTEGER NOT NULL DEFAULT 0,
+            avg_latency_ms REAL
+        );
+        CREATE INDEX IF NOT EXISTS feeds_due ON feeds (next_due_at) WHERE enabled = 1;
+    """)
+
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(feeds)")}
+    for name, definition in PUSH_COLUMNS.items():
+        if name not in columns:
+            conn.execute(f"ALTER TABLE feeds ADD COLUMN {name} {definition}")
+
+def open_catalog(path: str = None):
+    """Open the catalog (local state DB), seeding it from feeds.opml if empty."""
+    conn = open_state(path)
+    ensure_schema(conn)
+    if conn.execute("SELECT 1 FROM feeds LIMIT 1").fetchone() is None and os.path.exists(DEFAULT_OPML):
+        with open(DEFAULT_OPML, 'rb') as f:
+            import_opml(conn, f.read())
+    return conn
+
+def feed_row(row) -> dict:
+    """Convert a catalog row to a dict with competitor hints as a list."""
+    feed = dict(row)
+    feed['competitor_hints'] = [c for c in feed['competitor_hints'].split(',') if c]
+    return feed
+
+def due_feeds(conn, now: float = None, limit: int = None) -> list:
+    """Return the enabled feeds due now, highest priority first.
+
+    Args:
+        conn: Catalog connection
+        now: Epoch seconds, defaults to the current time
+        limit: Maximum number of feeds
+
+    Returns:
+        list: Feed dicts
+    """
+    now = time.time() if now is None else now
+    rows = conn.execute("""
+        SELECT * FROM feeds INDEXED BY feeds_due
+        WHERE enabled = 1 AND next_due_at <= ?
+        ORDER BY priority DESC, next_due_at
+        LIMIT ?
+    """, (now, -1 if limit is None else limit))
+    return [feed_row(row) for row in rows]
+
+def list_feeds(conn, enabled_only: bool = False) -> list:
+    """Return all feeds (or only enabled ones), ordered by name."""
+    where = "WHERE enabled = 1" if enabled_only else ""
+    return [feed_row(row) for row in conn.execute(f"SELECT * FROM feeds {where} ORDER BY name")]
+
+def add_feed(conn, url: str, name: str, priority: int = DEFAULT_PRIORITY,
+             interval_minutes: int = DEFAULT_INTERVAL_MINUTES, competitor_hints: list = None,
+             parser: str = "stream", enabled: bool = True):
+    """Insert a feed or update its settings (runtime state is kept)."""
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser for {url}: {parser} (expected one of {', '.join(PARSERS)})")
+    conn.execute("""
+        INSERT INTO feeds (url, name, priority, interval_minutes, competitor_hints, parser, enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            name = excluded.name, priority = excluded.priority,
+            interval_minutes = excluded.interval_minutes, competitor_hints = excluded.competitor_hints,
+            parser = excluded.parser, enabled = excluded.enabled
+    """, (url, name, int(priority), int(interval_minutes), ",".join(competitor_hints or []), parser, int(enabled)))
+
+def record_success(conn, feed: dict, latency_ms: float, validators: dict = None, now: float = None):
+    """Schedule the next fetch after a successful one and update runtime state."""
+    now = time.time() if now is None else now
+    validators = validators or {}
+    average = feed.get('avg_latency_ms')
+    average = latency_ms if average is None else average + LATENCY_SMOOTHING * (latency_ms - average)
+    with conn:
+        # Pushed feeds stay off the schedule until their lease ends
+        conn.execute("""
+            UPDATE feeds SET next_due_at = MAX(?, push_until), etag = ?, last_modified = ?,
+                last_success_at = ?, last_error = NULL, error_streak = 0, avg_latency_ms = ?
+            WHERE id = ?
+        """, (now + feed['interval_minutes'] * 60, validators.get('etag'), validators.get('last_modified'),
+              datetime.fromtimestamp(now, timezone.utc).isoformat(), average, feed['id']))
+
+def record_hub(conn, feed: dict, links: dict):
+    """Remember a feed's WebSub hub and topic found during a normal fetch."""
+    hub, topic = links.get('hub'), links.get('self') or feed['url']
+    if hub and (hub != feed.get('hub_url') or topic != feed.get('topic_url')):
+        with conn:
+            conn.execute("UPDATE feeds SET hub_url = ?, topic_url = ? WHERE id = ?", (hub, topic, feed['id']))
+
+def get_feed(conn, feed_id: int) -> dict:
+    """Return one feed by id (None if unknown)."""
+    row = conn.execute("SELECT * FROM feeds WHERE id = ?", (feed_id,)).fetchone()
+    return feed_row(row) if row else None
+
+def push_renewals(conn, renew_before: float) -> list:
+    """Return enabled hub feeds whose push lease is missing or ends before renew_before."""
+    rows = conn.execute("""
+        SELECT * FROM feeds
+        WHERE enabled = 1 AND hub_url IS NOT NULL AND push_until < ?
+        ORDER BY priority DESC
+    """, (renew_before,))
+    return [feed_row(row) for row in rows]
+
+def set_push_secret(conn, feed_id: int, secret: str):
+    """Store the HMAC secret sent to the hub with a subscription request."""
+    with conn:
+        conn.execute("UPDATE feeds SET push_secret = ? WHERE id = ?", (secret, feed_id))
+
+def activate_push(conn, feed_id: int, lease_seconds: float, now: float = None):
+    """Record a verified subscription: no polling until the lease ends."""
+    now = time.time() if now is None else now
+    with conn:
+        conn.execute("""
+            UPDATE feeds SET push_until = ?, next_due_at = MAX(next_due_at, ?) WHERE id = ?
+        """, (now + lease_seconds, now + lease_seconds, feed_id))
+
+def deactivate_push(conn, feed_id: int, now: float = None):
+    """Drop a subscription (denied or unsubscribed): the feed is polled again."""
+    now = time.time() if now is None else now
+    with conn:
+        conn.execute("UPDATE feeds SET push_until = 0, next_due_at = MIN(next_due_at, ?) WHERE id = ?",
+                     (now, feed_id))
+
+def record_failure(conn, feed: dict, error: str, now: float = None):
+    """Back off a failing feed exponentially and record the error."""
+    now = time.time() if now is None else now
+    streak = feed.get('error_streak', 0) + 1
+    backoff = min(feed['interval_minutes'] * 2 ** streak, MAX_BACKOFF_MINUTES)
+    with conn:
+        conn.execute("""
+            UPDATE feeds SET next_due_at = ?, last_error = ?, error_streak = ?
+            WHERE id = ?
+        """, (now + backoff * 60, error[:500], streak, feed['id']))
+
+def import_opml(conn, data: bytes) -> int:
+    """Upsert every feed <outline xmlUrl=...> of an OPML document.
+
+    Returns:
+        int: Number of feeds imported
+    """
+    root = etree.fromstring(data, parser=etree.XMLParser(resolve_entities=False, no_network=True))
+    count = 0
+    with conn:
+        for outline in root.iter('outline'):
+            url = outline.get('xmlUrl')
+            if not url:
+                continue
+            add_feed(
+                conn, url,
+                name=outline.get('title') or outline.get('text') or url,
+                priority=int(outline.get('priority', DEFAULT_PRIORITY)),
+                interval_minutes=int(outline.get('interval', DEFAULT_INTERVAL_MINUTES)),
+                competitor_hints=[c.strip() for c in outline.get('competitors', '').split(',') if c.strip()],
+                parser=outline.get('parser', 'stream'),
+                enabled=outline.get('enabled', 'true').lower() != 'false',
+            )
+            count += 1
+    return count
+
+def export_opml(conn) -> bytes:
+    """Export the catalog (settings only) as OPML 2.0."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<opml version="2.0">',
+        '  <head><title>Competitor Intelligence Feeds</title></head>',
+        '  <body>',
+    ]
+    for feed in list_feeds(conn):
+        attributes = {
+            "type": "rss", "text": feed['name'], "title": feed['name'], "xmlUrl": feed['url'],
+            "priority": str(feed['priority']), "interval": str(feed['interval_minutes']),
+            "competitors": ",".join(feed['competitor_hints']), "parser": feed['parser'],
+            "enabled": "true" if feed['enabled'] else "false",
+        }
+        lines.append("    <outline " + " ".join(f"{k}={quoteattr(v)}" for k, v in attributes.items()) + "/>")
+    lines += ['  </body>', '</opml>', '']
+    return "\n".join(lines).encode('utf-8')
+
+def print_catalog(conn):
+    """Print every feed with its settings and runtime state."""
+    feeds = list_feeds(conn)
+    now = time.time()
+    print(f"\n📚 {len(feeds)} feeds in the catalog\n")
+    for feed in feeds:
+        status = "✅" if feed['enabled'] and not feed['error_streak'] else "⚠️ " if feed['enabled'] else "⏸ "
+        due = max(0, feed['next_due_at'] - now) / 60
+        latency = f"{feed['avg_latency_ms']:.0f} ms" if feed['avg_latency_ms'] is not None else "-"
+        push = " · WebSub push" if feed['push_until'] > now else " · WebSub hub" if feed['hub_url'] else ""
+        print(f"   {status} {feed['name']} (priority {feed['priority']}, every {feed['interval_minutes']} min{push})")
+        print(f"      {feed['url']}")
+        print(f"      due in {due:.0f} min · latency {latency} · errors {feed['error_streak']}"
+              + (f" · {feed['last_error'][:80]}" if feed['last_error'] else ""))
+    print()
+
+def main():
+    """Manage the feed catalog from the command line."""
+    conn = open_catalog()
+    try:
+        if '--import' in sys.argv[1:-1]:
+            path = sys.argv[sys.argv.index('--import') + 1]
+            with open(path, 'rb') as f:
+                count = import_opml(conn, f.read())
+            print(f"✅ Imported {count} feeds from {path}")
+        elif '--export' in sys.argv[1:-1]:
+            path = sys.argv[sys.argv.index('--export') + 1]
+            with open(path, 'wb') as f:
+                f.write(export_opml(conn))
+            print(f"✅ Exported {len(list_feeds(conn))} feeds to {path}")
+        elif '--list' in sys.argv:
+            print_catalog(conn)
+        else:
+            print(__doc__.split("Usage:")[1])
+            sys.exit(2)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming Feed Parser
+Reads RSS 2.0 / Atom feeds incrementally (lxml pull parser) instead of
+building the whole document with feedparser.
+
+- Entries are parsed one at a time and freed right after, so a feed's
+  historical content:encoded bodies never pile up in memory
+- Feeds are newest-first: reading stops (and the download is closed) once
+  OLD_ENTRIES_BEFORE_STOP consecutive entries are older than the cutoff; a
+  few are tolerated because some feeds are slightly out of order
+- Malformed feeds (XML errors) and feeds without RSS 2.0 / Atom entries
+  fall back to feedparser on the full document
+- Feed-level <atom:link rel="hub|self"> and HTTP Link headers are reported
+  for WebSub (see websub.py)
+- download_feed() / parse_feed_payload() split fetching from parsing, for
+  parsing in worker processes (cpu_pool.py)
+
+Entries come out as dicts with the feedparser keys scrape_rss uses (title,
+link, summary, content, published, updated, author, media_content,
+enclosures).
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import feedparser
+import requests
+from dateutil import parser
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+OLD_ENTRIES_BEFORE_STOP = 3
+USER_AGENT = "Mozilla/5.0 (compatible; CompetitorIntelBot/1.0)"
+
+# Namespaces of the elements read from entries
+ATOM = "http://www.w3.org/2005/Atom"
+CONTENT = "http://purl.org/rss/1.0/modules/content/"
+DC = "http://purl.org/dc/elements/1.1/"
+MEDIA = "http://search.yahoo.com/mrss/"
+
+ENTRY_TAGS = {"item", f"{{{ATOM}}}entry"}
+LINK_TAG = f"{{{ATOM}}}link"
+FEED_TAGS = {"channel", f"{{{ATOM}}}feed"}
+
+def parse_date(value):
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = parser.parse(value)
+            except (ValueError, OverflowError):
+                return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def text_of(element) -> str:
+    """Text of an element (None if missing or empty)."""
+    if element is None:
+        return None
+    return (element.text or '').strip() or None
+
+def rss_entry(item) -> dict:
+    """Convert an RSS <item> element to a feedparser-style entry."""
+    entry = {
+        "title": text_of(item.find('title')),
+        "link": text_of(item.find('link')) or text_of(item.find('guid')),
+        "summary": text_of(item.find('description')),
+        "published": text_of(item.find('pubDate')) or text_of(item.find(f'{{{DC}}}date')),
+        "author": text_of(item.find(f'{{{DC}}}creator')) or text_of(item.find('author')),
+    }
+
+    content = text_of(item.find(f'{{{CONTENT}}}encoded'))
+    if content:
+        entry['content'] = [{"value": content}]
+
+    media = item.find(f'{{{MEDIA}}}content')
+    if media is not None and media.get('url'):
+        entry['media_content'] = [{"url": media.get('url')}]
+
+    enclosure = item.find('enclosure')
+    if enclosure is not None and enclosure.get('url'):
+        entry['enclosures'] = [{"href": enclosure.get('url'), "type": enclosure.get('type')}]
+
+    return {k: v for k, v in entry.items() if v is not None}
+
+def atom_entry(item) -> dict:
+    """Convert an Atom <entry> element to a feedparser-style entry."""
+    link = None
+    for candidate in item.iterfind(f'{{{ATOM}}}link'):
+        if candidate.get('rel', 'alternate') == 'alternate':
+            link = candidate.get('href')
+            break
+
+    entry = {
+        "title": text_of(item.find(f'{{{ATOM}}}title')),
+        "link": link,
+        "summary": text_of(item.find(f'{{{ATOM}}}summary')),
+        "published": text_of(item.find(f'{{{ATOM}}}published')),
+        "updated": text_of(item.find(f'{{{ATOM}}}updated')),
+        "author": text_of(item.find(f'{{{ATOM}}}author/{{{ATOM}}}name')),
+    }
+
+    content = text_of(item.find(f'{{{ATOM}}}content'))
+    if content:
+        entry['content'] = [{"value": content}]
+
+    return {k: v for k, v in entry.items() if v is not None}
+
+def parse_feed_stream(chunks, cutoff: datetime = None, links: dict = None) -> tuple:
+    """Parse feed bytes incrementally, stopping at the cutoff.
+
+    Args:
+        chunks: Iterable of byte chunks (no longer consumed once reading stops)
+        cutoff: Oldest publication date to keep (None keeps every entry)
+        links: Optional dict, filled with the feed-level "hub" and "self" URLs
+
+    Returns:
+        tuple: (entries newer than the cutoff, number of entry elements read)
+
+    Raises:
+        etree.XMLSyntaxError: If the document is not well-formed XML
+    """
+    pull = etree.XMLPullParser(events=('end',), tag=ENTRY_TAGS | {LINK_TAG},
+                               resolve_entities=False, no_network=True, huge_tree=True)
+    entries = []
+    seen = 0
+    old_streak = 0
+
+    for chunk in chunks:
+        pull.feed(chunk)
+
+        for _, item in pull.read_events():
+            if item.tag == LINK_TAG:
+                rel = item.get('rel')
+                parent = item.getparent()
+                if links is not None and rel in ('hub', 'self') and parent is not None and parent.tag in FEED_TAGS:
+                    links.setdefault(rel, item.get('href'))
+                continue
+
+            seen += 1
+            entry = rss_entry(item) if item.tag == 'item' else atom_entry(item)
+
+            # Free this entry and the ones before it
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+
+            published = parse_date(entry.get('published') or entry.get('updated'))
+            if cutoff and published and published < cutoff:
+                old_streak += 1
+                if old_streak >= OLD_ENTRIES_BEFORE_STOP:
+                    return entries, seen
+                continue
+
+            old_streak = 0
+            entries.append(entry)
+
+    pull.close()
+    return entries, seen
+
+def parse_with_feedparser(source, cutoff: datetime = None, links: dict = None) -> list:
+    """Fallback: parse a whole feed (URL or bytes) with feedparser.
+
+    Raises:
+        ValueError: If feedparser finds no entries in a broken feed
+    """
+    parsed = feedparser.parse(source, agent=USER_AGENT)
+    if parsed.get('bozo', 1) == 1 and not parsed.entries:
+        raise ValueError(f"Feed parsing failed: {parsed.get('bozo_exception', 'Unknown error')}")
+
+    if links is not None:
+        for link in parsed.feed.get('links', []):
+            if link.get('rel') in ('hub', 'self') and link.get('href'):
+                links.setdefault(link['rel'], link['href'])
+
+    entries = []
+    for entry in parsed.entries:
+        published = parse_date(entry.get('published') or entry.get('updated'))
+        if cutoff is None or published is None or published >= cutoff:
+            entries.append(entry)
+    return entries
+
+def open_feed(feed_url: str, session: requests.Session = None, validators: dict = None,
+              links: dict = None, stream: bool = True):
+    """Send a (conditional) feed request.
+
+    Args:
+        feed_url: Feed URL
+        session: Optional HTTP session
+        validators: Optional dict with the previous response's etag and
+            last_modified; sent as a conditional request and updated in place
+        links: Optional dict, filled with the WebSub "hub" and "self" URLs
+            from HTTP Link headers
+        stream: Leave the body unread
+
+    Returns:
+        requests.Response or None: None if the feed is unchanged (304)
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if validators is not None:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    http = session or requests
+    response = http.get(feed_url, timeout=30, stream=stream, headers=headers)
+    if response.status_code == 304:
+        response.close()
+        return None
+    response.raise_for_status()
+
+    if validators is not None:
+        validators['etag'] = response.headers.get('ETag')
+        validators['last_modified'] = response.headers.get('Last-Modified')
+
+    # WebSub discovery: Link headers take precedence over links in the feed
+    if links is not None:
+        for rel in ('hub', 'self'):
+            if response.links.get(rel, {}).get('url'):
+                links[rel] = response.links[rel]['url']
+
+    return response
+
+def fetch_feed(feed_url: str, cutoff: datetime = None, session: requests.Session = None,
+               validators: dict = None, links: dict = None) -> list:
+    """Fetch a feed and return its entries newer than the cutoff.
+
+    Falls back to feedparser (one more request) when the feed is not
+    well-formed XML or has no RSS 2.0 / Atom entries (e.g. RSS 1.0).
+
+    Args:
+        feed_url: Feed URL
+        cutoff: Oldest publication date to keep (None keeps every entry)
+        session: Optional HTTP session
+        validators: Optional dict with the previous response's etag and
+            last_modified; sent as a conditional request and updated in place
+        links: Optional dict, filled with the feed's WebSub "hub" and "self"
+            URLs (HTTP Link headers or feed-level links)
+
+    Returns:
+        list: Feedparser-style entry dicts, newest first ([] if unchanged)
+
+    Raises:
+        ValueError: If the feed can't be parsed by either parser
+    """
+    response = open_feed(feed_url, session, validators, links)
+    if response is None:
+        return []
+
+    try:
+        entries, seen = parse_feed_stream(response.iter_content(CHUNK_SIZE), cutoff, links)
+        if seen:
+            return entries
+    except etree.XMLSyntaxError:
+        pass
+    finally:
+        # Stops the download when reading ended at the cutoff
+        response.close()
+
+    return parse_with_feedparser(feed_url, cutoff, links)
+
+def download_feed(feed_url: str, session: requests.Session = None, validators: dict = None,
+                  links: dict = None) -> bytes:
+    """Download a whole feed document for parsing elsewhere (cpu_pool.py).
+
+    Args:
+        feed_url: Feed URL
+        session: Optional HTTP session
+        validators: Conditional request validators, updated in place
+        links: Optional dict, filled from HTTP Link headers
+
+    Returns:
+        bytes or None: The document, None if unchanged (304)
+    """
+    response = open_feed(feed_url, session, validators, links, stream=False)
+    return None if response is None else response.content
+
+def parse_feed_payload(body: bytes, cutoff: datetime = None, links: dict = None) -> list:
+    """Parse a downloaded feed document like fetch_feed() would.
+
+    Raises:
+        ValueError: If the feed can't be parsed by either parser
+    """
+    try:
+        entries, seen = parse_feed_stream([body], cutoff, links)
+        if seen:
+            return entries
+    except etree.XMLSyntaxError:
+        pass
+    return parse_with_feedparser(body, cutoff, links)
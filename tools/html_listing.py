@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+HTML Listing Engine
+Declarative scraping of blog listing pages for sites without a working feed.
+
+Each site is a dict of selectors (see scrape_blogs.LISTING_SITES):
+
+    {
+        "url": "https://example.com/blog",       # First listing page
+        "item": "article.post-card",             # One element per article
+        "title": "h2",                           # Text of the first match
+        "link": "a @href",                       # "selector @attr" reads an attribute
+        "published": "time @datetime",           # Optional fields: published,
+        "summary": "p.excerpt",                  #   summary, author, image
+        "image": "img @src",
+        "next": "a[rel=next] @href",             # Optional pagination link
+    }
+
+Selectors are CSS (translated with cssselect) or XPath (starting with "/",
+"./" or "("), compiled once per site and evaluated with lxml. Items are
+returned in the RSS entry shape that scrape_rss.normalize_article() consumes
+(title, link, published, summary, author, media_content, _feed_name).
+Relative URLs are resolved against the page URL.
+"""
+
+from urllib.parse import urljoin
+
+from cssselect import GenericTranslator
+from lxml import etree, html
+
+# Optional per-item fields and the raw-article key they fill
+OPTIONAL_FIELDS = ("published", "summary", "author", "image")
+
+_translator = GenericTranslator()
+
+def compile_selector(selector: str):
+    """Compile one "selector [@attr]" spec into (XPath, attribute).
+
+    CSS selectors match the context element and its descendants.
+
+    Args:
+        selector: CSS or XPath selector, optionally followed by " @attr"
+
+    Returns:
+        tuple: (etree.XPath, attribute name or None)
+    """
+    attribute = None
+    if ' @' in selector:
+        selector, attribute = selector.rsplit(' @', 1)
+        selector = selector.strip()
+
+    if selector.startswith(('/', './', '(')):
+        expression = selector
+    else:
+        expression = _translator.css_to_xpath(selector, prefix='descendant-or-self::')
+
+    return etree.XPath(expression), attribute
+
+def compile_site(name: str, config: dict) -> dict:
+    """Compile all selectors of a site config.
+
+    Args:
+        name: Site name (becomes the article source)
+        config: Site config (url, item, title, link, optional fields, next)
+
+    Returns:
+        dict: Compiled site (name, url, item, fields, next)
+
+    Raises:
+        ValueError: If a required selector is missing or invalid
+    """
+    missing = [key for key in ("url", "item", "title", "link") if not config.get(key)]
+    if missing:
+        raise ValueError(f"{name}: missing selector(s) {', '.join(missing)}")
+
+    try:
+        fields = {key: compile_selector(config[key]) for key in ("title", "link") + OPTIONAL_FIELDS if config.get(key)}
+        return {
+            "name": name,
+            "url": config['url'],
+            "item": compile_selector(config['item'])[0],
+            "fields": fields,
+            "next": compile_selector(config['next']) if config.get('next') else None,
+            "max_pages": config.get('max_pages'),
+        }
+    except Exception as e:
+        raise ValueError(f"{name}: invalid selector ({e})")
+
+def select_value(element, compiled) -> str:
+    """Evaluate a compiled selector against an element and return text or attribute."""
+    xpath, attribute = compiled
+    for match in xpath(element):
+        if isinstance(match, str):
+            value = match
+        elif attribute:
+            value = match.get(attribute)
+        else:
+            value = match.text_content()
+        value = " ".join(value.split()) if value else ''
+        if value:
+            return value
+    return ''
+
+def parse_listing(site: dict, page_url: str, content) -> tuple:
+    """Extract raw articles and the next page URL from one listing page.
+
+    Args:
+        site: Compiled site from compile_site()
+        page_url: URL the page was fetched from (for relative links)
+        content: Page HTML (bytes or str)
+
+    Returns:
+        tuple: (list of raw articles, next page URL or None)
+    """
+    document = html.fromstring(content, base_url=page_url)
+    fields = site['fields']
+
+    articles = []
+    for item in site['item'](document):
+        title = select_value(item, fields['title'])
+        link = select_value(item, fields['link'])
+        if not title or not link:
+            continue
+
+        article = {
+            "title": title,
+            "link": urljoin(page_url, link),
+            "_feed_name": site['name'],
+        }
+        # Missing optional fields are left out, like in feedparser entries
+        for key in ("published", "summary", "author"):
+            value = select_value(item, fields[key]) if key in fields else ''
+            if value:
+                article[key] = value
+        image = select_value(item, fields['image']) if 'image' in fields else ''
+        if image:
+            article['media_content'] = [{"url": urljoin(page_url, image)}]
+        articles.append(article)
+
+    next_url = None
+    if site['next'] is not None:
+        href = select_value(document, site['next'])
+        if href:
+            next_url = urljoin(page_url, href)
+            if next_url == page_url:
+                next_url = None
+
+    return articles, next_url
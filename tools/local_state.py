@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Local Scraper State
+Small SQLite store for state that has to survive between scraper runs
+(corpus statistics, caches, cursors). Each feature owns its own tables.
+"""
+
+import os
+import sqlite3
+
+# Default location of the state database (override with SCRAPER_STATE_DB)
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.state', 'scraper_state.db')
+
+def get_state_path() -> str:
+    """Return the path of the local state database."""
+    return os.getenv('SCRAPER_STATE_DB', DEFAULT_STATE_PATH)
+
+def open_state(path: str = None) -> sqlite3.Connection:
+    """Open (and create if needed) the local state database.
+
+    Args:
+        path: Optional database path, defaults to get_state_path()
+
+    Returns:
+        sqlite3.Connection: Connection with WAL journaling enabled
+    """
+    path = path or get_state_path()
+
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def ensure_article_cache(conn):
+    """Create the table of article URLs known to be stored in Supabase."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS known_articles (
+            url TEXT PRIMARY KEY,
+            published_at TEXT,
+            content_hash TEXT
+        )
+    """)
+
+    # Caches created before content hashes were tracked
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(known_articles)")}
+    if 'content_hash' not in columns:
+        conn.execute("ALTER TABLE known_articles ADD COLUMN content_hash TEXT")
+
+def is_known_article(conn, url: str) -> bool:
+    """Check the local cache for an article URL (no network round trip)."""
+    ensure_article_cache(conn)
+    row = conn.execute("SELECT 1 FROM known_articles WHERE url = ?", (url,)).fetchone()
+    return row is not None
+
+def known_hashes(conn, urls: list) -> dict:
+    """Look up cached content hashes for a batch of URLs.
+
+    Args:
+        conn: Local state connection
+        urls: Article URLs
+
+    Returns:
+        dict: url -> content hash (None if cached without a hash) for known URLs
+    """
+    ensure_article_cache(conn)
+    found = {}
+    for start in range(0, len(urls), 500):
+        chunk = urls[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(f"SELECT url, content_hash FROM known_articles WHERE url IN ({placeholders})", chunk):
+            found[row['url']] = row['content_hash']
+    return found
+
+def remember_articles(conn, articles: list):
+    """Record stored articles in the local cache.
+
+    Args:
+        conn: Local state connection
+        articles: Normalized articles (need `url`, optionally `published_at`
+            and `content_hash`)
+    """
+    ensure_article_cache(conn)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO known_articles (url, published_at, content_hash) VALUES (?, ?, ?)",
+            [(a['url'], a.get('published_at'), a.get('content_hash')) for a in articles if a.get('url')]
+        )
+
+def forget_articles(conn, urls: list) -> int:
+    """Remove article URLs from the local cache.
+
+    Args:
+        conn: Local state connection
+        urls: URLs that no longer exist in Supabase
+
+    Returns:
+        int: Number of cache entries removed
+    """
+    ensure_article_cache(conn)
+    with conn:
+        cursor = conn.executemany("DELETE FROM known_articles WHERE url = ?", [(u,) for u in urls])
+    return cursor.rowcount
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Competitor Mention Time Series
+Keeps hourly per-competitor mention counts as NumPy arrays in the local state
+directory and runs a streaming EWMA z-score detector over completed hours.
+Spikes are POSTed as JSON to MENTION_ALERT_WEBHOOK_URL.
+
+Scrapers call update_mentions() with each batch of newly stored articles, so
+queries never scan the articles table.
+
+- Articles that arrive late for an hour the detector already processed are
+  re-checked: the detector state before each of the last REEVALUATE_HOURS
+  hours is kept, and evaluation restarts from the earliest hour that changed
+  (older changes replay the whole series); an hour never alerts twice
+- Updates hold an exclusive lock on <series>.lock, so shard workers and the
+  WebSub thread don't overwrite each other's counts
+
+Usage:
+    python3 tools/mention_timeseries.py --rebuild           # Rebuild from stored articles
+    python3 tools/mention_timeseries.py --query Ledger 365  # Hourly stats for last N days
+"""
+
+import fcntl
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
+import requests
+from dateutil import parser
+
+from local_state import get_state_path
+
+# Detector settings
+EWMA_ALPHA = 0.1          # Weight of the newest hour in the running mean/variance
+Z_THRESHOLD = 3.0         # Alert when an hour is this many std devs above the mean
+MIN_ALERT_COUNT = 3       # ...and has at least this many mentions
+WARMUP_HOURS = 24         # No alerts until this many hours have been observed
+MIN_STD = 1.0             # Std dev floor so quiet competitors can still spike
+
+# Arrays grow in chunks of this many hours
+GROWTH_HOURS = 24 * 30
+
+# Detector state is kept for this many processed hours, so late articles for
+# them are re-checked without replaying the whole series
+REEVALUATE_HOURS = 24 * 7
+
+def get_series_path() -> str:
+    """Return the path of the mention time series file."""
+    return os.getenv('MENTION_SERIES_PATH', os.path.join(os.path.dirname(get_state_path()), 'mentions.npz'))
+
+@contextmanager
+def locked(path: str = None):
+    """Hold an exclusive lock on the series file for a load/modify/save cycle."""
+    path = path or get_series_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def hour_index(timestamp: str) -> int:
+    """Convert an ISO timestamp to hours since the Unix epoch."""
+    dt = parser.parse(timestamp)
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() // 3600)
+
+class MentionSeries:
+    """Hourly mention counts plus per-competitor detector state."""
+
+    def __init__(self, competitors: list = None):
+        self.competitors = list(competitors or [])
+        self.start_hour = None
+        self.counts = np.zeros((len(self.competitors), 0), dtype=np.int32)
+        self.mean = np.zeros(len(self.competitors))
+        self.var = np.zeros(len(self.competitors))
+        self.observed = np.zeros(len(self.competitors), dtype=np.int64)
+        self.last_processed = None
+        # Detector state before hour h and whether h alerted, at column h % REEVALUATE_HOURS
+        self.state_mean = np.zeros((len(self.competitors), REEVALUATE_HOURS))
+        self.state_var = np.zeros((len(self.competitors), REEVALUATE_HOURS))
+        self.state_observed = np.zeros((len(self.competitors), REEVALUATE_HOURS), dtype=np.int64)
+        self.alerted = np.zeros((len(self.competitors), REEVALUATE_HOURS), dtype=bool)
+        self.processed_from = None  # First hour of the current detector run
+        self.changed_from = None    # Earliest hour whose counts changed since the last detect()
+
+    @classmethod
+    def load(cls, path: str = None):
+        """Load the series from disk (empty series if missing)."""
+        path = path or get_series_path()
+        if not os.path.exists(path):
+            return cls()
+
+        with np.load(path, allow_pickle=False) as data:
+            series = cls(data['competitors'].tolist())
+            series.counts = data['counts']
+            series.mean = data['mean']
+            series.var = data['var']
+            series.observed = data['observed']
+            start = int(data['start_hour'])
+            last = int(data['last_processed'])
+            series.start_hour = start if start >= 0 else None
+            series.last_processed = last if last >= 0 else None
+            if 'state_mean' in data:
+                series.state_mean = data['state_mean']
+                series.state_var = data['state_var']
+                series.state_observed = data['state_observed']
+                series.alerted = data['alerted']
+                first, changed = int(data['processed_from']), int(data['changed_from'])
+                series.processed_from = first if first >= 0 else None
+                series.changed_from = changed if changed >= 0 else None
+            else:
+                # Older file without detector history: replay on late data, but
+                # never re-send alerts for hours it may already have alerted
+                series.alerted[:] = True
+        return series
+
+    def save(self, path: str = None):
+        """Write the series atomically (temp file + rename)."""
+        path = path or get_series_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                competitors=np.array(self.competitors, dtype=str),
+                counts=self.counts,
+                mean=self.mean,
+                var=self.var,
+                observed=self.observed,
+                start_hour=np.int64(-1 if self.start_hour is None else self.start_hour),
+                last_processed=np.int64(-1 if self.last_processed is None else self.last_processed),
+                state_mean=self.state_mean,
+                state_var=self.state_var,
+                state_observed=self.state_observed,
+                alerted=self.alerted,
+                processed_from=np.int64(-1 if self.processed_from is None else self.processed_from),
+                changed_from=np.int64(-1 if self.changed_from is None else self.changed_from),
+            )
+        os.replace(tmp_path, path)
+
+    def _competitor_rows(self, names: list) -> np.ndarray:
+        """Return row indexes for competitor names, adding unknown ones."""
+        rows = []
+        for name in names:
+            if name not in self.competitors:
+                self.competitors.append(name)
+                self.counts = np.vstack([self.counts, np.zeros((1, self.counts.shape[1]), dtype=np.int32)])
+                self.mean = np.append(self.mean, 0.0)
+                self.var = np.append(self.var, 0.0)
+                self.observed = np.append(self.observed, 0)
+                self.state_mean = np.vstack([self.state_mean, np.zeros((1, REEVALUATE_HOURS))])
+                self.state_var = np.vstack([self.state_var, np.zeros((1, REEVALUATE_HOURS))])
+                self.state_observed = np.vstack([self.state_observed, np.zeros((1, REEVALUATE_HOURS), dtype=np.int64)])
+                self.alerted = np.vstack([self.alerted, np.zeros((1, REEVALUATE_HOURS), dtype=bool)])
+            rows.append(self.competitors.index(name))
+        return np.array(rows, dtype=np.int64)
+
+    def _ensure_hours(self, first: int, last: int):
+        """Grow the counts array so hours first..last are addressable."""
+        if self.start_hour is None:
+            self.start_hour = first
+            self.counts = np.zeros((len(self.competitors), GROWTH_HOURS), dtype=np.int32)
+
+        if first < self.start_hour:
+            pad = self.start_hour - first
+            self.counts = np.hstack([np.zeros((len(self.competitors), pad), dtype=np.int32), self.counts])
+            self.start_hour = first
+
+        needed = last - self.start_hour + 1
+        if needed > self.counts.shape[1]:
+            extra = max(needed - self.counts.shape[1], GROWTH_HOURS)
+            self.counts = np.hstack([self.counts, np.zeros((len(self.competitors), extra), dtype=np.int32)])
+
+    def add_articles(self, articles: list, sign: int = 1) -> int:
+        """Add articles' competitor mentions to the hourly counts.
+
+        Args:
+            articles: Articles with `published_at` and `competitors`
+            sign: 1 to add, -1 to remove (e.g. old tags of a re-tagged article)
+
+        Returns:
+            int: Number of mentions added (or removed)
+        """
+        names, hours = [], []
+        for article in articles:
+            if not article.get('published_at'):
+                continue
+            hour = hour_index(article['published_at'])
+            for competitor in article.get('competitors') or []:
+                names.append(competitor)
+                hours.append(hour)
+
+        if not names:
+            return 0
+
+        rows = self._competitor_rows(names)
+        hours = np.array(hours, dtype=np.int64)
+        self._ensure_hours(int(hours.min()), int(hours.max()))
+
+        np.add.at(self.counts, (rows, hours - self.start_hour), sign)
+        first = int(hours.min())
+        self.changed_from = first if self.changed_from is None else min(self.changed_from, first)
+        return len(names)
+
+    def window(self, competitor: str, start_hour: int, end_hour: int) -> np.ndarray:
+        """Return hourly counts for [start_hour, end_hour) as a view-sized array."""
+        result = np.zeros(end_hour - start_hour, dtype=np.int32)
+        if competitor not in self.competitors or self.start_hour is None:
+            return result
+
+        row = self.counts[self.competitors.index(competitor)]
+        lo = max(start_hour, self.start_hour)
+        hi = min(end_hour, self.start_hour + row.shape[0])
+        if lo < hi:
+            result[lo - start_hour:hi - start_hour] = row[lo - self.start_hour:hi - self.start_hour]
+        return result
+
+    def detect(self, until_hour: int) -> list:
+        """Run the EWMA detector over completed hours not yet processed.
+
+        Hours that changed since the last run (late articles) are evaluated
+        again from the earliest changed one, restoring the detector state kept
+        for it, or replaying the series if it is older than REEVALUATE_HOURS.
+
+        Args:
+            until_hour: First hour that is not complete yet (exclusive bound)
+
+        Returns:
+            list: Alert dicts for hours that spiked (each hour alerts once)
+        """
+        if self.start_hour is None:
+            return []
+
+        last = self.last_processed
+        changed, self.changed_from = self.changed_from, None
+        if last is None:
+            first = self.start_hour
+        elif changed is None or changed > last:
+            first = last + 1
+        elif self.processed_from is not None and changed >= max(self.processed_from, last - REEVALUATE_HOURS + 1):
+            # Restore the detector to just before the earliest changed hour
+            first = changed
+            col = first % REEVALUATE_HOURS
+            self.mean = self.state_mean[:, col].copy()
+            self.var = self.state_var[:, col].copy()
+            self.observed = self.state_observed[:, col].copy()
+        else:
+            # Older than the kept history: replay from the start
+            first = self.start_hour
+            self.mean = np.zeros(len(self.competitors))
+            self.var = np.zeros(len(self.competitors))
+            self.observed = np.zeros(len(self.competitors), dtype=np.int64)
+
+        if last is None or first == self.start_hour:
+            self.processed_from = first
+        # Hours before this were processed, but their alert flags are no longer kept
+        known_from = -1 if last is None else last - REEVALUATE_HOURS + 1
+        alerts = []
+
+        for hour in range(first, until_hour):
+            col = hour % REEVALUATE_HOURS
+            self.state_mean[:, col] = self.mean
+            self.state_var[:, col] = self.var
+            self.state_observed[:, col] = self.observed
+
+            x = self.window_all(hour)
+            z = (x - self.mean) / np.maximum(np.sqrt(self.var), MIN_STD)
+            spiking = (self.observed >= WARMUP_HOURS) & (z >= Z_THRESHOLD) & (x >= MIN_ALERT_COUNT)
+
+            if last is not None and hour <= last:
+                # Re-evaluated hour: alert only for competitors it didn't alert for
+                if hour < known_from or (changed is not None and hour < changed):
+                    spiking = np.zeros_like(spiking)
+                else:
+                    spiking = spiking & ~self.alerted[:, col]
+                    self.alerted[:, col] |= spiking
+            else:
+                self.alerted[:, col] = spiking
+
+            for i in np.nonzero(spiking)[0]:
+                alerts.append({
+                    "competitor": self.competitors[i],
+                    "hour": datetime.fromtimestamp(hour * 3600, tz=timezone.utc).isoformat(),
+                    "count": int(x[i]),
+                    "expected": round(float(self.mean[i]), 3),
+                    "z_score": round(float(z[i]), 2),
+                })
+
+            diff = x - self.mean
+            incr = EWMA_ALPHA * diff
+            self.mean = self.mean + incr
+            self.var = (1 - EWMA_ALPHA) * (self.var + diff * incr)
+            self.observed = self.observed + 1
+            self.last_processed = hour
+
+        return alerts
+
+    def window_all(self, hour: int) -> np.ndarray:
+        """Return counts of every competitor for a single hour."""
+        offset = hour - self.start_hour
+        if offset < 0 or offset >= self.counts.shape[1]:
+            return np.zeros(len(self.competitors))
+        return self.counts[:, offset].astype(np.float64)
+
+def send_alerts(alerts: list, webhook_url: str = None) -> int:
+    """POST spike alerts to the configured webhook.
+
+    Args:
+        alerts: Alerts from MentionSeries.detect()
+        webhook_url: Target URL, defaults to MENTION_ALERT_WEBHOOK_URL
+
+    Returns:
+        int: Number of alerts delivered
+    """
+    webhook_url = webhook_url or os.getenv('MENTION_ALERT_WEBHOOK_URL')
+    if not alerts or not webhook_url:
+        return 0
+
+    delivered = 0
+    for alert in alerts:
+        try:
+            response = requests.post(webhook_url, json=alert, timeout=30)
+            response.raise_for_status()
+            delivered += 1
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️  Failed to send mention alert: {e}")
+    return delivered
+
+def update_mentions(articles: list, path: str = None, webhook_url: str = None, removed: list = None) -> list:
+    """Add newly stored articles, run the detector and send alerts.
+
+    Args:
+        articles: Newly stored articles
+        path: Optional series file path
+        webhook_url: Optional webhook override
+        removed: Articles whose mentions to subtract (old tags of edited rows)
+
+    Returns:
+        list: Alerts raised in this update
+    """
+    try:
+        with locked(path):
+            series = MentionSeries.load(path)
+            series.add_articles(articles)
+            series.add_articles(removed or [], sign=-1)
+            current_hour = int(datetime.now(timezone.utc).timestamp() // 3600)
+            alerts = series.detect(current_hour)
+            series.save(path)
+    except Exception as e:
+        print(f"   ⚠️  Failed to update mention time series: {e}")
+        return []
+
+    for alert in alerts:
+        print(f"   📈 Mention spike: {alert['competitor']} {alert['count']} at {alert['hour']} (z={alert['z_score']})")
+    send_alerts(alerts, webhook_url)
+    return alerts
+
+def rebuild(supabase, page_size: int = 1000) -> int:
+    """Rebuild the series from all stored articles.
+
+    Args:
+        supabase: Supabase client
+        page_size: Rows fetched per request
+
+    Returns:
+        int: Number of articles counted
+    """
+    series = MentionSeries()
+    total = 0
+    start = 0
+
+    while True:
+        result = supabase.table('articles').select('published_at, competitors') \
+            .order('id').range(start, start + page_size - 1).execute()
+        rows = result.data or []
+        series.add_articles(rows)
+        total += len(rows)
+        start += page_size
+        if len(rows) < page_size:
+            break
+
+    # Replay history through the detector without alerting on old spikes
+    current_hour = int(datetime.now(timezone.utc).timestamp() // 3600)
+    series.detect(current_hour)
+    with locked():
+        series.save()
+    return total
+
+def main():
+    """Rebuild or query the mention time series."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if '--rebuild' in sys.argv:
+        from scrape_rss import init_supabase
+        print(f"\n🔄 Rebuilding mention time series from stored articles...")
+        total = rebuild(init_supabase())
+        print(f"✅ Counted {total} articles\n")
+        return
+
+    if '--query' in sys.argv:
+        idx = sys.argv.index('--query')
+        competitor = sys.argv[idx + 1]
+        days = int(sys.argv[idx + 2]) if len(sys.argv) > idx + 2 else 30
+
+        series = MentionSeries.load()
+        end_hour = int(datetime.now(timezone.utc).timestamp() // 3600) + 1
+        started = time.perf_counter()
+        counts = series.window(competitor, end_hour - days * 24, end_hour)
+        daily = counts[:len(counts) // 24 * 24].reshape(-1, 24).sum(axis=1)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n📊 {competitor} mentions, last {days} days ({elapsed_ms:.2f} ms)")
+        print(f"   Total: {int(counts.sum())}")
+        print(f"   Peak hour: {int(counts.max()) if counts.size else 0}")
+        print(f"   Daily mean: {daily.mean() if daily.size else 0:.2f}")
+        print(f"   Last 7 days: {daily[-7:].tolist()}\n")
+        return
+
+    print(__doc__)
+
+if __name__ == "__main__":
+    main()
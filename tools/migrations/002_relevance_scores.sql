@@ -0,0 +1,10 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Relevance scores per article
+-- Created: 2026-10-19
+
+-- Best competitor score and per-competitor breakdown, written by the scrapers
+ALTER TABLE articles ADD COLUMN relevance_score REAL DEFAULT 0;
+ALTER TABLE articles ADD COLUMN relevance_scores JSONB DEFAULT '{}'::jsonb;
+
+-- Lets the dashboard rank by relevance within a time window
+CREATE INDEX idx_relevance_score ON articles(relevance_score DESC);
@@ -0,0 +1,13 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Indexes for keyset-paginated retention pruning
+-- Created: 2026-10-19
+
+-- (published_at, id) keyset used by tools/prune_retention.py
+CREATE INDEX idx_articles_published_id ON articles(published_at, id);
+
+-- Expired scraper runs are found by start time
+CREATE INDEX idx_scraper_runs_started_id ON scraper_runs(started_at, id);
+
+-- saved_articles lookups by article (UNIQUE(article_id, user_id) covers this,
+-- kept explicit for clarity of the pruning query plan)
+CREATE INDEX IF NOT EXISTS idx_saved_article_id ON saved_articles(article_id);
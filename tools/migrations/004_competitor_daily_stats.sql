@@ -0,0 +1,91 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Competitor rollup maintained at write time
+-- Created: 2026-10-19
+
+-- Table: Competitor Daily Stats
+-- Article counts per day x competitor x source. Rows with competitor = '*'
+-- count articles (an article mentioning two competitors counts once there).
+CREATE TABLE competitor_daily_stats (
+  day DATE NOT NULL,
+  competitor TEXT NOT NULL,
+  source TEXT NOT NULL,
+  article_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (day, competitor, source)
+);
+
+CREATE INDEX idx_stats_competitor ON competitor_daily_stats(competitor, day DESC);
+
+-- Distinct filter values for the dashboard (reads the rollup, not articles)
+CREATE VIEW article_filter_values AS
+  SELECT 'competitor' AS kind, competitor AS value
+    FROM competitor_daily_stats WHERE competitor <> '*' GROUP BY competitor
+  UNION ALL
+  SELECT 'source' AS kind, source AS value
+    FROM competitor_daily_stats GROUP BY source;
+
+-- Apply signed count deltas: [{"day", "competitor", "source", "count"}, ...]
+CREATE OR REPLACE FUNCTION increment_competitor_stats(deltas JSONB)
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO competitor_daily_stats (day, competitor, source, article_count)
+  SELECT (d->>'day')::date, d->>'competitor', d->>'source', SUM((d->>'count')::int)
+  FROM jsonb_array_elements(deltas) AS d
+  GROUP BY 1, 2, 3
+  ON CONFLICT (day, competitor, source) DO UPDATE
+    SET article_count = competitor_daily_stats.article_count + EXCLUDED.article_count,
+        updated_at = NOW();
+
+  -- Only the keys just changed can have dropped to zero (primary key lookups)
+  DELETE FROM competitor_daily_stats AS s
+  USING (
+    SELECT DISTINCT (d->>'day')::date AS day, d->>'competitor' AS competitor, d->>'source' AS source
+    FROM jsonb_array_elements(deltas) AS d
+  ) AS k
+  WHERE s.day = k.day AND s.competitor = k.competitor AND s.source = k.source
+    AND s.article_count <= 0;
+$$;
+
+-- Rebuild the rollup from the articles table (backfill)
+CREATE OR REPLACE FUNCTION rebuild_competitor_stats()
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  row_count INTEGER;
+BEGIN
+  DELETE FROM competitor_daily_stats;
+
+  INSERT INTO competitor_daily_stats (day, competitor, source, article_count)
+  SELECT (a.published_at AT TIME ZONE 'UTC')::date, c.competitor, a.source, COUNT(*)
+  FROM articles AS a
+  CROSS JOIN LATERAL unnest(a.competitors || ARRAY['*']) AS c(competitor)
+  GROUP BY 1, 2, 3;
+
+  GET DIAGNOSTICS row_count = ROW_COUNT;
+  RETURN row_count;
+END;
+$$;
+
+-- Only the scrapers (service role) may change the rollup; Supabase grants
+-- EXECUTE to anon and authenticated by default
+REVOKE EXECUTE ON FUNCTION increment_competitor_stats(JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION rebuild_competitor_stats() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION increment_competitor_stats(JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION rebuild_competitor_stats() TO service_role;
+
+-- RLS: readable by everyone, written by the service role
+ALTER TABLE competitor_daily_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Competitor stats are viewable by everyone"
+  ON competitor_daily_stats FOR SELECT
+  USING (true);
+
+CREATE POLICY "Service role can manage competitor stats"
+  ON competitor_daily_stats FOR ALL
+  WITH CHECK (auth.role() = 'service_role');
@@ -0,0 +1,45 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Competitor config version per article, for bulk re-tagging
+-- Created: 2026-10-19
+
+-- Hash of the competitor config the row was tagged with (tools/competitors.py)
+ALTER TABLE articles ADD COLUMN tag_version TEXT;
+
+CREATE INDEX idx_articles_tag_version ON articles(tag_version);
+
+-- Apply a batch of re-tag results in one statement.
+--   changes:   [{"id", "competitors", "relevance_score", "relevance_scores"}, ...]
+--              rows whose tags changed
+--   unchanged: [uuid, ...]                                 rows only needing the version bump
+CREATE OR REPLACE FUNCTION retag_articles(changes JSONB, unchanged JSONB, version TEXT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  changed_count INTEGER;
+BEGIN
+  UPDATE articles AS a
+     SET competitors = c.competitors,
+         relevance_score = c.relevance_score,
+         relevance_scores = c.relevance_scores,
+         tag_version = version
+    FROM jsonb_to_recordset(changes)
+      AS c(id UUID, competitors TEXT[], relevance_score REAL, relevance_scores JSONB)
+   WHERE a.id = c.id;
+
+  GET DIAGNOSTICS changed_count = ROW_COUNT;
+
+  UPDATE articles
+     SET tag_version = version
+   WHERE id IN (SELECT (jsonb_array_elements_text(unchanged))::uuid);
+
+  RETURN changed_count;
+END;
+$$;
+
+-- Only the re-tag job (service role) may rewrite tags; Supabase grants
+-- EXECUTE to anon and authenticated by default
+REVOKE EXECUTE ON FUNCTION retag_articles(JSONB, JSONB, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION retag_articles(JSONB, JSONB, TEXT) TO service_role;
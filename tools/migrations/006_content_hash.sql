@@ -0,0 +1,12 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Content fingerprint per article for change detection
+-- Created: 2026-10-19
+
+-- SHA-1 over normalized title, summary and author (tools/storage.py).
+-- Rows stored before this migration get a hash the next time they are seen.
+ALTER TABLE articles ADD COLUMN content_hash TEXT;
+
+-- Allow the service role to patch changed articles
+CREATE POLICY "Service role can update articles"
+  ON articles FOR UPDATE
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,82 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Worker and source leases for sharded scraping (tools/shard_coordinator.py)
+-- Created: 2026-10-19
+
+CREATE TABLE worker_leases (
+  worker_id TEXT PRIMARY KEY,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE TABLE source_leases (
+  round TEXT NOT NULL,
+  source_id TEXT NOT NULL,
+  worker_id TEXT NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  completed BOOLEAN NOT NULL DEFAULT FALSE,
+  PRIMARY KEY (round, source_id)
+);
+
+CREATE INDEX idx_source_leases_completed ON source_leases(round) WHERE completed;
+
+-- Register or renew a worker lease (server time, so worker clocks don't matter)
+CREATE OR REPLACE FUNCTION renew_worker_lease(p_worker_id TEXT, p_ttl_seconds INTEGER)
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO worker_leases (worker_id, expires_at)
+  VALUES (p_worker_id, NOW() + make_interval(secs => p_ttl_seconds))
+  ON CONFLICT (worker_id) DO UPDATE SET expires_at = EXCLUDED.expires_at;
+$$;
+
+CREATE OR REPLACE FUNCTION live_workers()
+RETURNS TABLE (worker_id TEXT)
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT worker_id FROM worker_leases WHERE expires_at > NOW();
+$$;
+
+-- Claim a source for a round unless it is completed or leased by a live worker
+CREATE OR REPLACE FUNCTION claim_source(p_round TEXT, p_source_id TEXT, p_worker_id TEXT, p_ttl_seconds INTEGER)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  claimed INTEGER;
+BEGIN
+  INSERT INTO source_leases (round, source_id, worker_id, expires_at)
+  VALUES (p_round, p_source_id, p_worker_id, NOW() + make_interval(secs => p_ttl_seconds))
+  ON CONFLICT (round, source_id) DO UPDATE
+    SET worker_id = EXCLUDED.worker_id, expires_at = EXCLUDED.expires_at
+    WHERE NOT source_leases.completed
+      AND (source_leases.expires_at < NOW() OR source_leases.worker_id = EXCLUDED.worker_id);
+
+  GET DIAGNOSTICS claimed = ROW_COUNT;
+  RETURN claimed = 1;
+END;
+$$;
+
+-- Leases are internal to the scrapers; Supabase grants EXECUTE to anon and
+-- authenticated by default
+REVOKE EXECUTE ON FUNCTION renew_worker_lease(TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION live_workers() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION claim_source(TEXT, TEXT, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION renew_worker_lease(TEXT, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION live_workers() TO service_role;
+GRANT EXECUTE ON FUNCTION claim_source(TEXT, TEXT, TEXT, INTEGER) TO service_role;
+
+ALTER TABLE worker_leases ENABLE ROW LEVEL SECURITY;
+ALTER TABLE source_leases ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage worker leases"
+  ON worker_leases FOR ALL
+  USING (auth.role() = 'service_role');
+
+CREATE POLICY "Service role can manage source leases"
+  ON source_leases FOR ALL
+  USING (auth.role() = 'service_role');
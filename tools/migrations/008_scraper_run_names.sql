@@ -0,0 +1,15 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Per-scraper run history for deadline-aware scheduling
+-- Created: 2026-10-19
+
+-- Which scraper a run belongs to (matches SOURCE_NAME in tools/scrape_*.py)
+ALTER TABLE scraper_runs ADD COLUMN scraper_name TEXT;
+
+-- Recent runs per scraper (tools/scheduler.py reads the latest few)
+CREATE INDEX idx_scraper_runs_name_started ON scraper_runs(scraper_name, started_at DESC);
+
+-- Runs killed at the end of their time slice (logged by tools/run_all_scrapers.py,
+-- completed_at = started_at + slice, so they count toward the expected cost)
+ALTER TABLE scraper_runs DROP CONSTRAINT IF EXISTS scraper_runs_status_check;
+ALTER TABLE scraper_runs ADD CONSTRAINT scraper_runs_status_check
+  CHECK (status IN ('running', 'completed', 'failed', 'timeout'));
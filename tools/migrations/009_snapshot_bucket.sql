@@ -0,0 +1,8 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Public Storage bucket for precomputed dashboard snapshots (tools/export_snapshot.py)
+-- Created: 2026-10-19
+
+-- Public read (served through the Storage CDN); only the service role writes
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('snapshots', 'snapshots', TRUE)
+ON CONFLICT (id) DO UPDATE SET public = TRUE;
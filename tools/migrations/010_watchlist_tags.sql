@@ -0,0 +1,44 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Per-watchlist tags (tools/watchlists.py), one shared scrape for every team
+-- Created: 2026-10-19
+
+-- {"watchlist name": ["Matched", "Names"], ...}; NULL while no team watchlists are configured
+ALTER TABLE articles ADD COLUMN watchlist_tags JSONB;
+
+-- Team views filter with watchlist_tags ? 'exchanges' or @> '{"exchanges": ["Kraken"]}'
+CREATE INDEX idx_articles_watchlist_tags ON articles USING GIN (watchlist_tags);
+
+-- Same as 005, also writing watchlist_tags when a change carries them
+CREATE OR REPLACE FUNCTION retag_articles(changes JSONB, unchanged JSONB, version TEXT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  changed_count INTEGER;
+BEGIN
+  UPDATE articles AS a
+     SET competitors = c.competitors,
+         relevance_score = c.relevance_score,
+         relevance_scores = c.relevance_scores,
+         watchlist_tags = COALESCE(c.watchlist_tags, a.watchlist_tags),
+         tag_version = version
+    FROM jsonb_to_recordset(changes)
+      AS c(id UUID, competitors TEXT[], relevance_score REAL, relevance_scores JSONB, watchlist_tags JSONB)
+   WHERE a.id = c.id;
+
+  GET DIAGNOSTICS changed_count = ROW_COUNT;
+
+  UPDATE articles
+     SET tag_version = version
+   WHERE id IN (SELECT (jsonb_array_elements_text(unchanged))::uuid);
+
+  RETURN changed_count;
+END;
+$$;
+
+-- Only the re-tag job (service role) may rewrite tags; Supabase grants
+-- EXECUTE to anon and authenticated by default
+REVOKE EXECUTE ON FUNCTION retag_articles(JSONB, JSONB, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION retag_articles(JSONB, JSONB, TEXT) TO service_role;
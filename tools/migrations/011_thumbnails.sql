@@ -0,0 +1,16 @@
+-- Crypto Competitor Intelligence Dashboard
+-- Cached article thumbnails (tools/thumbnail_cache.py)
+-- Created: 2026-10-19
+
+-- Small WebP copy of image_url and the dimensions of both
+ALTER TABLE articles ADD COLUMN thumbnail_url TEXT;
+ALTER TABLE articles ADD COLUMN thumbnail_width INTEGER;
+ALTER TABLE articles ADD COLUMN thumbnail_height INTEGER;
+ALTER TABLE articles ADD COLUMN image_width INTEGER;
+ALTER TABLE articles ADD COLUMN image_height INTEGER;
+
+-- Public read (served through the Storage CDN); files are named by content hash
+-- and never change, so they are cached for a year. Only the service role writes
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('thumbnails', 'thumbnails', TRUE)
+ON CONFLICT (id) DO UPDATE SET public = TRUE;
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Per-Stage Run Profiler
+Profiles each pipeline stage of a scraper run when the script is started with
+--profile, to see whether time goes to feed parsing, date parsing, competitor
+matching or Supabase HTTP calls.
+
+For every stage it writes to the profile directory:
+- <stage>.pstats     cProfile output (python3 -m pstats, snakeviz)
+- <stage>.collapsed  sampled stacks in collapsed format (flamegraph.pl, speedscope)
+- summary.txt        stage wall times and the top-N functions by own time
+
+Without --profile, stage() returns a shared no-op context manager, so the
+instrumented code runs unchanged.
+
+Usage:
+    python3 tools/scrape_rss.py --profile
+    python3 tools/run_all_scrapers.py --profile   # Profiles every scraper
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+from local_state import get_state_path
+
+# Sampling interval for collapsed stacks (override with PROFILE_SAMPLE_MS)
+DEFAULT_SAMPLE_MS = 5
+# Rows in the summary table
+TOP_N = 15
+
+_NULL_STAGE = nullcontext()
+
+def profile_requested() -> bool:
+    """Return True if the current script was started with --profile."""
+    return '--profile' in sys.argv
+
+def default_profile_dir() -> str:
+    """Return the run directory for profiles (PROFILE_DIR or a timestamped one)."""
+    if os.getenv('PROFILE_DIR'):
+        return os.getenv('PROFILE_DIR')
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return os.path.join(os.path.dirname(get_state_path()), 'profiles', stamp)
+
+def slugify(name: str) -> str:
+    """Turn a source or stage name into a file-safe slug."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'run'
+
+def frame_label(frame) -> str:
+    """Collapsed-stack label for a frame: function (file:line)."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+class StackSampler(threading.Thread):
+    """Background thread that samples the stacks of all other threads."""
+
+    def __init__(self, root: str, interval: float):
+        super().__init__(daemon=True)
+        self.root = root
+        self.interval = interval
+        self.counts = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                self.counts[";".join([self.root] + stack[::-1])] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+class StageProfiler:
+    """Collects one profile per named pipeline stage."""
+
+    def __init__(self, name: str, enabled: bool, output_dir: str = None):
+        self.name = name
+        self.enabled = enabled
+        self.output_dir = os.path.join(output_dir or default_profile_dir(), slugify(name)) if enabled else None
+        self.interval = float(os.getenv('PROFILE_SAMPLE_MS', DEFAULT_SAMPLE_MS)) / 1000
+        self.stages = []  # (stage, seconds, pstats.Stats)
+
+    @classmethod
+    def from_argv(cls, name: str) -> "StageProfiler":
+        """Create a profiler that is enabled only when --profile was passed."""
+        return cls(name, profile_requested())
+
+    def stage(self, stage: str):
+        """Context manager profiling one stage (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._profile_stage(stage)
+
+    @contextmanager
+    def _profile_stage(self, stage: str):
+        os.makedirs(self.output_dir, exist_ok=True)
+        slug = slugify(stage)
+        profiler = cProfile.Profile()
+        sampler = StackSampler(stage, self.interval)
+
+        sampler.start()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+
+            profiler.dump_stats(os.path.join(self.output_dir, f"{slug}.pstats"))
+            with open(os.path.join(self.output_dir, f"{slug}.collapsed"), 'w') as f:
+                for stack, count in sorted(sampler.counts.items()):
+                    f.write(f"{stack} {count}\n")
+
+            self.stages.append((stage, elapsed, pstats.Stats(profiler)))
+
+    def summary_lines(self, top_n: int = TOP_N) -> list:
+        """Build the stage timing and top-N function table."""
+        total = sum(seconds for _, seconds, _ in self.stages) or 1.0
+        lines = [f"Profile: {self.name}", "", f"{'Stage':<20} {'Seconds':>9} {'Share':>7}"]
+        for stage, seconds, _ in self.stages:
+            lines.append(f"{stage:<20} {seconds:>9.3f} {seconds / total:>6.1%}")
+
+        rows = []
+        for stage, _, stats in self.stages:
+            for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+                where = f"{os.path.basename(filename)}:{line}({func})" if line else func
+                rows.append((tottime, cumtime, calls, stage, where))
+        rows.sort(reverse=True)
+
+        lines += ["", f"Top {top_n} functions by own time", "",
+                  f"{'Own s':>8} {'Cum s':>8} {'Calls':>9}  {'Stage':<12} Function"]
+        for tottime, cumtime, calls, stage, where in rows[:top_n]:
+            lines.append(f"{tottime:>8.3f} {cumtime:>8.3f} {calls:>9}  {stage[:12]:<12} {where}")
+        return lines
+
+    def report(self):
+        """Write summary.txt and print the summary table (no-op when disabled)."""
+        if not self.enabled or not self.stages:
+            return
+
+        lines = self.summary_lines()
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+        print(f"\n{'='*60}")
+        print(f"⏱  Profile Summary")
+        print(f"{'='*60}")
+        for line in lines[2:]:
+            print(f"   {line}")
+        print(f"\n   Profiles written to {self.output_dir}")
+        print(f"   Flamegraph: flamegraph.pl {self.output_dir}/<stage>.collapsed > flame.svg\n")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Retention Pruning Job
+Deletes articles and scraper runs older than DATA_RETENTION_DAYS in bounded,
+keyset-paginated batches. Articles referenced by saved_articles are kept.
+
+Deleted articles are also removed from the local URL cache, the competitor
+rollup and the local search index. The hourly mention series keeps their
+counts: it is the long-term history behind --query and spike detection, and
+the pruned hours are far past its re-check window.
+
+Usage:
+    python3 tools/prune_retention.py              # Prune using DATA_RETENTION_DAYS
+    python3 tools/prune_retention.py --dry-run    # Report what would be removed
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from local_state import open_state, forget_articles
+from rollup_stats import increment_stats
+from search_index import unmirror_articles
+
+# Load environment
+load_dotenv()
+
+# Constants
+DEFAULT_RETENTION_DAYS = 30
+BATCH_SIZE = 500  # Rows selected and deleted per request
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def get_retention_days() -> int:
+    """Return DATA_RETENTION_DAYS from the environment."""
+    try:
+        return int(os.getenv('DATA_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+    except ValueError:
+        return DEFAULT_RETENTION_DAYS
+
+def keyset_filter(time_column: str, last_time: str, last_id: str) -> str:
+    """Build the PostgREST `or` filter for rows after (last_time, last_id)."""
+    return f'{time_column}.gt."{last_time}",and({time_column}.eq."{last_time}",id.gt.{last_id})'
+
+def fetch_expired_page(supabase: Client, table: str, time_column: str, columns: str,
+                       cutoff: str, cursor: tuple = None) -> list:
+    """Fetch one page of expired rows ordered by (time_column, id).
+
+    Args:
+        supabase: Supabase client
+        table: Table name
+        time_column: Timestamp column compared against the cutoff
+        columns: Columns to select (must include id and time_column)
+        cutoff: ISO timestamp; rows older than this are expired
+        cursor: (time, id) of the last row of the previous page
+
+    Returns:
+        list: Rows of the page
+    """
+    query = supabase.table(table).select(columns).lt(time_column, cutoff)
+
+    if cursor:
+        query = query.or_(keyset_filter(time_column, *cursor))
+
+    result = query.order(f"{time_column},id").limit(BATCH_SIZE).execute()
+    return result.data or []
+
+def saved_article_ids(supabase: Client, article_ids: list) -> set:
+    """Return the subset of article IDs referenced by saved_articles."""
+    if not article_ids:
+        return set()
+
+    result = supabase.table('saved_articles').select('article_id').in_('article_id', article_ids).execute()
+    return {row['article_id'] for row in result.data or []}
+
+def prune_articles(supabase: Client, cutoff: str, dry_run: bool = False) -> dict:
+    """Delete expired, unsaved articles batch by batch.
+
+    Args:
+        supabase: Supabase client
+        cutoff: ISO timestamp; articles published before it are expired
+        dry_run: Only count rows, don't delete
+
+    Returns:
+        dict: Statistics (deleted, kept_saved, batches)
+    """
+    stats = {"deleted": 0, "kept_saved": 0, "batches": 0}
+    cache = open_state()
+    cursor = None
+
+    try:
+        while True:
+            rows = fetch_expired_page(supabase, 'articles', 'published_at',
+                                      'id, url, published_at, source, competitors', cutoff, cursor)
+            if not rows:
+                break
+
+            stats['batches'] += 1
+            cursor = (rows[-1]['published_at'], rows[-1]['id'])
+
+            saved = saved_article_ids(supabase, [r['id'] for r in rows])
+            expired = [r for r in rows if r['id'] not in saved]
+            stats['kept_saved'] += len(saved)
+
+            if expired and not dry_run:
+                supabase.table('articles').delete().in_('id', [r['id'] for r in expired]).execute()
+                forget_articles(cache, [r['url'] for r in expired])
+                increment_stats(supabase, expired, sign=-1)
+                unmirror_articles([r['url'] for r in expired])
+
+            stats['deleted'] += len(expired)
+            print(f"   🗑  Batch {stats['batches']}: {len(expired)} articles expired, {len(saved)} kept (saved)")
+
+            if len(rows) < BATCH_SIZE:
+                break
+    finally:
+        cache.close()
+
+    return stats
+
+def prune_scraper_runs(supabase: Client, cutoff: str, dry_run: bool = False) -> dict:
+    """Delete expired scraper_runs rows batch by batch.
+
+    Args:
+        supabase: Supabase client
+        cutoff: ISO timestamp; runs started before it are expired
+        dry_run: Only count rows, don't delete
+
+    Returns:
+        dict: Statistics (deleted, batches)
+    """
+    stats = {"deleted": 0, "batches": 0}
+    cursor = None
+
+    while True:
+        rows = fetch_expired_page(supabase, 'scraper_runs', 'started_at', 'id, started_at', cutoff, cursor)
+        if not rows:
+            break
+
+        stats['batches'] += 1
+        cursor = (rows[-1]['started_at'], rows[-1]['id'])
+
+        if not dry_run:
+            supabase.table('scraper_runs').delete().in_('id', [r['id'] for r in rows]).execute()
+
+        stats['deleted'] += len(rows)
+        print(f"   🗑  Batch {stats['batches']}: {len(rows)} scraper runs expired")
+
+        if len(rows) < BATCH_SIZE:
+            break
+
+    return stats
+
+def main():
+    """Main pruning execution."""
+    dry_run = '--dry-run' in sys.argv
+    retention_days = get_retention_days()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).isoformat()
+
+    print(f"\n{'='*60}")
+    print(f"🧹 Retention Pruning Started{' (dry run)' if dry_run else ''}")
+    print(f"   Retention: {retention_days} days (cutoff {cutoff})")
+    print(f"   Batch Size: {BATCH_SIZE}")
+    print(f"{'='*60}\n")
+
+    try:
+        print(f"🔌 Connecting to Supabase...")
+        supabase = init_supabase()
+        print(f"✅ Connected to Supabase\n")
+
+        started = time.monotonic()
+
+        print(f"📰 Pruning articles...")
+        article_stats = prune_articles(supabase, cutoff, dry_run)
+        articles_elapsed = time.monotonic() - started
+
+        print(f"\n📝 Pruning scraper runs...")
+        run_stats = prune_scraper_runs(supabase, cutoff, dry_run)
+        total_elapsed = time.monotonic() - started
+
+        print(f"\n{'='*60}")
+        print(f"✅ Retention Pruning Complete")
+        print(f"{'='*60}")
+        print(f"   Articles Removed: {article_stats['deleted']} ({articles_elapsed:.2f}s)")
+        print(f"   Saved Articles Kept: {article_stats['kept_saved']}")
+        print(f"   Scraper Runs Removed: {run_stats['deleted']} ({total_elapsed - articles_elapsed:.2f}s)")
+        print(f"   Total Time: {total_elapsed:.2f}s")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Pruning failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
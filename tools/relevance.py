@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Competitor Relevance Scoring
+Scores every (article, competitor) pair with a TF-IDF style weight so that a
+single mention in a footer no longer makes an article "relevant".
+
+Score components:
+- Mention counts per field (title, summary, body)
+- Field weights (title > summary > body)
+- Position (early mentions weigh more than late ones)
+- Corpus IDF, maintained incrementally in the local state database from the
+  articles stored for the first time (storage.py), so re-fetching an article
+  does not count it again
+
+Usage:
+    python3 tools/relevance.py --rebuild-idf   # Recompute IDF from stored articles
+"""
+
+import os
+import sys
+import numpy as np
+
+from local_state import open_state
+from competitors import COMPETITORS, config_hash
+from competitor_rules import get_matcher
+
+# Field order used for every score matrix
+FIELDS = ("title", "summary", "body")
+FIELD_WEIGHTS = np.array([3.0, 2.0, 1.0])
+
+# A mention at the very end of a field counts this much of one at the start
+MIN_POSITION_WEIGHT = 0.5
+
+# Pairs scoring below this are dropped (override with RELEVANCE_MIN_SCORE)
+DEFAULT_MIN_SCORE = 1.0
+
+# Articles are scored in micro-batches of this size
+BATCH_SIZE = 256
+
+def get_min_score() -> float:
+    """Return the relevance threshold from the environment."""
+    try:
+        return float(os.getenv('RELEVANCE_MIN_SCORE', DEFAULT_MIN_SCORE))
+    except ValueError:
+        return DEFAULT_MIN_SCORE
+
+def ensure_schema(conn):
+    """Create the corpus statistics tables if missing."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS relevance_corpus (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS relevance_df (
+            competitor TEXT PRIMARY KEY,
+            df INTEGER NOT NULL
+        );
+    """)
+
+def count_mentions(fields_list: list, competitors: list, mentions: list = None):
+    """Count mentions and first positions for a batch of articles.
+
+    Mentions are counted only for competitors whose rule matches the article
+    (competitor_rules.py).
+
+    Args:
+        fields_list: List of (title, summary, body) tuples
+        competitors: Lowercase competitor names
+        mentions: Optional precomputed RuleMatcher.mentions() per article
+            (e.g. from cpu_pool.py workers); fields_list is not scanned then
+
+    Returns:
+        tuple: (counts, first_pos) arrays of shape (articles, competitors, fields).
+            first_pos is the relative offset (0..1) of the first mention.
+    """
+    if mentions is None:
+        matcher = get_matcher(competitors)
+        mentions = [matcher.mentions(fields) for fields in fields_list]
+
+    shape = (len(fields_list), len(competitors), len(FIELDS))
+    counts = np.zeros(shape, dtype=np.float64)
+    first_pos = np.ones(shape, dtype=np.float64)
+
+    for a, found in enumerate(mentions):
+        for c, per_field in found.items():
+            for f, (count, first) in per_field.items():
+                counts[a, c, f] = count
+                first_pos[a, c, f] = first
+
+    return counts, first_pos
+
+def load_idf(conn, competitors: list) -> np.ndarray:
+    """Load smoothed IDF values for the given competitors.
+
+    Args:
+        conn: Local state connection
+        competitors: Lowercase competitor names
+
+    Returns:
+        np.ndarray: IDF per competitor (>= 1.0)
+    """
+    ensure_schema(conn)
+    row = conn.execute("SELECT value FROM relevance_corpus WHERE key = 'documents'").fetchone()
+    n_docs = row['value'] if row else 0
+
+    df = dict(conn.execute("SELECT competitor, df FROM relevance_df").fetchall())
+    df_arr = np.array([df.get(c.lower(), 0) for c in competitors], dtype=np.float64)
+
+    return np.log((1.0 + n_docs) / (1.0 + df_arr)) + 1.0
+
+def update_corpus(conn, counts: np.ndarray, competitors: list):
+    """Add a batch of observed articles to the corpus statistics.
+
+    Args:
+        conn: Local state connection
+        counts: Mention counts from count_mentions()
+        competitors: Lowercase competitor names
+    """
+    ensure_schema(conn)
+    doc_freq = (counts.sum(axis=2) > 0).sum(axis=0)
+
+    with conn:
+        conn.execute("""
+            INSERT INTO relevance_corpus (key, value) VALUES ('documents', ?)
+            ON CONFLICT(key) DO UPDATE SET value = value + excluded.value
+        """, (int(counts.shape[0]),))
+        conn.executemany("""
+            INSERT INTO relevance_df (competitor, df) VALUES (?, ?)
+            ON CONFLICT(competitor) DO UPDATE SET df = df + excluded.df
+        """, [(c.lower(), int(n)) for c, n in zip(competitors, doc_freq) if n])
+
+def add_documents(articles: list, texts: dict = None, competitors: list = None, conn=None):
+    """Add newly stored articles to the corpus statistics.
+
+    Args:
+        articles: Normalized articles that were just inserted
+        texts: Optional url -> extracted article text (body field)
+        competitors: Lowercase competitor names, defaults to the configured list
+        conn: Optional local state connection (opened if not given)
+    """
+    if not articles:
+        return
+
+    competitors = competitors or COMPETITORS
+    texts = texts or {}
+    fields_list = [(a.get('title') or '', a.get('summary') or '', texts.get(a['url']) or '')
+                   for a in articles]
+
+    own_conn = conn is None
+    conn = conn or open_state()
+    try:
+        for start in range(0, len(fields_list), BATCH_SIZE):
+            counts, _ = count_mentions(fields_list[start:start + BATCH_SIZE], competitors)
+            update_corpus(conn, counts, competitors)
+    finally:
+        if own_conn:
+            conn.close()
+
+def score_batch(counts: np.ndarray, first_pos: np.ndarray, idf: np.ndarray) -> np.ndarray:
+    """Compute relevance scores for a batch.
+
+    Args:
+        counts: Mention counts (articles, competitors, fields)
+        first_pos: Relative first-mention positions (articles, competitors, fields)
+        idf: IDF per competitor
+
+    Returns:
+        np.ndarray: Scores of shape (articles, competitors), 0 where not mentioned
+    """
+    position_weight = 1.0 - (1.0 - MIN_POSITION_WEIGHT) * first_pos
+    weighted = (counts * position_weight * FIELD_WEIGHTS).sum(axis=2)
+
+    tf = np.zeros_like(weighted)
+    mentioned = weighted > 0
+    tf[mentioned] = 1.0 + np.log(weighted[mentioned])
+
+    return np.clip(tf, 0.0, None) * idf
+
+def score_articles(fields_list: list, competitors: list, conn=None, update: bool = False,
+                   mentions: list = None) -> np.ndarray:
+    """Score articles against all competitors in micro-batches.
+
+    Scoring does not change the corpus statistics by default: scrapers see
+    the same articles again on every run, and storage.py adds only the ones
+    it inserts (add_documents()).
+
+    Args:
+        fields_list: List of (title, summary, body) tuples
+        competitors: Lowercase competitor names
+        conn: Optional local state connection (opened if not given)
+        update: Also add these articles to the corpus statistics
+        mentions: Optional precomputed RuleMatcher.mentions() per article
+
+    Returns:
+        np.ndarray: Scores of shape (articles, competitors)
+    """
+    own_conn = conn is None
+    conn = conn or open_state()
+
+    try:
+        scores = np.zeros((len(fields_list), len(competitors)))
+        for start in range(0, len(fields_list), BATCH_SIZE):
+            batch = fields_list[start:start + BATCH_SIZE]
+            counts, first_pos = count_mentions(
+                batch, competitors, mentions[start:start + len(batch)] if mentions is not None else None)
+            if update:
+                update_corpus(conn, counts, competitors)
+            idf = load_idf(conn, competitors)
+            scores[start:start + len(batch)] = score_batch(counts, first_pos, idf)
+        return scores
+    finally:
+        if own_conn:
+            conn.close()
+
+def apply_scores(articles: list, scores: np.ndarray, competitors: list, min_score: float = None) -> list:
+    """Attach scores to normalized articles and drop low-scoring competitors.
+
+    Sets `competitors` to the competitors scoring at least min_score (highest
+    first), `relevance_score` to the best score, `relevance_scores` to the
+    per-competitor breakdown and `tag_version` to the competitor config hash.
+
+    Args:
+        articles: Normalized articles (modified in place)
+        scores: Scores from score_articles()
+        competitors: Lowercase competitor names (same order as scores)
+        min_score: Threshold, defaults to get_min_score()
+
+    Returns:
+        list: Articles that still mention at least one competitor
+    """
+    if min_score is None:
+        min_score = get_min_score()
+
+    tag_version = config_hash(competitors)
+
+    relevant = []
+    for article, row in zip(articles, scores):
+        order = np.argsort(-row, kind='stable')
+        kept = [i for i in order if row[i] > 0 and row[i] >= min_score]
+
+        article['competitors'] = [competitors[i].capitalize() for i in kept]
+        article['relevance_scores'] = {competitors[i].capitalize(): round(float(row[i]), 4) for i in kept}
+        article['relevance_score'] = round(float(row[kept[0]]), 4) if kept else 0.0
+        article['tag_version'] = tag_version
+
+        if kept:
+            relevant.append(article)
+
+    return relevant
+
+def rebuild_idf(supabase, competitors: list, page_size: int = 1000) -> int:
+    """Recompute corpus statistics from the stored articles table.
+
+    Args:
+        supabase: Supabase client
+        competitors: Lowercase competitor names
+        page_size: Rows fetched per request
+
+    Returns:
+        int: Number of articles counted
+    """
+    conn = open_state()
+    ensure_schema(conn)
+    with conn:
+        conn.execute("DELETE FROM relevance_corpus")
+        conn.execute("DELETE FROM relevance_df")
+
+    total = 0
+    start = 0
+    try:
+        while True:
+            result = supabase.table('articles').select('title, summary') \
+                .order('id').range(start, start + page_size - 1).execute()
+            rows = result.data or []
+            if not rows:
+                break
+
+            fields_list = [(r.get('title') or '', r.get('summary') or '', '') for r in rows]
+            counts, _ = count_mentions(fields_list, competitors)
+            update_corpus(conn, counts, competitors)
+
+            total += len(rows)
+            start += page_size
+            if len(rows) < page_size:
+                break
+    finally:
+        conn.close()
+
+    return total
+
+def main():
+    """Rebuild the IDF statistics from Supabase."""
+    from dotenv import load_dotenv
+    from scrape_rss import init_supabase
+    from competitors import COMPETITORS
+
+    load_dotenv()
+
+    if '--rebuild-idf' not in sys.argv:
+        print(__doc__)
+        return
+
+    print(f"\n🔄 Rebuilding relevance IDF from stored articles...")
+    total = rebuild_idf(init_supabase(), COMPETITORS)
+    print(f"✅ Counted {total} articles\n")
+
+if __name__ == "__main__":
+    main()
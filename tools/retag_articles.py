@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bulk Competitor Re-tagging
+Re-runs competitor detection over stored articles after the competitor config
+(tools/competitors.py) or the team watchlists (tools/watchlists.py) change,
+e.g. when a competitor or alias is added.
+
+- Streams articles with keyset pagination on id
+- Skips rows already tagged with the current config (tag_version)
+- Scores pages in a worker pool
+- Writes back only rows whose competitors or watchlist tags changed, one
+  RPC per page
+
+By default tags are only added: competitors and watchlist names the current
+rules find in the stored title and summary join the existing tags, which are
+all kept. Stored rows don't keep the article body, so a re-score can't tell a
+false positive from a competitor only mentioned there. --replace sets the
+tags to what the rules find (removing false positives and tags of removed
+competitors, and possibly leaving a row with no competitors).
+
+Usage:
+    python3 tools/retag_articles.py              # Add tags to stale rows
+    python3 tools/retag_articles.py --dry-run    # Report changes without writing
+    python3 tools/retag_articles.py --replace    # Replace tags with the re-scored ones
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from competitors import COMPETITORS
+from relevance import score_articles, apply_scores
+from watchlists import get_watchlist_matcher
+from rollup_stats import increment_stats
+
+# Load environment
+load_dotenv()
+
+# Constants
+PAGE_SIZE = 500
+DEFAULT_WORKERS = 4  # Override with RETAG_WORKERS
+COLUMNS = 'id, title, summary, source, published_at, competitors, relevance_scores, tag_version'
+
+# Current tag version (competitor config + team watchlists)
+TAG_VERSION = get_watchlist_matcher().version
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def stream_stale_articles(supabase: Client):
+    """Yield pages of articles not tagged with the current config.
+
+    Uses keyset pagination on id, so each page is an index range scan.
+    """
+    columns = COLUMNS + (', watchlist_tags' if get_watchlist_matcher().matcher else '')
+    last_id = None
+    while True:
+        query = supabase.table('articles').select(columns) \
+            .or_(f"tag_version.is.null,tag_version.neq.{TAG_VERSION}")
+        if last_id:
+            query = query.gt('id', last_id)
+
+        rows = query.order('id').limit(PAGE_SIZE).execute().data or []
+        if not rows:
+            return
+
+        yield rows
+        last_id = rows[-1]['id']
+
+        if len(rows) < PAGE_SIZE:
+            return
+
+def retag_page(replace: bool, rows: list) -> tuple:
+    """Re-detect competitors for one page (runs in a worker process).
+
+    Args:
+        replace: Drop old tags the new rules don't find (otherwise tags are
+            only added)
+        rows: Stored article rows
+
+    Returns:
+        tuple: (changes, unchanged_ids) where changes are dicts with the row's
+            old and new tags
+    """
+    fields_list = [(r.get('title') or '', r.get('summary') or '', '') for r in rows]
+    scores = score_articles(fields_list, COMPETITORS, update=False)
+
+    retagged = [{"competitors": []} for _ in rows]
+    apply_scores(retagged, scores, COMPETITORS)
+
+    watchlists = get_watchlist_matcher()
+    changes, unchanged = [], []
+
+    for row, new, fields in zip(rows, retagged, fields_list):
+        old_tags = row.get('competitors') or []
+        kept = [] if replace else [c for c in old_tags if c not in new['competitors']]
+        new_tags = new['competitors'] + kept
+
+        old_scores = row.get('relevance_scores') or {}
+        merged_scores = {**{c: old_scores[c] for c in kept if c in old_scores}, **new['relevance_scores']}
+
+        watchlist_tags = watchlists.tag(fields) if watchlists.matcher else None
+        if watchlist_tags is not None and not replace:
+            merged = {name: list(names) for name, names in (row.get('watchlist_tags') or {}).items()}
+            for name, names in watchlist_tags.items():
+                found = merged.setdefault(name, [])
+                found.extend(n for n in names if n not in found)
+            watchlist_tags = merged
+        if sorted(new_tags) == sorted(old_tags) and watchlist_tags == row.get('watchlist_tags'):
+            unchanged.append(row['id'])
+            continue
+
+        changes.append({
+            "id": row['id'],
+            "source": row.get('source'),
+            "published_at": row.get('published_at'),
+            "old_competitors": old_tags,
+            "competitors": new_tags,
+            "relevance_score": max(merged_scores.values(), default=0.0),
+            "relevance_scores": merged_scores,
+            "watchlist_tags": watchlist_tags,
+        })
+
+    return changes, unchanged
+
+def write_page(supabase: Client, changes: list, unchanged: list):
+    """Write one page of re-tag results and adjust the competitor rollup."""
+    payload = [
+        {k: c[k] for k in ("id", "competitors", "relevance_score", "relevance_scores", "watchlist_tags")}
+        for c in changes
+    ]
+    supabase.rpc('retag_articles', {"changes": payload, "unchanged": unchanged, "version": TAG_VERSION}).execute()
+
+    if changes:
+        increment_stats(supabase, [{**c, "competitors": c['old_competitors']} for c in changes], sign=-1)
+        increment_stats(supabase, changes)
+
+def main():
+    """Main re-tag execution."""
+    dry_run = '--dry-run' in sys.argv
+    replace = '--replace' in sys.argv
+    workers = int(os.getenv('RETAG_WORKERS', DEFAULT_WORKERS))
+
+    print(f"\n{'='*60}")
+    print(f"🏷  Competitor Re-tagging Started{' (dry run)' if dry_run else ''}")
+    print(f"   Config Version: {TAG_VERSION}")
+    print(f"   Competitors: {', '.join(COMPETITORS)}")
+    print(f"   Mode: {'replace tags (--replace)' if replace else 'add tags only'}")
+    print(f"{'='*60}\n")
+
+    try:
+        supabase = init_supabase()
+        stats = {"scanned": 0, "changed": 0, "unchanged": 0}
+        started = time.monotonic()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = []
+            pages = stream_stale_articles(supabase)
+
+            while True:
+                # Keep a bounded number of pages in flight
+                for rows in pages:
+                    stats['scanned'] += len(rows)
+                    in_flight.append(pool.submit(retag_page, replace, rows))
+                    if len(in_flight) >= workers * 2:
+                        break
+
+                if not in_flight:
+                    break
+
+                changes, unchanged = in_flight.pop(0).result()
+                stats['changed'] += len(changes)
+                stats['unchanged'] += len(unchanged)
+
+                if not dry_run:
+                    write_page(supabase, changes, unchanged)
+
+                for change in changes[:5]:
+                    print(f"   🏷  {change['id']}: {change['old_competitors']} → {change['competitors']}")
+
+        elapsed = time.monotonic() - started
+
+        print(f"\n{'='*60}")
+        print(f"✅ Re-tagging Complete")
+        print(f"{'='*60}")
+        print(f"   Rows Scanned: {stats['scanned']}")
+        print(f"   Rows Changed: {stats['changed']}")
+        print(f"   Rows Unchanged (version bumped): {stats['unchanged']}")
+        print(f"   Time: {elapsed:.2f}s")
+        if stats['changed'] and not dry_run:
+            print(f"\n💡 Run `python3 tools/mention_timeseries.py --rebuild` to refresh mention history")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Re-tagging failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Competitor Rollup Stats
+Maintains competitor_daily_stats (article counts per day x competitor x source)
+so the dashboard reads a few hundred aggregate rows instead of every article.
+
+Counts are incremented by the scrapers' storage path; --backfill rebuilds the
+table server-side from existing articles.
+
+Usage:
+    python3 tools/rollup_stats.py --backfill
+"""
+
+import os
+import sys
+from collections import Counter
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+# Load environment
+load_dotenv()
+
+# Competitor value used for per-article totals
+ALL_COMPETITORS = "*"
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def build_deltas(articles: list, sign: int = 1) -> list:
+    """Aggregate articles into rollup count deltas.
+
+    Args:
+        articles: Articles with `published_at`, `competitors` and `source`
+        sign: 1 for inserted articles, -1 for deleted ones
+
+    Returns:
+        list: Deltas as {"day", "competitor", "source", "count"} dicts
+    """
+    counts = Counter()
+    for article in articles:
+        day = (article.get('published_at') or '')[:10]
+        if not day:
+            continue
+        source = article.get('source') or ''
+        for competitor in list(article.get('competitors') or []) + [ALL_COMPETITORS]:
+            counts[(day, competitor, source)] += sign
+
+    return [
+        {"day": day, "competitor": competitor, "source": source, "count": count}
+        for (day, competitor, source), count in sorted(counts.items())
+    ]
+
+def increment_stats(supabase: Client, articles: list, sign: int = 1) -> int:
+    """Apply one batch of articles to the rollup in a single RPC call.
+
+    Args:
+        supabase: Supabase client
+        articles: Articles that were inserted (or deleted, with sign=-1)
+        sign: 1 to add, -1 to subtract
+
+    Returns:
+        int: Number of rollup rows touched
+    """
+    deltas = build_deltas(articles, sign)
+    if not deltas:
+        return 0
+
+    try:
+        supabase.rpc('increment_competitor_stats', {"deltas": deltas}).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to update competitor stats: {e}")
+        return 0
+
+    return len(deltas)
+
+def main():
+    """Rebuild the rollup from stored articles."""
+    if '--backfill' not in sys.argv:
+        print(__doc__)
+        return
+
+    print(f"\n🔄 Rebuilding competitor_daily_stats from articles...")
+
+    try:
+        supabase = init_supabase()
+        result = supabase.rpc('rebuild_competitor_stats', {}).execute()
+        print(f"✅ Rollup rebuilt ({result.data} rows)\n")
+    except Exception as e:
+        print(f"\n❌ Backfill failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,101 @@
 #!/usr/bin/env python3
 """
 Master Scraper Orchestrator
-Runs all scrapers sequentially and provides a summary report.
+Runs all scrapers within a total run deadline and provides a summary report.
+
+Scrapers run in order of value per second (priority x expected yield /
+expected cost, estimated from scraper_runs history, see scheduler.py). Each
+one gets a time slice from the remaining deadline; scrapers that no longer
+fit are deferred and move up in the next run. Scrapers killed at the end of
+their slice are logged to scraper_runs as timeouts so the next estimate
+includes them.
+
+Usage:
+    python3 tools/run_all_scrapers.py                 # Deadline from RUN_DEADLINE_SECONDS
+    python3 tools/run_all_scrapers.py --deadline 600  # Explicit deadline in seconds
+    python3 tools/run_all_scrapers.py --profile       # Per-stage profiles of every scraper
 """
 
+import os
 import subprocess
 import sys
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from supabase import create_client
+
+from local_state import open_state
+from scheduler import load_history, load_deferrals, record_outcome, plan, time_slice
+from profiling import StageProfiler, profile_requested, default_profile_dir
+from export_snapshot import export_snapshot
+
+# Load environment
+load_dotenv()
+
+DEFAULT_DEADLINE_SECONDS = 900  # Total budget for one run (cron interval safety margin)
+PAUSE_SECONDS = 2  # Delay between scrapers to avoid rate limiting
+
+# Scrapers to run: script, description, priority, scraper_name (SOURCE_NAME)
+SCRAPERS = [
+    {"script": 'tools/scrape_newsdata.py', "description": 'NewsData.io API Scraper', "priority": 2, "name": 'NewsData.io'},
+    {"script": 'tools/scrape_rss.py', "description": 'RSS Feed Scraper', "priority": 1, "name": 'RSS Feeds'},
+    {"script": 'tools/scrape_reddit.py', "description": 'Reddit Scraper', "priority": 1, "name": 'Reddit'},
+    {"script": 'tools/scrape_twitter.py', "description": 'Twitter/X Scraper', "priority": 1, "name": 'Twitter'},
+    {"script": 'tools/scrape_blogs.py', "description": 'Blog Listing Scraper', "priority": 1, "name": 'Blogs'},
+    {"script": 'tools/scrape_sitemaps.py', "description": 'Sitemap Scraper', "priority": 1, "name": 'Sitemaps'},
+    # Add more scrapers here as they're built
+]
+
+def get_deadline() -> float:
+    """Return the run deadline in seconds (--deadline N or RUN_DEADLINE_SECONDS)."""
+    if '--deadline' in sys.argv:
+        idx = sys.argv.index('--deadline')
+        try:
+            return float(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print("Usage: run_all_scrapers.py [--deadline SECONDS]")
+            sys.exit(2)
+    return float(os.getenv('RUN_DEADLINE_SECONDS', DEFAULT_DEADLINE_SECONDS))
+
+def init_supabase():
+    """Initialize Supabase client for run history (None if not configured)."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    return create_client(url, key) if url and key else None
+
+def log_timeout(supabase, name: str, started_at: datetime, timeout: float):
+    """Log a scraper killed at the end of its time slice to scraper_runs.
+
+    The killed process never logs its own run, so without this row the
+    scheduler would only see the runs that finished in time.
+
+    Args:
+        supabase: Supabase client (None to skip)
+        name: Scraper name (scraper_runs.scraper_name)
+        started_at: When the scraper was started
+        timeout: Time slice in seconds (logged as the run's duration)
+    """
+    if supabase is None:
+        return
+    try:
+        supabase.table('scraper_runs').insert({
+            "scraper_name": name,
+            "started_at": started_at.isoformat(),
+            "completed_at": (started_at + timedelta(seconds=timeout)).isoformat(),
+            "status": "timeout",
+            "error_message": f"Timeout after {timeout:.0f}s"
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log timeout: {e}")
 
-def run_scraper(script_name: str, description: str) -> dict:
+def run_scraper(script_name: str, description: str, timeout: float = 300, args: list = None) -> dict:
     """Run a scraper script and return its result.
 
     Args:
         script_name: Path to the scraper script
         description: Human-readable description
+        timeout: Time slice in seconds
+        args: Extra command-line arguments for the scraper
 
     Returns:
         dict: Result with success status and output
@@ -21,14 +103,15 @@ def run_scraper(script_name: str, description: str) -> dict:
     print(f"\n{'='*70}")
     print(f"Running: {description}")
     print(f"Script: {script_name}")
+    print(f"Time Slice: {timeout:.0f}s")
     print(f"{'='*70}")
 
     try:
         result = subprocess.run(
-            ['python3', script_name],
+            ['python3', script_name] + (args or []),
             capture_output=True,
             text=True,
-            timeout=300  # 5 minute timeout per scraper
+            timeout=timeout
         )
 
         # Print output
@@ -47,6 +130,7 @@ def run_scraper(script_name: str, description: str) -> dict:
         return {
             "name": description,
             "success": success,
+            "timed_out": False,
             "output": result.stdout + result.stderr
         }
 
@@ -55,13 +139,15 @@ def run_scraper(script_name: str, description: str) -> dict:
         return {
             "name": description,
             "success": False,
-            "output": "Timeout after 5 minutes"
+            "timed_out": True,
+            "output": f"Timeout after {timeout:.0f}s"
         }
     except Exception as e:
         print(f"\n❌ Error running {description}: {e}")
         return {
             "name": description,
             "success": False,
+            "timed_out": False,
             "output": str(e)
         }
 
@@ -74,23 +160,73 @@ def main():
     print(f"\nStarted at: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
     print("\nRunning all scrapers to collect competitor intelligence...\n")
 
-    # Define scrapers to run
-    scrapers = [
-        ('tools/scrape_newsdata.py', 'NewsData.io API Scraper'),
-        ('tools/scrape_rss.py', 'RSS Feed Scraper'),
-        # Add more scrapers here as they're built
-    ]
+    deadline = get_deadline()
+    run_started = time.monotonic()
+
+    # --profile: scrapers write their profiles next to the orchestrator's
+    scraper_args = []
+    if profile_requested():
+        os.environ['PROFILE_DIR'] = default_profile_dir()
+        scraper_args.append('--profile')
+    profiler = StageProfiler.from_argv('Orchestrator')
+
+    # Order scrapers by expected value per second
+    try:
+        supabase = init_supabase()
+    except Exception as e:
+        print(f"⚠️  Could not connect to Supabase for run history: {e}")
+        supabase = None
+
+    state = open_state()
+    with profiler.stage("schedule"):
+        history = load_history(supabase, [s['name'] for s in SCRAPERS])
+        scrapers = plan(SCRAPERS, history, load_deferrals(state))
+
+    print(f"Run Deadline: {deadline:.0f}s")
+    print("Schedule:")
+    for s in scrapers:
+        print(f"   {s['description']}: priority {s['priority']}, ~{s['cost']:.0f}s, "
+              f"~{s['yield']:.1f} articles, density {s['density']:.3f}")
 
     results = []
+    deferred = []
 
-    # Run each scraper sequentially
-    for script, description in scrapers:
-        result = run_scraper(script, description)
+    # Run scrapers sequentially within the deadline
+    for i, s in enumerate(scrapers):
+        remaining = deadline - (time.monotonic() - run_started)
+        slice_seconds = time_slice(s, remaining)
+
+        if slice_seconds is None:
+            print(f"\n⏭  Deferring {s['description']}: needs ~{s['cost']:.0f}s, {max(remaining, 0):.0f}s left")
+            deferred.append(s['description'])
+            record_outcome(state, s['name'], deferred=True)
+            continue
+
+        started_at = datetime.now(timezone.utc)
+        result = run_scraper(s['script'], s['description'], timeout=slice_seconds, args=scraper_args)
+        if result['timed_out']:
+            log_timeout(supabase, s['name'], started_at, slice_seconds)
         results.append(result)
+        record_outcome(state, s['name'], deferred=False)
 
         # Small delay between scrapers to avoid rate limiting
-        import time
-        time.sleep(2)
+        if i < len(scrapers) - 1:
+            time.sleep(PAUSE_SECONDS)
+
+    state.close()
+
+    # Publish the dashboard snapshot after a successful run
+    if supabase is not None and any(r['success'] for r in results):
+        print(f"\n📸 Exporting dashboard snapshot...")
+        try:
+            with profiler.stage("snapshot"):
+                snapshot = export_snapshot(supabase)
+            print(f"✅ Snapshot published: {snapshot['articles']} articles, {snapshot['bytes'] / 1024:.1f} KB")
+        except Exception as e:
+            print(f"⚠️  Snapshot export failed (dashboard falls back to live queries): {e}")
+
+    elapsed = time.monotonic() - run_started
+    profiler.report()
 
     # Generate Summary Report
     print("\n\n" + "="*70)
@@ -103,7 +239,9 @@ def main():
     print(f"Completed at: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
     print(f"Scrapers Run: {total}")
     print(f"Successful: {passed}")
-    print(f"Failed: {total - passed}\n")
+    print(f"Failed: {total - passed}")
+    print(f"Deferred: {len(deferred)}")
+    print(f"Deadline Used: {elapsed:.0f}s / {deadline:.0f}s\n")
 
     print("Individual Results:")
     print("-" * 70)
@@ -111,11 +249,19 @@ def main():
     for result in results:
         status = "✅ PASS" if result['success'] else "❌ FAIL"
         print(f"   {status} - {result['name']}")
+    for name in deferred:
+        print(f"   ⏭  DEFERRED - {name}")
 
     print("\n" + "="*70)
 
     # Overall status
-    if passed == total:
+    if total == 0:
+        print("⏭  ALL SCRAPERS DEFERRED")
+        print("="*70)
+        print(f"\n⚠️  Run deadline of {deadline:.0f}s is shorter than any scraper's expected runtime")
+        print("   Increase RUN_DEADLINE_SECONDS or --deadline\n")
+        return 1
+    elif passed == total:
         print("✅ ALL SCRAPERS COMPLETED SUCCESSFULLY!")
         print("="*70)
         print("\n🎉 Data collection complete!")
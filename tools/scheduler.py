@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Deadline-Aware Scraper Scheduler
+Orders sources within one run by value per second and hands each one a time
+slice from the remaining run deadline.
+
+- Expected cost: median latency of recent completed and timed-out runs in
+  scraper_runs (a timed-out run counts with its full time slice, so a source
+  that keeps hitting its slice gets a bigger one)
+- Expected yield: mean articles_added of the completed runs
+- Value density: priority x (yield + 1) / cost, boosted for sources that were
+  deferred in previous runs so nothing starves
+- A source whose expected cost no longer fits in the remaining deadline is
+  deferred to the next run
+"""
+
+import statistics
+
+from dateutil import parser
+
+# Defaults used when a source has no run history yet
+DEFAULT_COST_SECONDS = 60.0
+DEFAULT_YIELD = 1.0
+
+# Time slice = expected cost x SLICE_FACTOR, within [MIN_SLICE_SECONDS, remaining]
+SLICE_FACTOR = 2.0
+MIN_SLICE_SECONDS = 30.0
+
+# Number of recent runs per source used for estimates
+HISTORY_RUNS = 20
+
+def ensure_schema(conn):
+    """Create the deferral counter table if missing."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scheduler_deferrals (
+            name TEXT PRIMARY KEY,
+            deferred_runs INTEGER NOT NULL
+        )
+    """)
+
+def load_history(supabase, names: list) -> dict:
+    """Estimate cost and yield per source from recent scraper_runs.
+
+    Args:
+        supabase: Supabase client (None to use defaults)
+        names: Scraper names (scraper_runs.scraper_name)
+
+    Returns:
+        dict: name -> {"cost": seconds, "yield": articles, "runs": n}
+    """
+    history = {}
+    for name in names:
+        runs = []
+        if supabase is not None:
+            try:
+                result = supabase.table('scraper_runs') \
+                    .select('started_at, completed_at, articles_added, status') \
+                    .eq('scraper_name', name).in_('status', ['completed', 'timeout']) \
+                    .order('started_at', desc=True).limit(HISTORY_RUNS).execute()
+                runs = result.data or []
+            except Exception as e:
+                print(f"   ⚠️  Could not load run history for {name}: {e}")
+
+        durations = [
+            (parser.parse(r['completed_at']) - parser.parse(r['started_at'])).total_seconds()
+            for r in runs if r.get('started_at') and r.get('completed_at')
+        ]
+        durations = [d for d in durations if d > 0]
+        # Killed runs never report what they stored
+        completed = [r for r in runs if r.get('status') == 'completed']
+
+        history[name] = {
+            "cost": statistics.median(durations) if durations else DEFAULT_COST_SECONDS,
+            "yield": statistics.mean(r.get('articles_added') or 0 for r in completed) if completed else DEFAULT_YIELD,
+            "runs": len(runs),
+        }
+    return history
+
+def load_deferrals(conn) -> dict:
+    """Return name -> number of consecutive runs the source was deferred."""
+    ensure_schema(conn)
+    return dict(conn.execute("SELECT name, deferred_runs FROM scheduler_deferrals").fetchall())
+
+def record_outcome(conn, name: str, deferred: bool):
+    """Update a source's deferral counter after a run."""
+    ensure_schema(conn)
+    with conn:
+        if deferred:
+            conn.execute("""
+                INSERT INTO scheduler_deferrals (name, deferred_runs) VALUES (?, 1)
+                ON CONFLICT(name) DO UPDATE SET deferred_runs = deferred_runs + 1
+            """, (name,))
+        else:
+            conn.execute("DELETE FROM scheduler_deferrals WHERE name = ?", (name,))
+
+def plan(sources: list, history: dict, deferrals: dict) -> list:
+    """Order sources by value density (highest first).
+
+    Args:
+        sources: Dicts with at least `name` and `priority`
+        history: From load_history()
+        deferrals: From load_deferrals()
+
+    Returns:
+        list: Sources with `cost`, `yield` and `density` added, in run order
+    """
+    planned = []
+    for source in sources:
+        stats = history.get(source['name'], {"cost": DEFAULT_COST_SECONDS, "yield": DEFAULT_YIELD})
+        boost = 1 + deferrals.get(source['name'], 0)
+        density = source['priority'] * boost * (stats['yield'] + 1) / max(stats['cost'], 1.0)
+        planned.append({**source, "cost": stats['cost'], "yield": stats['yield'], "density": density})
+
+    return sorted(planned, key=lambda s: (-s['density'], -s['priority']))
+
+def time_slice(source: dict, remaining: float):
+    """Return the timeout for a source, or None to defer it.
+
+    Args:
+        source: Planned source (with `cost`)
+        remaining: Seconds left until the run deadline
+
+    Returns:
+        float or None: Seconds allotted to the source
+    """
+    if remaining < source['cost']:
+        return None
+    return min(remaining, max(source['cost'] * SLICE_FACTOR, MIN_SLICE_SECONDS))
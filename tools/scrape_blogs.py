@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Blog Listing Scraper
+Scrapes competitor blogs whose RSS feeds don't parse (Ledger, Tangem,
+Coinbase; see findings.md) from their HTML listing pages and stores them in
+Supabase.
+
+- Each blog is a selector config in LISTING_SITES, compiled once and
+  evaluated with lxml (see html_listing.py)
+- Pagination is followed only until a page contains a URL already seen on a
+  previous run (per-site state in the local state DB); the first run of a
+  site reads FIRST_RUN_PAGES pages
+- Sites are fetched concurrently
+- Items come out in the RSS entry shape, so normalization, scoring, archiving
+  and storage reuse the RSS scraper's functions
+
+Usage:
+    python3 tools/scrape_blogs.py
+    python3 tools/scrape_blogs.py --check "Ledger Blog"   # Print the parsed first page, store nothing
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from supabase import create_client, Client
+import requests
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from storage import store_articles
+from local_state import open_state
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+from html_listing import compile_site, parse_listing
+from scrape_rss import normalize_article, extract_fields
+
+# Load environment
+load_dotenv()
+
+# Constants
+SOURCE_NAME = "Blogs"
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
+USER_AGENT = "Mozilla/5.0 (compatible; CompetitorIntelBot/1.0)"
+
+# Listing settings
+FIRST_RUN_PAGES = 1          # Pages read the first time a site is scraped
+MAX_PAGES = 5                # Safety limit per run (per-site "max_pages" overrides)
+MAX_CONCURRENT_SITES = 4
+
+# Listing pages to scrape (selectors: see html_listing.py; re-check them with
+# --check after a site redesign)
+LISTING_SITES = {
+    "Ledger Blog": {
+        "url": "https://www.ledger.com/blog",
+        "item": "article, .post-card",
+        "title": "h2, h3",
+        "link": "a @href",
+        "published": "time @datetime",
+        "summary": "p",
+        "image": "img @src",
+        "next": "a[rel=next], .pagination a.next @href",
+    },
+    "Tangem Blog": {
+        "url": "https://tangem.com/en/blog/",
+        "item": ".blog-card, article",
+        "title": ".blog-card__title, h2, h3",
+        "link": "a @href",
+        "published": "time @datetime",
+        "summary": ".blog-card__description, p",
+        "image": "img @src",
+        "next": "a[rel=next] @href",
+    },
+    "Coinbase Blog": {
+        "url": "https://www.coinbase.com/blog",
+        "item": "//a[contains(@href, '/blog/') and (.//h2 or .//h3)]",
+        "title": "h2, h3",
+        "link": "./@href",
+        "published": "time @datetime",
+        "summary": "p",
+        "image": "img @src",
+    },
+}
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def create_session() -> requests.Session:
+    """Create an HTTP session shared by all listing fetches."""
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENT_SITES)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def ensure_schema(conn):
+    """Create the table of listing URLs seen per site."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS listing_seen (
+            site TEXT NOT NULL,
+            url TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            PRIMARY KEY (site, url)
+        )
+    """)
+
+def load_seen(conn, sites: list) -> dict:
+    """Return site name -> set of URLs seen on previous runs."""
+    ensure_schema(conn)
+    seen = {name: set() for name in sites}
+    for row in conn.execute("SELECT site, url FROM listing_seen"):
+        if row['site'] in seen:
+            seen[row['site']].add(row['url'])
+    return seen
+
+def save_seen(conn, results: list):
+    """Record the URLs found in this run (call after storage succeeded)."""
+    ensure_schema(conn)
+    now = datetime.now(timezone.utc).isoformat()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO listing_seen (site, url, first_seen) VALUES (?, ?, ?)",
+            [(r['site'], a['link'], now) for r in results for a in r['articles']]
+        )
+
+def fetch_site(session: requests.Session, site: dict, seen: set) -> dict:
+    """Fetch a site's listing pages until reaching already seen URLs.
+
+    Args:
+        session: HTTP session
+        site: Compiled site from compile_site()
+        seen: URLs seen on previous runs
+
+    Returns:
+        dict: Result (site, articles, pages, error)
+    """
+    max_pages = site['max_pages'] or MAX_PAGES
+    if not seen:
+        max_pages = min(max_pages, FIRST_RUN_PAGES)
+
+    result = {"site": site['name'], "articles": [], "pages": 0, "error": None}
+    found = set()
+    page_url = site['url']
+
+    try:
+        while page_url and result['pages'] < max_pages:
+            response = session.get(page_url, timeout=30)
+            response.raise_for_status()
+            articles, next_url = parse_listing(site, response.url, response.content)
+            result['pages'] += 1
+
+            fresh = [a for a in articles if a['link'] not in seen and a['link'] not in found]
+            found.update(a['link'] for a in fresh)
+            result['articles'].extend(fresh)
+
+            # Caught up with the previous run
+            if not articles or any(a['link'] in seen for a in articles):
+                break
+            page_url = next_url
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+def fetch_articles(session: requests.Session, sites: list, seen: dict) -> tuple:
+    """Fetch new listing items from all sites concurrently.
+
+    Args:
+        session: HTTP session
+        sites: Compiled sites
+        seen: Site name -> URLs seen on previous runs
+
+    Returns:
+        tuple: (raw articles, per-site results)
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SITES) as pool:
+        results = list(pool.map(lambda site: fetch_site(session, site, seen[site['name']]), sites))
+
+    for result in results:
+        if result['error']:
+            print(f"   ❌ Error fetching {result['site']}: {result['error']}")
+        else:
+            print(f"   ✅ Found {len(result['articles'])} new articles from {result['site']} "
+                  f"({result['pages']} page{'s' if result['pages'] != 1 else ''})")
+
+    return [a for r in results for a in r['articles']], results
+
+def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
+    """Log scraper execution to scraper_runs table.
+
+    Args:
+        supabase: Supabase client
+        stats: Run statistics
+        success: Whether scraper completed successfully
+        error: Error message if failed
+    """
+    try:
+        supabase.table('scraper_runs').insert({
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
+            "articles_added": stats.get('inserted', 0),
+            "status": "completed" if success else "failed",
+            "error_message": error
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log scraper run: {e}")
+
+def check_site(name: str):
+    """Print what the selectors extract from a site's first listing page."""
+    if name not in LISTING_SITES:
+        print(f"❌ Unknown site: {name} (known: {', '.join(LISTING_SITES)})")
+        sys.exit(2)
+
+    site = compile_site(name, LISTING_SITES[name])
+    response = create_session().get(site['url'], timeout=30)
+    response.raise_for_status()
+    articles, next_url = parse_listing(site, response.url, response.content)
+
+    print(f"\n🔎 {name}: {len(articles)} items, next page: {next_url or '-'}\n")
+    for article in articles:
+        print(f"   {article.get('published', '?')[:10]:<10}  {article['title'][:70]}")
+        print(f"   {'':10}  {article['link']}")
+    print()
+
+def main():
+    """Main scraper execution."""
+
+    if '--check' in sys.argv:
+        idx = sys.argv.index('--check')
+        if len(sys.argv) <= idx + 1:
+            print("Usage: scrape_blogs.py [--check SITE]")
+            sys.exit(2)
+        check_site(sys.argv[idx + 1])
+        return
+
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Scraper Started")
+    print(f"   Sources: {len(LISTING_SITES)} blog listing pages (new articles since last run)")
+    print(f"{'='*60}\n")
+
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+    state = open_state()
+
+    try:
+        # Initialize
+        print(f"🔌 Connecting to Supabase...")
+        with profiler.stage("connect"):
+            supabase = init_supabase()
+            session = create_session()
+            sites = [compile_site(name, config) for name, config in LISTING_SITES.items()]
+        print(f"✅ Connected to Supabase\n")
+
+        # Fetch new listing items
+        print(f"📡 Fetching listing pages...\n")
+        with profiler.stage("fetch"):
+            raw_articles, results = fetch_articles(session, sites, load_seen(state, list(LISTING_SITES)))
+        print(f"\n✅ Found {len(raw_articles)} total new articles\n")
+
+        if not raw_articles:
+            print(f"ℹ️  No new articles on the listing pages")
+            log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
+            return
+
+        # Normalize articles
+        print(f"🔄 Normalizing articles...")
+        with profiler.stage("normalize"):
+            normalized = [normalize_article(a) for a in raw_articles]
+        print(f"✅ Normalized {len(normalized)} articles\n")
+
+        # Score competitor relevance and drop low-scoring matches
+        print(f"🎯 Scoring competitor relevance...")
+        with profiler.stage("score"):
+            fields = [extract_fields(a) for a in raw_articles]
+            scores = score_articles(fields, COMPETITORS)
+            relevant = apply_scores(normalized, scores, COMPETITORS)
+            relevant = apply_watchlists(normalized, fields, relevant)
+        print(f"✅ Found {len(relevant)} articles above relevance threshold ({get_min_score()})\n")
+
+        # Keep every fetched article in the Parquet archive (if ARCHIVE_DIR is set)
+        with profiler.stage("archive"):
+            archive_articles(SOURCE_NAME, raw_articles, normalized, scores, RUN_STARTED_AT)
+
+        # Store articles, then remember the listing URLs
+        stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+        if relevant:
+            # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+            with profiler.stage("images"):
+                attach_thumbnails(supabase, relevant)
+
+            print(f"💾 Storing articles in database...\n")
+            with profiler.stage("store"):
+                stats = store_articles(supabase, relevant)
+        save_seen(state, results)
+
+        # Log results
+        print(f"\n📝 Logging scraper run...")
+        with profiler.stage("log"):
+            errors = [r for r in results if r['error']]
+            log_scraper_run(supabase, stats, success=True,
+                            error="; ".join(f"{r['site']}: {r['error']}" for r in errors) or None)
+
+        # Summary
+        print(f"\n{'='*60}")
+        print(f"✅ {SOURCE_NAME} Scraper Complete")
+        print(f"{'='*60}")
+        print(f"   Articles Fetched: {len(raw_articles)}")
+        print(f"   Listing Pages: {sum(r['pages'] for r in results)}")
+        print(f"   Competitor Mentions: {len(relevant)}")
+        print(f"   New Articles Stored: {stats['inserted']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
+        print(f"   Errors: {stats['errors'] + len(errors)}")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Scraper failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+
+        # Log failure
+        try:
+            supabase = init_supabase()
+            log_scraper_run(supabase, {}, success=False, error=str(e))
+        except:
+            pass
+
+        sys.exit(1)
+
+    finally:
+        state.close()
+        profiler.report()
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,24 @@ Fetches competitor news from NewsData.io API and stores in Supabase.
 
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from supabase import create_client, Client
 import requests
+from functools import partial
 from dateutil import parser
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from competitor_rules import matched_competitors
+from storage import store_articles
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+from backfill import parse_backfill_args, run_backfill, print_backfill_summary
+from cpu_pool import get_pool, prepare_articles
 
 # Load environment
 load_dotenv()
@@ -18,11 +31,26 @@ load_dotenv()
 # Constants
 SOURCE_NAME = "NewsData.io"
 LOOKBACK_HOURS = 24  # Fetch articles from last 24 hours
-COMPETITORS = [
-    "ledger", "trezor", "tangem", "coinbase",
-    "metamask", "revolut", "raby", "phantom"
-]
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
 API_URL = "https://newsdata.io/api/1/news"
+ARCHIVE_URL = "https://newsdata.io/api/1/archive"
+
+# Query planner settings
+DEFAULT_CREDIT_BUDGET = 10    # API credits per run (override with NEWSDATA_CREDIT_BUDGET)
+MAX_CONCURRENT_QUERIES = 4
+GENERIC_QUERY = 'cryptocurrency wallet OR crypto wallet OR hardware wallet'
+
+# Per-competitor search queries (aliases and disambiguating terms)
+COMPETITOR_QUERIES = {
+    "ledger": '"ledger nano" OR "ledger live" OR "ledger wallet" OR "ledger stax"',
+    "trezor": 'trezor',
+    "tangem": 'tangem',
+    "coinbase": 'coinbase',
+    "metamask": 'metamask',
+    "revolut": 'revolut AND crypto',
+    "raby": 'rabby OR raby',
+    "phantom": '"phantom wallet" OR "phantom solana"',
+}
 
 def init_supabase() -> Client:
     """Initialize Supabase client."""
@@ -34,51 +62,237 @@ def init_supabase() -> Client:
 
     return create_client(url, key)
 
-def fetch_articles():
-    """Fetch articles from NewsData.io API.
+class CreditBudget:
+    """Thread-safe API credit budget shared by concurrent queries."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.spent = 0
+        self.exhausted = False
+        self.per_query = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, query_name: str) -> bool:
+        """Reserve one credit for a query. Returns False if none are left."""
+        with self._lock:
+            if self.exhausted or self.spent >= self.limit:
+                return False
+            self.spent += 1
+            self.per_query[query_name] = self.per_query.get(query_name, 0) + 1
+            return True
+
+    def stop(self):
+        """Stop spending credits (e.g. after a 429)."""
+        with self._lock:
+            self.exhausted = True
+
+def get_credit_budget() -> int:
+    """Return the per-run API credit budget from the environment."""
+    try:
+        return int(os.getenv('NEWSDATA_CREDIT_BUDGET', DEFAULT_CREDIT_BUDGET))
+    except ValueError:
+        return DEFAULT_CREDIT_BUDGET
+
+def build_query_plan() -> list:
+    """Build the list of queries to run, highest priority first.
 
     Returns:
-        list: List of raw articles from the source
+        list: (name, q) tuples, one per competitor plus the generic wallet query
     """
-    api_key = os.getenv('NEWSDATA_API_KEY')
+    plan = [(competitor, COMPETITOR_QUERIES.get(competitor, competitor)) for competitor in COMPETITORS]
+    plan.append(("generic", GENERIC_QUERY))
+    return plan
 
-    if not api_key:
-        raise ValueError("Missing NEWSDATA_API_KEY in .env file")
+def fetch_page(api_key: str, query: str, page: str = None, url: str = API_URL, extra_params: dict = None) -> dict:
+    """Fetch one page of results (costs one API credit).
 
-    # Calculate time window
-    from_time = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+    Args:
+        api_key: NewsData.io API key
+        query: Search query
+        page: nextPage token from a previous response
+        url: Endpoint (latest news or archive)
+        extra_params: Additional query parameters (e.g. archive dates)
 
+    Returns:
+        dict: Parsed API response
+    """
     params = {
         'apikey': api_key,
-        'q': 'cryptocurrency wallet OR crypto wallet OR hardware wallet',
+        'q': query,
         'language': 'en',
         'category': 'technology,business'
     }
+    if page:
+        params['page'] = page
+    if extra_params:
+        params.update(extra_params)
 
-    try:
-        response = requests.get(API_URL, params=params, timeout=30)
-        response.raise_for_status()
+    response = requests.get(url, params=params, timeout=30)
+    response.raise_for_status()
+
+    data = response.json()
+    if data.get('status') != 'success':
+        raise Exception(f"API error: {data.get('message', 'Unknown error')}")
 
-        data = response.json()
+    return data
 
-        if data.get('status') == 'success':
-            articles = data.get('results', [])
+def run_query(api_key: str, name: str, query: str, page: str, from_time: datetime, budget: CreditBudget) -> dict:
+    """Run one page of a planned query within the credit budget.
 
-            # Filter for recent articles (API doesn't support 'from' param on free tier)
-            recent = []
-            for article in articles:
-                published = parse_timestamp(article.get('pubDate'))
-                published_dt = parser.parse(published)
+    Returns:
+        dict: name, recent articles, and the nextPage token if more recent
+            results are likely (None otherwise)
+    """
+    result = {"name": name, "query": query, "articles": [], "next_page": None}
 
-                if published_dt >= from_time:
-                    recent.append(article)
+    if not budget.acquire(name):
+        return result
 
-            return recent
+    try:
+        data = fetch_page(api_key, query, page)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 429:
+            print(f"   ⚠️  Rate limited on '{name}' - stopping further requests")
+            budget.stop()
+            return result
+        print(f"   ❌ Query '{name}' failed: {e}")
+        return result
+    except Exception as e:
+        print(f"   ❌ Query '{name}' failed: {e}")
+        return result
+
+    # Filter for recent articles (API doesn't support 'from' param on free tier)
+    all_recent = True
+    for article in data.get('results', []):
+        published_dt = parser.parse(parse_timestamp(article.get('pubDate')))
+        if published_dt >= from_time:
+            article['_query'] = name
+            result['articles'].append(article)
         else:
-            raise Exception(f"API error: {data.get('message', 'Unknown error')}")
+            all_recent = False
+
+    # Results are newest first: only page further while the whole page was recent
+    if all_recent and data.get('nextPage'):
+        result['next_page'] = data['nextPage']
+
+    return result
+
+def fetch_articles(budget: CreditBudget = None):
+    """Fetch articles from NewsData.io with concurrent per-competitor queries.
+
+    Phase 1 runs the first page of every planned query; phase 2 follows
+    nextPage tokens while credits remain. Results are deduplicated by URL.
+
+    Args:
+        budget: Credit budget shared by all queries (created if not given)
+
+    Returns:
+        list: List of raw articles from the source
+    """
+    api_key = os.getenv('NEWSDATA_API_KEY')
 
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Network error: {e}")
+    if not api_key:
+        raise ValueError("Missing NEWSDATA_API_KEY in .env file")
+
+    budget = budget or CreditBudget(get_credit_budget())
+
+    # Calculate time window
+    from_time = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+
+    seen_urls = set()
+    articles = []
+    pending = [(name, query, None) for name, query in build_query_plan()]
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUERIES) as pool:
+        while pending and not budget.exhausted and budget.spent < budget.limit:
+            futures = [pool.submit(run_query, api_key, name, query, page, from_time, budget)
+                       for name, query, page in pending]
+            pending = []
+
+            for future in futures:
+                result = future.result()
+                for article in result['articles']:
+                    url = article.get('link')
+                    if not url or url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    articles.append(article)
+                if result['next_page']:
+                    pending.append((result['name'], result['query'], result['next_page']))
+
+    return articles
+
+def fetch_articles_between(start_iso: str, end_iso: str) -> list:
+    """Fetch archived articles published in [start, end).
+
+    Runs in backfill worker processes; each chunk gets its own credit budget.
+
+    Args:
+        start_iso: Chunk start (ISO timestamp)
+        end_iso: Chunk end (ISO timestamp)
+
+    Returns:
+        list: Raw articles inside the range, deduplicated by URL
+    """
+    api_key = os.getenv('NEWSDATA_API_KEY')
+
+    if not api_key:
+        raise ValueError("Missing NEWSDATA_API_KEY in .env file")
+
+    start, end = parser.parse(start_iso), parser.parse(end_iso)
+    dates = {'from_date': start.strftime('%Y-%m-%d'), 'to_date': end.strftime('%Y-%m-%d')}
+    budget = CreditBudget(get_credit_budget())
+
+    seen_urls = set()
+    articles = []
+    for name, query in build_query_plan():
+        page = None
+        while budget.acquire(name):
+            data = fetch_page(api_key, query, page, url=ARCHIVE_URL, extra_params=dates)
+
+            for article in data.get('results', []):
+                url = article.get('link')
+                published_dt = parser.parse(parse_timestamp(article.get('pubDate')))
+                if url and url not in seen_urls and start <= published_dt < end:
+                    seen_urls.add(url)
+                    article['_query'] = name
+                    articles.append(article)
+
+            page = data.get('nextPage')
+            if not page:
+                break
+
+    return articles
+
+def print_query_report(budget: CreditBudget, raw_articles: list, normalized: list):
+    """Print credits spent per query against relevant articles gained.
+
+    Args:
+        budget: Budget used for the fetch
+        raw_articles: Deduplicated raw articles (tagged with `_query`)
+        normalized: Normalized articles after relevance scoring (same order)
+    """
+    gained = {}
+    relevant = {}
+    for raw, article in zip(raw_articles, normalized):
+        name = raw.get('_query')
+        gained[name] = gained.get(name, 0) + 1
+        if article.get('competitors'):
+            relevant[name] = relevant.get(name, 0) + 1
+
+    print(f"📊 Query yield ({budget.spent}/{budget.limit} credits):")
+    print(f"   {'Query':<12} {'Credits':>7} {'Unique':>7} {'Relevant':>9} {'Rel/Credit':>11}")
+    for name, _ in build_query_plan():
+        credits = budget.per_query.get(name, 0)
+        if not credits:
+            print(f"   {name:<12} {'-':>7} {'-':>7} {'-':>9} {'skipped':>11}")
+            continue
+        rel = relevant.get(name, 0)
+        print(f"   {name:<12} {credits:>7} {gained.get(name, 0):>7} {rel:>9} {rel / credits:>11.2f}")
+
+    total_relevant = sum(relevant.values())
+    per_credit = total_relevant / budget.spent if budget.spent else 0
+    print(f"   Total: {total_relevant} relevant articles for {budget.spent} credits ({per_credit:.2f}/credit)\n")
 
 def parse_timestamp(timestamp_str):
     """Parse various timestamp formats to UTC ISO string."""
@@ -96,29 +310,31 @@ def parse_timestamp(timestamp_str):
     except:
         return datetime.now(timezone.utc).isoformat()
 
-def detect_competitors(article_data) -> list:
-    """Detect which competitors are mentioned in the article.
+def extract_fields(article_data) -> tuple:
+    """Extract the text fields used for competitor matching.
 
     Args:
         article_data: Raw article data
 
     Returns:
-        list: List of competitor names found (capitalized)
+        tuple: (title, summary, body) strings
     """
-    # Combine all text fields
-    title = article_data.get('title', '').lower()
-    description = article_data.get('description', '').lower() if article_data.get('description') else ''
-    content = article_data.get('content', '').lower() if article_data.get('content') else ''
+    title = article_data.get('title') or ''
+    description = article_data.get('description') or ''
+    content = article_data.get('content') or ''
+
+    return (title, description, content)
 
-    text = f"{title} {description} {content}"
+def detect_competitors(article_data) -> list:
+    """Detect which competitors are mentioned in the article.
 
-    found = []
-    for competitor in COMPETITORS:
-        if competitor in text:
-            # Capitalize first letter
-            found.append(competitor.capitalize())
+    Args:
+        article_data: Raw article data
 
-    return found
+    Returns:
+        list: List of competitor names found (capitalized)
+    """
+    return matched_competitors(extract_fields(article_data))
 
 def normalize_article(raw_article) -> dict:
     """Transform NewsData.io format to our standard schema.
@@ -140,53 +356,6 @@ def normalize_article(raw_article) -> dict:
         "image_url": raw_article.get("image_url")
     }
 
-def article_exists(supabase: Client, url: str) -> bool:
-    """Check if article already exists in database.
-
-    Args:
-        supabase: Supabase client
-        url: Article URL to check
-
-    Returns:
-        bool: True if article exists
-    """
-    try:
-        result = supabase.table('articles').select('id').eq('url', url).execute()
-        return len(result.data) > 0
-    except:
-        return False
-
-def store_articles(supabase: Client, articles: list) -> dict:
-    """Store articles in Supabase, skipping duplicates.
-
-    Args:
-        supabase: Supabase client
-        articles: List of normalized articles
-
-    Returns:
-        dict: Statistics (inserted, skipped, errors)
-    """
-    stats = {"inserted": 0, "skipped": 0, "errors": 0}
-
-    for article in articles:
-        try:
-            # Skip if already exists
-            if article_exists(supabase, article['url']):
-                stats['skipped'] += 1
-                print(f"   ⏭  Skipped duplicate: {article['title'][:50]}...")
-                continue
-
-            # Insert new article
-            supabase.table('articles').insert(article).execute()
-            stats['inserted'] += 1
-            print(f"   ✅ Stored: {article['title'][:50]}... (Competitors: {', '.join(article['competitors'])})")
-
-        except Exception as e:
-            print(f"   ❌ Error storing article: {e}")
-            stats['errors'] += 1
-
-    return stats
-
 def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
     """Log scraper execution to scraper_runs table.
 
@@ -198,9 +367,10 @@ def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = N
     """
     try:
         supabase.table('scraper_runs').insert({
-            "started_at": datetime.now(timezone.utc).isoformat(),
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
             "completed_at": datetime.now(timezone.utc).isoformat(),
-            "articles_found": stats.get('inserted', 0) + stats.get('skipped', 0),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
             "articles_added": stats.get('inserted', 0),
             "status": "completed" if success else "failed",
             "error_message": error
@@ -208,47 +378,116 @@ def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = N
     except Exception as e:
         print(f"   ⚠️  Failed to log scraper run: {e}")
 
+def process_articles(supabase: Client, raw_articles: list) -> dict:
+    """Normalize, score and store one batch of raw articles (backfill path).
+
+    Args:
+        supabase: Supabase client
+        raw_articles: Raw articles from the source
+
+    Returns:
+        dict: Storage statistics (inserted, skipped, errors)
+    """
+    prepared = prepare_articles(__name__, raw_articles, get_pool())
+    normalized, fields = prepared.normalized, prepared.fields
+    scores = score_articles(fields, COMPETITORS, mentions=prepared.mentions)
+    relevant = apply_scores(normalized, scores, COMPETITORS)
+    relevant = apply_watchlists(normalized, fields, relevant, tags=prepared.tags)
+    archive_articles(SOURCE_NAME, raw_articles, normalized, scores)
+    attach_thumbnails(supabase, relevant)
+    texts = {a['url']: f[2] for a, f in zip(normalized, fields)}
+    return store_articles(supabase, relevant, verbose=False, texts=texts)
+
+def backfill(start: datetime, end: datetime):
+    """Run the resumable historical backfill for [start, end)."""
+
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Backfill Started")
+    print(f"   Range: {start.isoformat()} → {end.isoformat()}")
+    print(f"{'='*60}\n")
+
+    supabase = init_supabase()
+    totals = run_backfill(SOURCE_NAME, fetch_articles_between, partial(process_articles, supabase), start, end)
+    print_backfill_summary(SOURCE_NAME, totals)
+
+    log_scraper_run(supabase, {"inserted": totals['inserted']}, success=totals['errors'] == 0,
+                    error=f"{totals['errors']} chunk errors" if totals['errors'] else None)
+
 def main():
     """Main scraper execution."""
 
+    # Historical mode: --backfill FROM TO
+    try:
+        backfill_range = parse_backfill_args(sys.argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if backfill_range:
+        backfill(*backfill_range)
+        return
+
     print(f"\n{'='*60}")
     print(f"🚀 {SOURCE_NAME} Scraper Started")
     print(f"   Time Window: Last {LOOKBACK_HOURS} hours")
     print(f"{'='*60}\n")
 
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+
     try:
         # Initialize
         print(f"🔌 Connecting to Supabase...")
-        supabase = init_supabase()
+        with profiler.stage("connect"):
+            supabase = init_supabase()
         print(f"✅ Connected to Supabase\n")
 
         # Fetch articles
         print(f"📡 Fetching articles from {SOURCE_NAME}...")
-        raw_articles = fetch_articles()
-        print(f"✅ Found {len(raw_articles)} recent articles\n")
+        budget = CreditBudget(get_credit_budget())
+        with profiler.stage("fetch"):
+            raw_articles = fetch_articles(budget)
+        print(f"✅ Found {len(raw_articles)} unique recent articles ({budget.spent} credits)\n")
 
-        # Normalize articles
+        # Normalize and match articles (in a process pool with CPU_WORKERS)
         print(f"🔄 Normalizing articles...")
-        normalized = [normalize_article(a) for a in raw_articles]
+        with profiler.stage("normalize"):
+            prepared = prepare_articles(__name__, raw_articles, get_pool())
+            normalized, fields = prepared.normalized, prepared.fields
         print(f"✅ Normalized {len(normalized)} articles\n")
 
-        # Filter for competitor mentions
-        print(f"🎯 Filtering for competitor mentions...")
-        relevant = [a for a in normalized if a['competitors']]
-        print(f"✅ Found {len(relevant)} articles mentioning competitors\n")
+        # Score competitor relevance and drop low-scoring matches
+        print(f"🎯 Scoring competitor relevance...")
+        with profiler.stage("score"):
+            scores = score_articles(fields, COMPETITORS, mentions=prepared.mentions)
+            relevant = apply_scores(normalized, scores, COMPETITORS)
+            relevant = apply_watchlists(normalized, fields, relevant, tags=prepared.tags)
+        print(f"✅ Found {len(relevant)} articles above relevance threshold ({get_min_score()})\n")
+
+        # Keep every fetched article in the Parquet archive (if ARCHIVE_DIR is set)
+        with profiler.stage("archive"):
+            archive_articles(SOURCE_NAME, raw_articles, normalized, scores, RUN_STARTED_AT)
+
+        print_query_report(budget, raw_articles, normalized)
 
         if not relevant:
             print(f"ℹ️  No competitor mentions found in this batch")
             log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
             return
 
+        # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+        with profiler.stage("images"):
+            attach_thumbnails(supabase, relevant)
+
         # Store articles
         print(f"💾 Storing articles in database...\n")
-        stats = store_articles(supabase, relevant)
+        with profiler.stage("store"):
+            texts = {a['url']: f[2] for a, f in zip(normalized, fields)}
+            stats = store_articles(supabase, relevant, texts=texts)
 
         # Log results
         print(f"\n📝 Logging scraper run...")
-        log_scraper_run(supabase, stats, success=True)
+        with profiler.stage("log"):
+            log_scraper_run(supabase, stats, success=True)
 
         # Summary
         print(f"\n{'='*60}")
@@ -257,7 +496,8 @@ def main():
         print(f"   Articles Fetched: {len(raw_articles)}")
         print(f"   Competitor Mentions: {len(relevant)}")
         print(f"   New Articles Stored: {stats['inserted']}")
-        print(f"   Duplicates Skipped: {stats['skipped']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
         print(f"   Errors: {stats['errors']}")
         print(f"\n")
 
@@ -274,5 +514,8 @@ def main():
 
         sys.exit(1)
 
+    finally:
+        profiler.report()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Reddit Scraper
+Fetches competitor mentions from subreddits and Reddit search and stores them
+in Supabase.
+
+- Each listing (a subreddit's /new or a search query sorted by new) keeps a
+  fullname cursor in the local state DB; runs ask only for posts newer than
+  it (`before`), in 100-item pages
+- An empty `before` answer is checked against /api/info: only a deleted or
+  removed cursor post makes the run fall back to the newest page by time
+- The first run of a listing takes its newest page within LOOKBACK_HOURS
+- Listings are fetched concurrently behind one shared rate limiter
+- Scoring, archiving and storage reuse the shared pipeline
+
+Uses Reddit's OAuth API directly (app-only client credentials) rather than
+praw, so cursors and paging stay explicit. REDDIT_AUTH_URL and REDDIT_API_URL
+can point at a local fake (see test_reddit_scraper.py).
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from supabase import create_client, Client
+import requests
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from competitor_rules import matched_competitors
+from storage import store_articles
+from local_state import open_state
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+
+# Load environment
+load_dotenv()
+
+# Constants
+SOURCE_NAME = "Reddit"
+LOOKBACK_HOURS = 24  # First run of a listing: posts from last 24 hours
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
+AUTH_URL = "https://www.reddit.com/api/v1/access_token"
+API_URL = "https://oauth.reddit.com"
+
+# Listing settings
+PAGE_SIZE = 100                 # Reddit's maximum listing page size
+MAX_PAGES_PER_LISTING = 10      # Reddit listings stop at ~1000 items anyway
+MAX_CONCURRENT_LISTINGS = 4
+REQUESTS_PER_MINUTE = 100       # OAuth client limit (override with REDDIT_REQUESTS_PER_MINUTE)
+
+# Default listings (override with comma-separated REDDIT_SUBREDDITS / REDDIT_QUERIES)
+DEFAULT_SUBREDDITS = ["CryptoCurrency", "ledgerwallet", "TREZOR", "Metamask", "phantom", "CoinBase"]
+DEFAULT_QUERIES = ["ledger wallet", "trezor", "tangem", "metamask", "rabby wallet", "phantom wallet"]
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def env_list(name: str, default: list) -> list:
+    """Read a comma-separated list from the environment."""
+    value = os.getenv(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def get_listings() -> list:
+    """Return the configured listings as (key, path, params) tuples."""
+    listings = [(f"r/{sub}", f"/r/{sub}/new", {}) for sub in env_list('REDDIT_SUBREDDITS', DEFAULT_SUBREDDITS)]
+    listings += [
+        (f"search:{query}", "/search", {"q": query, "sort": "new", "type": "link"})
+        for query in env_list('REDDIT_QUERIES', DEFAULT_QUERIES)
+    ]
+    return listings
+
+class RateLimiter:
+    """Spaces requests from all threads evenly and honors Reddit's rate headers."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next request slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+    def update(self, headers):
+        """Pause all threads until the window resets when no requests remain."""
+        try:
+            remaining = float(headers.get('X-Ratelimit-Remaining', 1))
+            reset = float(headers.get('X-Ratelimit-Reset', 0))
+        except ValueError:
+            return
+        if remaining < 1:
+            with self._lock:
+                self._next = max(self._next, time.monotonic() + reset)
+
+def create_session() -> requests.Session:
+    """Get an app-only OAuth token and return an authorized session."""
+    client_id = os.getenv('REDDIT_CLIENT_ID')
+    client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+    user_agent = os.getenv('REDDIT_USER_AGENT', 'CryptoCompetitorDashboard/1.0')
+
+    if not client_id or not client_secret:
+        raise ValueError("Missing REDDIT_CLIENT_ID or REDDIT_CLIENT_SECRET in .env file")
+
+    response = requests.post(
+        os.getenv('REDDIT_AUTH_URL', AUTH_URL),
+        auth=(client_id, client_secret),
+        data={'grant_type': 'client_credentials'},
+        headers={'User-Agent': user_agent},
+        timeout=30
+    )
+    response.raise_for_status()
+
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f"bearer {response.json()['access_token']}",
+        'User-Agent': user_agent,
+    })
+    return session
+
+def fetch_page(session: requests.Session, limiter: RateLimiter, path: str, params: dict, before: str = None) -> dict:
+    """Fetch one listing page.
+
+    Args:
+        session: Authorized session
+        limiter: Shared rate limiter
+        path: Listing path (e.g. /r/CryptoCurrency/new)
+        params: Extra query parameters
+        before: Only return posts newer than this fullname
+
+    Returns:
+        dict: Listing `data` (children, before, after)
+    """
+    query = {**params, 'limit': PAGE_SIZE, 'raw_json': 1}
+    if before:
+        query['before'] = before
+
+    limiter.wait()
+    response = session.get(os.getenv('REDDIT_API_URL', API_URL) + path, params=query, timeout=30)
+    limiter.update(response.headers)
+    response.raise_for_status()
+
+    return response.json()['data']
+
+def anchor_gone(session: requests.Session, limiter: RateLimiter, fullname: str) -> bool:
+    """Check whether a cursor post was deleted or removed.
+
+    Args:
+        session: Authorized session
+        limiter: Shared rate limiter
+        fullname: Cursor post fullname (t3_...)
+
+    Returns:
+        bool: True if the post no longer anchors its listing
+    """
+    limiter.wait()
+    response = session.get(os.getenv('REDDIT_API_URL', API_URL) + '/api/info',
+                           params={'id': fullname, 'raw_json': 1}, timeout=30)
+    limiter.update(response.headers)
+    response.raise_for_status()
+
+    children = response.json()['data']['children']
+    if not children:
+        return True
+    post = children[0]['data']
+    return bool(post.get('removed_by_category')) or post.get('author') == '[deleted]'
+
+def newest_cursor(posts: list, cursor: dict = None) -> dict:
+    """Return the cursor for the newest post (or the old cursor if none)."""
+    if not posts:
+        return cursor
+    newest = max(posts, key=lambda p: p['created_utc'])
+    return {"fullname": newest['name'], "created_utc": newest['created_utc']}
+
+def fetch_listing(session, limiter, listing: tuple, cursor: dict, cutoff: datetime) -> dict:
+    """Fetch the posts of one listing that are newer than its cursor.
+
+    Args:
+        session: Authorized session
+        limiter: Shared rate limiter
+        listing: (key, path, params) from get_listings()
+        cursor: Stored cursor ({fullname, created_utc}) or None
+        cutoff: Oldest post time for a listing without a cursor
+
+    Returns:
+        dict: key, posts, new cursor, requests made, error (if any)
+    """
+    key, path, params = listing
+    result = {"key": key, "posts": [], "cursor": cursor, "requests": 0, "error": None}
+
+    try:
+        if not cursor:
+            page = fetch_page(session, limiter, path, params)
+            result['requests'] += 1
+            result['posts'] = [
+                c['data'] for c in page['children']
+                if c['data']['created_utc'] >= cutoff.timestamp()
+            ]
+        else:
+            before = cursor['fullname']
+            for _ in range(MAX_PAGES_PER_LISTING):
+                page = fetch_page(session, limiter, path, params, before=before)
+                result['requests'] += 1
+                children = [c['data'] for c in page['children']]
+                result['posts'].extend(children)
+                if len(children) < PAGE_SIZE or not page.get('before'):
+                    break
+                before = page['before']
+
+            # `before` also returns nothing when the anchor post was deleted
+            # or removed; only then fall back to the newest page filtered by
+            # time (a quiet listing just has no new posts)
+            if not result['posts']:
+                result['requests'] += 1
+                if not anchor_gone(session, limiter, cursor['fullname']):
+                    return result
+
+                page = fetch_page(session, limiter, path, params)
+                result['requests'] += 1
+                result['posts'] = [
+                    c['data'] for c in page['children']
+                    if c['data']['created_utc'] > cursor['created_utc']
+                ]
+
+        result['cursor'] = newest_cursor(result['posts'], cursor)
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+def fetch_articles(session, cursors: dict, listings: list = None, limiter: RateLimiter = None) -> tuple:
+    """Fetch new posts of all listings concurrently.
+
+    Args:
+        session: Authorized session
+        cursors: Stored cursors by listing key
+        listings: Listings to fetch, defaults to get_listings()
+        limiter: Shared rate limiter, defaults to REDDIT_REQUESTS_PER_MINUTE
+
+    Returns:
+        tuple: (unique posts, results per listing)
+    """
+    listings = listings if listings is not None else get_listings()
+    limiter = limiter or RateLimiter(float(os.getenv('REDDIT_REQUESTS_PER_MINUTE', REQUESTS_PER_MINUTE)))
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LISTINGS) as pool:
+        results = list(pool.map(
+            lambda listing: fetch_listing(session, limiter, listing, cursors.get(listing[0]), cutoff),
+            listings
+        ))
+
+    # The same post can appear in a subreddit and in search results
+    posts, seen = [], set()
+    for result in results:
+        if result['error']:
+            print(f"   ❌ {result['key']}: {result['error']}")
+            continue
+        print(f"   ✓ {result['key']}: {len(result['posts'])} new posts ({result['requests']} requests)")
+        for post in result['posts']:
+            if post['name'] not in seen:
+                seen.add(post['name'])
+                posts.append(post)
+
+    return posts, results
+
+def ensure_cursor_table(conn):
+    """Create the listing cursor table if missing."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS reddit_cursors (
+            listing TEXT PRIMARY KEY,
+            fullname TEXT NOT NULL,
+            created_utc REAL NOT NULL
+        )
+    """)
+
+def load_cursors(conn) -> dict:
+    """Return stored cursors by listing key."""
+    ensure_cursor_table(conn)
+    rows = conn.execute("SELECT listing, fullname, created_utc FROM reddit_cursors").fetchall()
+    return {r[0]: {"fullname": r[1], "created_utc": r[2]} for r in rows}
+
+def save_cursors(conn, results: list, stats: dict = None, stored: list = None):
+    """Persist the new cursors of successfully fetched listings.
+
+    Listings with posts in a store that had errors keep their old cursor, so
+    the next run fetches those posts again.
+
+    Args:
+        conn: Local state connection
+        results: Results per listing from fetch_articles()
+        stats: store_articles() statistics (None when nothing was stored)
+        stored: Normalized posts passed to store_articles() (None: every listing)
+    """
+    stored_urls = {a['url'] for a in stored} if stored is not None else None
+    advanced = []
+    for r in results:
+        if not r['cursor'] or r['error']:
+            continue
+        if (stats or {}).get('errors') and (stored_urls is None
+                                            or any(post_url(p) in stored_urls for p in r['posts'])):
+            print(f"   ⚠️  Keeping the {r['key']} cursor: not all of its posts were stored")
+            continue
+        advanced.append((r['key'], r['cursor']['fullname'], r['cursor']['created_utc']))
+
+    ensure_cursor_table(conn)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO reddit_cursors (listing, fullname, created_utc) VALUES (?, ?, ?)",
+            advanced
+        )
+
+def post_url(post) -> str:
+    """Return the stored URL of a raw post."""
+    return f"https://www.reddit.com{post.get('permalink', '')}"
+
+def extract_fields(post) -> tuple:
+    """Extract the text fields used for competitor matching.
+
+    Args:
+        post: Raw Reddit post data
+
+    Returns:
+        tuple: (title, summary, body) strings
+    """
+    return (post.get('title') or '', post.get('selftext') or '', '')
+
+def detect_competitors(post) -> list:
+    """Detect which competitors are mentioned in the post.
+
+    Args:
+        post: Raw Reddit post data
+
+    Returns:
+        list: List of competitor names found (capitalized)
+    """
+    return matched_competitors(extract_fields(post))
+
+def normalize_article(post) -> dict:
+    """Transform a Reddit post to our standard schema.
+
+    Args:
+        post: Raw Reddit post data
+
+    Returns:
+        dict: Normalized article matching Supabase schema
+    """
+    selftext = post.get('selftext') or ''
+    thumbnail = post.get('thumbnail') or ''
+
+    return {
+        "title": post.get("title"),
+        "url": post_url(post),
+        "source": f"r/{post.get('subreddit', SOURCE_NAME)}",
+        "competitors": detect_competitors(post),
+        "published_at": datetime.fromtimestamp(post['created_utc'], tz=timezone.utc).isoformat(),
+        "summary": selftext[:300] or None,
+        "author": post.get("author"),
+        "image_url": thumbnail if thumbnail.startswith('http') else None
+    }
+
+def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
+    """Log scraper execution to scraper_runs table.
+
+    Args:
+        supabase: Supabase client
+        stats: Run statistics
+        success: Whether scraper completed successfully
+        error: Error message if failed
+    """
+    try:
+        supabase.table('scraper_runs').insert({
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
+            "articles_added": stats.get('inserted', 0),
+            "status": "completed" if success else "failed",
+            "error_message": error
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log scraper run: {e}")
+
+def main():
+    """Main scraper execution."""
+
+    if os.getenv('ENABLE_REDDIT_SCRAPING', 'true').lower() != 'true':
+        print(f"ℹ️  Reddit scraping disabled (ENABLE_REDDIT_SCRAPING)")
+        return
+
+    listings = get_listings()
+
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Scraper Started")
+    print(f"   Listings: {len(listings)} (new posts since last run)")
+    print(f"{'='*60}\n")
+
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+    state = open_state()
+
+    try:
+        # Initialize
+        print(f"🔌 Connecting to Supabase...")
+        with profiler.stage("connect"):
+            supabase = init_supabase()
+            session = create_session()
+        print(f"✅ Connected to Supabase and Reddit\n")
+
+        # Fetch new posts
+        print(f"📡 Fetching new posts from {len(listings)} listings...\n")
+        with profiler.stage("fetch"):
+            raw_posts, results = fetch_articles(session, load_cursors(state), listings)
+        print(f"\n✅ Found {len(raw_posts)} unique new posts\n")
+
+        if not raw_posts:
+            print(f"ℹ️  No new posts since the last run")
+            save_cursors(state, results)
+            log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
+            return
+
+        # Normalize posts
+        print(f"🔄 Normalizing posts...")
+        with profiler.stage("normalize"):
+            normalized = [normalize_article(p) for p in raw_posts]
+        print(f"✅ Normalized {len(normalized)} posts\n")
+
+        # Score competitor relevance and drop low-scoring matches
+        print(f"🎯 Scoring competitor relevance...")
+        with profiler.stage("score"):
+            fields = [extract_fields(p) for p in raw_posts]
+            scores = score_articles(fields, COMPETITORS)
+            relevant = apply_scores(normalized, scores, COMPETITORS)
+            relevant = apply_watchlists(normalized, fields, relevant)
+        print(f"✅ Found {len(relevant)} posts above relevance threshold ({get_min_score()})\n")
+
+        # Keep every fetched post in the Parquet archive (if ARCHIVE_DIR is set)
+        with profiler.stage("archive"):
+            archive_articles(SOURCE_NAME, raw_posts, normalized, scores, RUN_STARTED_AT)
+
+        # Store posts, then advance cursors
+        stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+        if relevant:
+            # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+            with profiler.stage("images"):
+                attach_thumbnails(supabase, relevant)
+
+            print(f"💾 Storing posts in database...\n")
+            with profiler.stage("store"):
+                stats = store_articles(supabase, relevant)
+        save_cursors(state, results, stats, relevant)
+
+        # Log results
+        print(f"\n📝 Logging scraper run...")
+        with profiler.stage("log"):
+            log_scraper_run(supabase, stats, success=True)
+
+        # Summary
+        print(f"\n{'='*60}")
+        print(f"✅ {SOURCE_NAME} Scraper Complete")
+        print(f"{'='*60}")
+        print(f"   Posts Fetched: {len(raw_posts)}")
+        print(f"   API Requests: {sum(r['requests'] for r in results)}")
+        print(f"   Competitor Mentions: {len(relevant)}")
+        print(f"   New Articles Stored: {stats['inserted']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
+        print(f"   Errors: {stats['errors']}")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Scraper failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+
+        # Log failure
+        try:
+            supabase = init_supabase()
+            log_scraper_run(supabase, {}, success=False, error=str(e))
+        except:
+            pass
+
+        sys.exit(1)
+
+    finally:
+        state.close()
+        profiler.report()
+
+if __name__ == "__main__":
+    main()
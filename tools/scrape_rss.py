@@ -2,15 +2,38 @@
 """
 RSS Feed Scraper
 Fetches competitor news from company blog RSS feeds and stores in Supabase.
+
+Feeds come from the feed catalog (feed_catalog.py): each run fetches only
+the feeds due now and records their runtime state. New ETag/Last-Modified
+validators and the next due time are saved only once a feed's articles are
+stored, so a failed store or a crash means a full re-fetch, not a 304.
+
+With CPU_WORKERS set, feeds are downloaded whole and parsed, normalized and
+matched in a process pool (cpu_pool.py).
 """
 
 import os
 import sys
+import time
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from supabase import create_client, Client
 import feedparser
+from functools import partial
 from dateutil import parser
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from competitor_rules import matched_competitors
+from storage import store_articles
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+from feed_stream import fetch_feed, parse_with_feedparser, download_feed, parse_feed_payload
+from feed_catalog import open_catalog, due_feeds, list_feeds, get_feed, record_success, record_failure, record_hub
+from backfill import parse_backfill_args, run_archive_backfill, print_backfill_summary
+from shard_coordinator import ShardCoordinator, SQLiteLeaseBackend, SupabaseLeaseBackend
+from cpu_pool import get_pool, prepare_articles, prepare_records, chunk_payloads, collect, keep_raw_records, CHUNK_BYTES
 
 # Load environment
 load_dotenv()
@@ -18,16 +41,13 @@ load_dotenv()
 # Constants
 SOURCE_NAME = "RSS Feeds"
 LOOKBACK_HOURS = 24  # Fetch articles from last 24 hours
-COMPETITORS = [
-    "ledger", "trezor", "tangem", "coinbase",
-    "metamask", "revolut", "raby", "phantom"
-]
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
 
-# RSS feed URLs to scrape
-RSS_FEEDS = {
-    "Trezor Blog": "https://blog.trezor.io/feed",
-    # Add more working RSS feeds here as discovered
-}
+# Backfill walks at most this many archive pages per feed
+ARCHIVE_MAX_PAGES = 20
+
+# Feeds fetched per run at most (the rest stay due for the next run)
+MAX_FEEDS_PER_RUN = 500
 
 def init_supabase() -> Client:
     """Initialize Supabase client."""
@@ -39,58 +59,264 @@ def init_supabase() -> Client:
 
     return create_client(url, key)
 
-def fetch_articles_from_feed(feed_url: str, feed_name: str, cutoff: datetime):
+def fetch_articles_from_feed(feed: dict, cutoff: datetime, catalog=None, fetched: list = None):
     """Fetch articles from a single RSS feed.
 
     Args:
-        feed_url: URL of the RSS feed
-        feed_name: Name of the feed source
+        feed: Catalog feed (url, name, parser, competitor hints, validators)
         cutoff: Datetime cutoff for filtering old articles
+        catalog: Catalog connection to record the fetch in (optional)
+        fetched: If given, successful fetches are appended here as
+            (feed, latency ms, new validators) for record_fetched() once the
+            articles are stored, instead of being recorded right away
 
     Returns:
         list: List of raw articles from the feed
     """
+    feed_name = feed['name']
+    validators = {"etag": feed.get('etag'), "last_modified": feed.get('last_modified')}
+    links = {}
+    started = time.perf_counter()
+
     try:
         print(f"   📡 Fetching {feed_name}...")
-        parsed = feedparser.parse(feed_url)
-
-        if parsed.get('bozo', 1) == 1 and not parsed.entries:
-            print(f"   ⚠️  Feed parsing failed: {parsed.get('bozo_exception', 'Unknown error')}")
-            return []
-
-        # Filter for recent articles
-        recent = []
-        for entry in parsed.entries:
-            published = parse_timestamp(entry.get('published', entry.get('updated')))
-            published_dt = parser.parse(published)
 
-            if published_dt >= cutoff:
-                # Add feed name to entry
-                entry['_feed_name'] = feed_name
-                recent.append(entry)
+        if feed.get('parser') == 'feedparser':
+            recent = parse_with_feedparser(feed['url'], cutoff, links)
+        else:
+            # Streams the feed and stops at the cutoff (feedparser for malformed feeds)
+            recent = fetch_feed(feed['url'], cutoff, validators=validators, links=links)
+
+        for entry in recent:
+            entry['_feed_name'] = feed_name
+            entry['_competitor_hints'] = feed.get('competitor_hints') or []
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        if fetched is not None:
+            fetched.append((feed, latency_ms, validators))
+        elif catalog is not None:
+            record_success(catalog, feed, latency_ms, validators)
+        if catalog is not None:
+            # WebSub hubs advertised by the feed are subscribed by websub.py
+            record_hub(catalog, feed, links)
 
         print(f"   ✅ Found {len(recent)} recent articles from {feed_name}")
         return recent
 
     except Exception as e:
         print(f"   ❌ Error fetching {feed_name}: {e}")
+        if catalog is not None:
+            record_failure(catalog, feed, str(e))
         return []
 
-def fetch_articles():
-    """Fetch articles from all RSS feeds.
+def fetch_articles(fetched: list):
+    """Fetch articles from all feeds due now.
+
+    Args:
+        fetched: Collects (feed, latency ms, new validators) per successful fetch
 
     Returns:
         list: List of raw articles from all sources
     """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
 
-    all_articles = []
-    for feed_name, feed_url in RSS_FEEDS.items():
-        articles = fetch_articles_from_feed(feed_url, feed_name, cutoff)
-        all_articles.extend(articles)
+    catalog = open_catalog()
+    try:
+        feeds = due_feeds(catalog, limit=MAX_FEEDS_PER_RUN)
+        print(f"   {len(feeds)} feeds due\n")
+
+        all_articles = []
+        for feed in feeds:
+            articles = fetch_articles_from_feed(feed, cutoff, catalog, fetched)
+            all_articles.extend(articles)
+    finally:
+        catalog.close()
 
     return all_articles
 
+def fetch_payloads(fetched: list) -> list:
+    """Download every feed due now without parsing it (CPU_WORKERS mode).
+
+    Args:
+        fetched: Collects (feed, latency ms, new validators) per successful download
+
+    Returns:
+        list: (feed, document bytes) for feeds that changed
+    """
+    catalog = open_catalog()
+    try:
+        feeds = due_feeds(catalog, limit=MAX_FEEDS_PER_RUN)
+        print(f"   {len(feeds)} feeds due\n")
+
+        payloads = []
+        for feed in feeds:
+            validators = {"etag": feed.get('etag'), "last_modified": feed.get('last_modified')}
+            links = {}
+            started = time.perf_counter()
+            try:
+                print(f"   📡 Fetching {feed['name']}...")
+                body = download_feed(feed['url'], validators=validators, links=links)
+                fetched.append((feed, (time.perf_counter() - started) * 1000, validators))
+            except Exception as e:
+                print(f"   ❌ Error fetching {feed['name']}: {e}")
+                record_failure(catalog, feed, str(e))
+                continue
+
+            if body:
+                meta = {k: feed[k] for k in ('id', 'name', 'url', 'parser', 'competitor_hints')}
+                payloads.append(({**meta, 'links': links}, body))
+    finally:
+        catalog.close()
+
+    return payloads
+
+def parse_payloads(cutoff_iso: str, keep_raw: bool, payloads: list) -> tuple:
+    """Parse, normalize and match a chunk of downloaded feeds (in a worker).
+
+    Args:
+        cutoff_iso: Oldest publication date to keep
+        keep_raw: Return raw entries too (for the archive)
+        payloads: (feed, document bytes) tuples
+
+    Returns:
+        tuple: (prepare_records() records, [(feed, entries kept, links, error)])
+    """
+    cutoff = datetime.fromisoformat(cutoff_iso)
+    records, results = [], []
+    for feed, body in payloads:
+        links = dict(feed['links'])  # HTTP Link headers win over feed-level links
+        try:
+            if feed.get('parser') == 'feedparser':
+                entries = parse_with_feedparser(body, cutoff, links)
+            else:
+                entries = parse_feed_payload(body, cutoff, links)
+        except Exception as e:
+            results.append((feed, 0, links, str(e)))
+            continue
+
+        for entry in entries:
+            entry['_feed_name'] = feed['name']
+            entry['_competitor_hints'] = feed.get('competitor_hints') or []
+        records.extend(prepare_records(__name__, entries, keep_raw))
+        results.append((feed, len(entries), links, None))
+    return records, results
+
+def parse_in_pool(pool, payloads: list, fetched: list):
+    """Parse downloaded feeds in the pool and record the results in the catalog.
+
+    Args:
+        pool: CPUPool from get_pool()
+        payloads: (feed, document bytes) from fetch_payloads()
+        fetched: Pending successful fetches; feeds that fail to parse are
+            recorded as failures and dropped from it
+
+    Returns:
+        Prepared: Articles from every feed, in feed order
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+    max_bytes = pool.chunk_size(sum(len(body) for _, body in payloads), CHUNK_BYTES)
+    chunks = chunk_payloads(payloads, max_bytes, size_of=lambda payload: len(payload[1]))
+    outputs = pool.map(partial(parse_payloads, cutoff.isoformat(), keep_raw_records()), chunks)
+
+    records, failed = [], set()
+    catalog = open_catalog()
+    try:
+        for chunk_records, results in outputs:
+            records.extend(chunk_records)
+            for feed, count, links, error in results:
+                current = get_feed(catalog, feed['id'])
+                if error:
+                    print(f"   ❌ Error parsing {feed['name']}: {error}")
+                    failed.add(feed['id'])
+                    if current:
+                        record_failure(catalog, current, error)
+                    continue
+                print(f"   ✅ Found {count} recent articles from {feed['name']}")
+                # WebSub hubs advertised by the feed are subscribed by websub.py
+                if links and current:
+                    record_hub(catalog, current, links)
+    finally:
+        catalog.close()
+
+    fetched[:] = [entry for entry in fetched if entry[0]['id'] not in failed]
+    return collect(records)
+
+def record_fetched(catalog, fetched: list, stats: dict, sources: set = None):
+    """Save new validators and the next due time of feeds whose articles are stored.
+
+    Feeds with articles in a store that had errors keep their old validators
+    and stay due, so the next run fetches them in full again.
+
+    Args:
+        catalog: Catalog connection
+        fetched: (feed, latency ms, new validators) from the fetch
+        stats: store_articles() statistics ({} when nothing was stored)
+        sources: Feed names with articles in the store (None: every feed)
+    """
+    for feed, latency_ms, validators in fetched:
+        if stats.get('errors') and (sources is None or feed['name'] in sources):
+            print(f"   ⚠️  Keeping {feed['name']} due: not all of its articles were stored")
+            continue
+        record_success(catalog, feed, latency_ms, validators)
+
+def finish_fetched(fetched: list, stats: dict = None, stored: list = None):
+    """record_fetched() with its own catalog connection (single-process runs)."""
+    catalog = open_catalog()
+    try:
+        record_fetched(catalog, fetched, stats or {}, {a['source'] for a in stored or []})
+    finally:
+        catalog.close()
+
+def archive_page_url(feed_url: str, page: int) -> str:
+    """Return the URL of an older feed page (WordPress-style `paged` archives)."""
+    if page == 1:
+        return feed_url
+    separator = '&' if '?' in feed_url else '?'
+    return f"{feed_url}{separator}paged={page}"
+
+def walk_feed_archive(feed: dict, start_iso: str, end_iso: str) -> list:
+    """Walk one feed's archive pages back to start, keeping entries in [start, end).
+
+    Runs in backfill worker processes, once per feed for the whole range.
+
+    Args:
+        feed: Catalog feed
+        start_iso: Range start (ISO timestamp)
+        end_iso: Range end (ISO timestamp)
+
+    Returns:
+        list: (published ISO timestamp, raw entry) for entries inside the range
+    """
+    start, end = parser.parse(start_iso), parser.parse(end_iso)
+    feed_name, feed_url = feed['name'], feed['url']
+    seen_links = set()
+    entries = []
+
+    for page in range(1, ARCHIVE_MAX_PAGES + 1):
+        parsed = feedparser.parse(archive_page_url(feed_url, page))
+        fresh = [e for e in parsed.entries if e.get('link') not in seen_links]
+
+        # Stop on empty pages or when the site ignores `paged`
+        if not fresh:
+            break
+
+        oldest = None
+        for entry in fresh:
+            seen_links.add(entry.get('link'))
+            published = parse_timestamp(entry.get('published', entry.get('updated')))
+            published_dt = parser.parse(published)
+            oldest = published_dt if oldest is None else min(oldest, published_dt)
+
+            if start <= published_dt < end:
+                entry['_feed_name'] = feed_name
+                entry['_competitor_hints'] = feed['competitor_hints']
+                entries.append((published, entry))
+
+        if oldest < start:
+            break
+
+    return entries
+
 def parse_timestamp(timestamp_str):
     """Parse various timestamp formats to UTC ISO string."""
     if not timestamp_str:
@@ -107,29 +333,36 @@ def parse_timestamp(timestamp_str):
     except:
         return datetime.now(timezone.utc).isoformat()
 
-def detect_competitors(article_data) -> list:
-    """Detect which competitors are mentioned in the article.
+def extract_fields(article_data) -> tuple:
+    """Extract the text fields used for competitor matching.
 
     Args:
         article_data: Raw article data
 
     Returns:
-        list: List of competitor names found (capitalized)
+        tuple: (title, summary, body) strings
     """
-    # Combine all text fields
-    title = article_data.get('title', '').lower()
-    summary = article_data.get('summary', '').lower()
-    content = article_data.get('content', [{}])[0].get('value', '').lower() if article_data.get('content') else ''
+    title = article_data.get('title') or ''
+    summary = article_data.get('summary') or ''
+    content = article_data.get('content', [{}])[0].get('value', '') if article_data.get('content') else ''
+
+    # Catalog competitor hints (e.g. a competitor's own blog) count as body mentions
+    hints = article_data.get('_competitor_hints')
+    if hints:
+        content = f"{content} {' '.join(hints)}"
 
-    text = f"{title} {summary} {content}"
+    return (title, summary, content)
 
-    found = []
-    for competitor in COMPETITORS:
-        if competitor in text:
-            # Capitalize first letter
-            found.append(competitor.capitalize())
+def detect_competitors(article_data) -> list:
+    """Detect which competitors are mentioned in the article.
+
+    Args:
+        article_data: Raw article data
 
-    return found
+    Returns:
+        list: List of competitor names found (capitalized)
+    """
+    return matched_competitors(extract_fields(article_data))
 
 def normalize_article(raw_article) -> dict:
     """Transform RSS feed format to our standard schema.
@@ -165,121 +398,210 @@ def normalize_article(raw_article) -> dict:
         "image_url": image_url
     }
 
-def article_exists(supabase: Client, url: str) -> bool:
-    """Check if article already exists in database.
+def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
+    """Log scraper execution to scraper_runs table.
 
     Args:
         supabase: Supabase client
-        url: Article URL to check
-
-    Returns:
-        bool: True if article exists
+        stats: Run statistics
+        success: Whether scraper completed successfully
+        error: Error message if failed
     """
     try:
-        result = supabase.table('articles').select('id').eq('url', url).execute()
-        return len(result.data) > 0
-    except:
-        return False
+        supabase.table('scraper_runs').insert({
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
+            "articles_added": stats.get('inserted', 0),
+            "status": "completed" if success else "failed",
+            "error_message": error
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log scraper run: {e}")
 
-def store_articles(supabase: Client, articles: list) -> dict:
-    """Store articles in Supabase, skipping duplicates.
+def process_articles(supabase: Client, raw_articles: list) -> dict:
+    """Normalize, score and store one batch of raw articles (backfill path).
 
     Args:
         supabase: Supabase client
-        articles: List of normalized articles
+        raw_articles: Raw articles from the source
 
     Returns:
-        dict: Statistics (inserted, skipped, errors)
+        dict: Storage statistics (inserted, skipped, errors)
     """
-    stats = {"inserted": 0, "skipped": 0, "errors": 0}
+    prepared = prepare_articles(__name__, raw_articles, get_pool())
+    normalized, fields = prepared.normalized, prepared.fields
+    scores = score_articles(fields, COMPETITORS, mentions=prepared.mentions)
+    relevant = apply_scores(normalized, scores, COMPETITORS)
+    relevant = apply_watchlists(normalized, fields, relevant, tags=prepared.tags)
+    archive_articles(SOURCE_NAME, raw_articles, normalized, scores)
+    attach_thumbnails(supabase, relevant)
+    texts = {a['url']: f[2] for a, f in zip(normalized, fields)}
+    return store_articles(supabase, relevant, verbose=False, texts=texts)
+
+def backfill(start: datetime, end: datetime):
+    """Run the resumable historical backfill for [start, end)."""
 
-    for article in articles:
-        try:
-            # Skip if already exists
-            if article_exists(supabase, article['url']):
-                stats['skipped'] += 1
-                print(f"   ⏭  Skipped duplicate: {article['title'][:50]}...")
-                continue
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Backfill Started")
+    print(f"   Range: {start.isoformat()} → {end.isoformat()}")
+    print(f"{'='*60}\n")
 
-            # Insert new article
-            supabase.table('articles').insert(article).execute()
-            stats['inserted'] += 1
-            print(f"   ✅ Stored: {article['title'][:50]}... (Competitors: {', '.join(article['competitors'])})")
+    supabase = init_supabase()
+    catalog = open_catalog()
+    try:
+        feeds = list_feeds(catalog, enabled_only=True)
+    finally:
+        catalog.close()
 
-        except Exception as e:
-            print(f"   ❌ Error storing article: {e}")
-            stats['errors'] += 1
+    # Archives are read newest first, so each feed is walked once for all chunks
+    totals = run_archive_backfill(SOURCE_NAME, walk_feed_archive, feeds, partial(process_articles, supabase),
+                                  start, end)
+    print_backfill_summary(SOURCE_NAME, totals)
 
-    return stats
+    log_scraper_run(supabase, {"inserted": totals['inserted']}, success=totals['errors'] == 0,
+                    error=f"{totals['errors']} chunk errors" if totals['errors'] else None)
 
-def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
-    """Log scraper execution to scraper_runs table.
+def run_worker():
+    """Process this worker's shard of the feed catalog (run several with --worker)."""
+
+    supabase = init_supabase()
+    if os.getenv('SHARD_BACKEND', 'sqlite') == 'supabase':
+        backend = SupabaseLeaseBackend(supabase)
+    else:
+        backend = SQLiteLeaseBackend()
+    coordinator = ShardCoordinator(backend)
+
+    # Every worker shards the same list: all enabled feeds, keyed by URL
+    catalog = open_catalog()
+    feeds = {feed['url']: feed for feed in list_feeds(catalog, enabled_only=True)}
+
+    print(f"\n{'='*60}")
+    print(f"🚀 RSS Feed Worker {coordinator.worker_id} Started")
+    print(f"   Catalog: {len(feeds)} RSS feeds")
+    print(f"{'='*60}\n")
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+    totals = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+
+    def process_feed(feed_url: str):
+        fetched = []
+        raw_articles = fetch_articles_from_feed(feeds[feed_url], cutoff, catalog, fetched)
+        stats = process_articles(supabase, raw_articles) if raw_articles else {}
+        for key, value in stats.items():
+            totals[key] = totals.get(key, 0) + value
+        record_fetched(catalog, fetched, stats)
 
-    Args:
-        supabase: Supabase client
-        stats: Run statistics
-        success: Whether scraper completed successfully
-        error: Error message if failed
-    """
     try:
-        supabase.table('scraper_runs').insert({
-            "started_at": datetime.now(timezone.utc).isoformat(),
-            "completed_at": datetime.now(timezone.utc).isoformat(),
-            "articles_found": stats.get('inserted', 0) + stats.get('skipped', 0),
-            "articles_added": stats.get('inserted', 0),
-            "status": "completed" if success else "failed",
-            "error_message": error
-        }).execute()
-    except Exception as e:
-        print(f"   ⚠️  Failed to log scraper run: {e}")
+        shard_stats = coordinator.run(sorted(feeds), process_feed)
+    finally:
+        catalog.close()
+    log_scraper_run(supabase, totals, success=True)
+
+    print(f"\n✅ Worker processed {shard_stats['processed']} feeds "
+          f"({shard_stats['rebalanced']} taken over from other workers, {shard_stats['failed']} failed), "
+          f"{totals['inserted']} new articles\n")
 
 def main():
     """Main scraper execution."""
 
+    # Historical mode: --backfill FROM TO
+    try:
+        backfill_range = parse_backfill_args(sys.argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if backfill_range:
+        backfill(*backfill_range)
+        return
+
+    # Sharded mode: several workers split the feed list
+    if '--worker' in sys.argv:
+        run_worker()
+        return
+
     print(f"\n{'='*60}")
     print(f"🚀 RSS Feed Scraper Started")
     print(f"   Time Window: Last {LOOKBACK_HOURS} hours")
-    print(f"   Sources: {len(RSS_FEEDS)} RSS feeds")
+    print(f"   Sources: feeds due in the catalog (feed_catalog.py --list)")
     print(f"{'='*60}\n")
 
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+
     try:
         # Initialize
         print(f"🔌 Connecting to Supabase...")
-        supabase = init_supabase()
+        with profiler.stage("connect"):
+            supabase = init_supabase()
         print(f"✅ Connected to Supabase\n")
 
-        # Fetch articles
+        # Fetch articles (with a CPU pool, feeds are parsed in a separate parse stage)
+        pool = get_pool()
+        fetched = []
         print(f"📡 Fetching articles from RSS feeds...\n")
-        raw_articles = fetch_articles()
+        with profiler.stage("fetch"):
+            if pool:
+                payloads = fetch_payloads(fetched)
+            else:
+                raw_articles = fetch_articles(fetched)
+
+        if pool:
+            print(f"\n🔄 Parsing {len(payloads)} feeds on {pool.workers} workers...")
+            with profiler.stage("parse"):
+                prepared = parse_in_pool(pool, payloads, fetched)
+                raw_articles = prepared.raw
         print(f"\n✅ Found {len(raw_articles)} total recent articles\n")
 
         if not raw_articles:
             print(f"ℹ️  No recent articles found in RSS feeds")
+            finish_fetched(fetched)
             log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
             return
 
-        # Normalize articles
-        print(f"🔄 Normalizing articles...")
-        normalized = [normalize_article(a) for a in raw_articles]
+        # Normalize articles (the pool workers already did in the parse stage)
+        if not pool:
+            print(f"🔄 Normalizing articles...")
+            with profiler.stage("normalize"):
+                prepared = prepare_articles(__name__, raw_articles)
+        normalized, fields = prepared.normalized, prepared.fields
         print(f"✅ Normalized {len(normalized)} articles\n")
 
-        # Filter for competitor mentions
-        print(f"🎯 Filtering for competitor mentions...")
-        relevant = [a for a in normalized if a['competitors']]
-        print(f"✅ Found {len(relevant)} articles mentioning competitors\n")
+        # Score competitor relevance and drop low-scoring matches
+        print(f"🎯 Scoring competitor relevance...")
+        with profiler.stage("score"):
+            scores = score_articles(fields, COMPETITORS, mentions=prepared.mentions)
+            relevant = apply_scores(normalized, scores, COMPETITORS)
+            relevant = apply_watchlists(normalized, fields, relevant, tags=prepared.tags)
+        print(f"✅ Found {len(relevant)} articles above relevance threshold ({get_min_score()})\n")
+
+        # Keep every fetched article in the Parquet archive (if ARCHIVE_DIR is set)
+        with profiler.stage("archive"):
+            archive_articles(SOURCE_NAME, raw_articles, normalized, scores, RUN_STARTED_AT)
 
         if not relevant:
             print(f"ℹ️  No competitor mentions found in this batch")
+            finish_fetched(fetched)
             log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
             return
 
+        # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+        with profiler.stage("images"):
+            attach_thumbnails(supabase, relevant)
+
         # Store articles
         print(f"💾 Storing articles in database...\n")
-        stats = store_articles(supabase, relevant)
+        with profiler.stage("store"):
+            texts = {a['url']: f[2] for a, f in zip(normalized, fields)}
+            stats = store_articles(supabase, relevant, texts=texts)
+            # Only now may the next run get a 304 for these feeds
+            finish_fetched(fetched, stats, relevant)
 
         # Log results
         print(f"\n📝 Logging scraper run...")
-        log_scraper_run(supabase, stats, success=True)
+        with profiler.stage("log"):
+            log_scraper_run(supabase, stats, success=True)
 
         # Summary
         print(f"\n{'='*60}")
@@ -288,7 +610,8 @@ def main():
         print(f"   Articles Fetched: {len(raw_articles)}")
         print(f"   Competitor Mentions: {len(relevant)}")
         print(f"   New Articles Stored: {stats['inserted']}")
-        print(f"   Duplicates Skipped: {stats['skipped']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
         print(f"   Errors: {stats['errors']}")
         print(f"\n")
 
@@ -305,5 +628,8 @@ def main():
 
         sys.exit(1)
 
+    finally:
+        profiler.report()
+
 if __name__ == "__main__":
     main()
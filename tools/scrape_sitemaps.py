@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Sitemap Scraper
+Discovers new and updated articles on competitor sites without a feed from
+their sitemap.xml / sitemap indexes and stores them in Supabase.
+
+- Sitemaps (plain or gzipped) are streamed and parsed incrementally with
+  lxml's pull parser, so large indexes never sit in memory
+- Per-sitemap state (lastmod, ETag, Last-Modified) in the local state DB:
+  child sitemaps whose <lastmod> is unchanged are not downloaded at all,
+  the rest are fetched conditionally (304 = unchanged)
+- Per-URL state: only URLs that are new or whose <lastmod> changed are
+  fetched, so the daily cost follows the number of changes, not the size
+  of the site
+- Article pages are fetched concurrently; title, date, summary and image
+  come from OpenGraph / article meta tags
+- The first run of a site records every URL but only fetches pages
+  modified in the last FIRST_RUN_DAYS days
+- Items come out in the RSS entry shape, so normalization, scoring,
+  archiving and storage reuse the RSS scraper's functions
+
+Usage:
+    python3 tools/scrape_sitemaps.py
+"""
+
+import os
+import re
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from supabase import create_client, Client
+import requests
+from dateutil import parser
+from lxml import etree, html
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from storage import store_articles
+from local_state import open_state
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+from scrape_rss import normalize_article, extract_fields
+
+# Load environment
+load_dotenv()
+
+# Constants
+SOURCE_NAME = "Sitemaps"
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
+USER_AGENT = "Mozilla/5.0 (compatible; CompetitorIntelBot/1.0)"
+
+# Discovery settings
+FIRST_RUN_DAYS = 7           # First run of a site: only fetch pages modified this recently
+MAX_PAGES_PER_SITE = 200     # Article pages fetched per site and run (the rest wait for the next run)
+MAX_INDEX_DEPTH = 3          # Nested sitemap indexes followed
+MAX_CONCURRENT_PAGES = 8
+CHUNK_SIZE = 64 * 1024
+LOOKUP_BATCH = 500
+
+# Sites to watch: root sitemap and a regex that article URLs must match
+SITEMAP_SITES = {
+    "Tangem Website": {
+        "sitemap": "https://tangem.com/sitemap.xml",
+        "include": r"/blog/post/",
+    },
+    "Ledger Website": {
+        "sitemap": "https://www.ledger.com/sitemap_index.xml",
+        "include": r"/blog/",
+    },
+    "Phantom Website": {
+        "sitemap": "https://phantom.com/sitemap.xml",
+        "include": r"/learn/(blog|guides)/",
+    },
+}
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def create_session() -> requests.Session:
+    """Create an HTTP session shared by sitemap and page fetches."""
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENT_PAGES)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def ensure_schema(conn):
+    """Create the sitemap and URL state tables."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sitemap_state (
+            sitemap_url TEXT PRIMARY KEY,
+            site TEXT NOT NULL,
+            lastmod TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sitemap_urls (
+            url TEXT PRIMARY KEY,
+            site TEXT NOT NULL,
+            lastmod TEXT,
+            seen_at TEXT
+        )
+    """)
+
+def load_sitemap_state(conn, site: str) -> dict:
+    """Return sitemap URL -> state row for a site."""
+    ensure_schema(conn)
+    return {row['sitemap_url']: dict(row) for row in conn.execute(
+        "SELECT * FROM sitemap_state WHERE site = ?", (site,))}
+
+def stored_lastmods(conn, urls: list) -> dict:
+    """Return url -> stored lastmod ('' if recorded without one) for known URLs."""
+    found = {}
+    for start in range(0, len(urls), LOOKUP_BATCH):
+        chunk = urls[start:start + LOOKUP_BATCH]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(f"SELECT url, lastmod FROM sitemap_urls WHERE url IN ({placeholders})", chunk):
+            found[row['url']] = row['lastmod'] or ''
+    return found
+
+def save_state(conn, result: dict):
+    """Persist a site's sitemap state and the URLs handled in this run.
+
+    Failed or deferred pages are not recorded. Sitemap state is only saved
+    when nothing was left over, so the next run walks the same sitemaps
+    again instead of skipping them as unchanged.
+    """
+    ensure_schema(conn)
+    now = datetime.now(timezone.utc).isoformat()
+    sitemaps = result['sitemaps'] if result.get('complete') else []
+    with conn:
+        conn.executemany("""
+            INSERT INTO sitemap_state (sitemap_url, site, lastmod, etag, last_modified, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sitemap_url) DO UPDATE SET
+                lastmod = excluded.lastmod, etag = excluded.etag,
+                last_modified = excluded.last_modified, fetched_at = excluded.fetched_at
+        """, [(s['url'], result['site'], s['lastmod'], s['etag'], s['last_modified'], now)
+              for s in sitemaps])
+        conn.executemany("""
+            INSERT INTO sitemap_urls (url, site, lastmod, seen_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET lastmod = excluded.lastmod, seen_at = excluded.seen_at
+        """, [(url, result['site'], lastmod, now) for url, lastmod in result['urls']])
+
+def local_name(element) -> str:
+    """Tag name without the sitemap namespace."""
+    return etree.QName(element).localname
+
+def iter_sitemap(response: requests.Response):
+    """Stream (kind, loc, lastmod) entries from a sitemap response.
+
+    Handles plain and gzipped files (.xml.gz is served without
+    Content-Encoding); elements are cleared as soon as they're read.
+
+    Yields:
+        tuple: ("url" or "sitemap", loc, lastmod or None)
+    """
+    pull = etree.XMLPullParser(events=('end',), resolve_entities=False, no_network=True, huge_tree=True)
+    decompressor = None
+    first = True
+
+    def drain():
+        for _, element in pull.read_events():
+            kind = local_name(element)
+            if kind not in ('url', 'sitemap'):
+                continue
+            fields = {local_name(child): (child.text or '').strip() for child in element if isinstance(child.tag, str)}
+            if fields.get('loc'):
+                yield kind, fields['loc'], fields.get('lastmod') or None
+            # Free the parsed entry and everything before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if first:
+            first = False
+            if chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        pull.feed(decompressor.decompress(chunk) if decompressor else chunk)
+        yield from drain()
+
+    if decompressor:
+        pull.feed(decompressor.flush())
+    pull.close()
+    yield from drain()
+
+def fetch_sitemap(session: requests.Session, url: str, state: dict):
+    """Fetch a sitemap conditionally.
+
+    Returns:
+        requests.Response: Streaming response, or None if unchanged (304)
+    """
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+
+    response = session.get(url, headers=headers, timeout=30, stream=True)
+    if response.status_code == 304:
+        response.close()
+        return None
+    response.raise_for_status()
+    return response
+
+def discover_changes(session: requests.Session, conn, name: str, config: dict) -> dict:
+    """Walk a site's sitemaps and collect new or modified article URLs.
+
+    Args:
+        session: HTTP session
+        conn: Local state connection
+        name: Site name
+        config: Site config (sitemap, include)
+
+    Returns:
+        dict: Result (site, changed [(url, lastmod)], sitemaps fetched/skipped,
+            sitemap states to save, first_run)
+    """
+    states = load_sitemap_state(conn, name)
+    include = re.compile(config.get('include') or '.')
+    result = {"site": name, "changed": [], "unchanged": 0, "fetched": 0, "skipped": 0,
+              "sitemaps": [], "first_run": not states}
+
+    def check_batch(batch: list):
+        stored = stored_lastmods(conn, [url for url, _ in batch])
+        for url, lastmod in batch:
+            if url not in stored or (lastmod and lastmod != stored[url]):
+                result['changed'].append((url, lastmod))
+            else:
+                result['unchanged'] += 1
+
+    def walk(url: str, lastmod: str, depth: int):
+        state = states.get(url, {})
+        if lastmod and state.get('lastmod') == lastmod:
+            result['skipped'] += 1
+            return
+
+        response = fetch_sitemap(session, url, state)
+        if response is None:
+            result['skipped'] += 1
+            return
+
+        result['fetched'] += 1
+        children, batch = [], []
+        with response:
+            for kind, loc, entry_lastmod in iter_sitemap(response):
+                if kind == 'sitemap':
+                    children.append((loc, entry_lastmod))
+                elif include.search(loc):
+                    batch.append((loc, entry_lastmod))
+                    if len(batch) >= LOOKUP_BATCH:
+                        check_batch(batch)
+                        batch = []
+        if batch:
+            check_batch(batch)
+
+        if depth < MAX_INDEX_DEPTH:
+            for child, child_lastmod in children:
+                walk(child, child_lastmod, depth + 1)
+
+        # Recorded only after the children were walked without error
+        result['sitemaps'].append({
+            "url": url,
+            "lastmod": lastmod,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+        })
+
+    walk(config['sitemap'], None, 0)
+    return result
+
+def select_pages(result: dict) -> tuple:
+    """Split a site's changed URLs into pages to fetch now and URLs to only record.
+
+    Returns:
+        tuple: ((url, lastmod) pairs to fetch, pairs to record without
+            fetching, number of pages deferred to the next run)
+    """
+    changed = result['changed']
+    record_only = []
+
+    if result['first_run']:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=FIRST_RUN_DAYS)
+        recent = []
+        for url, lastmod in changed:
+            modified = parse_date(lastmod)
+            (recent if modified and modified >= cutoff else record_only).append((url, lastmod))
+        changed = recent
+
+    # Newest first; anything beyond the cap is picked up next run
+    changed = sorted(changed, key=lambda item: item[1] or '', reverse=True)
+    return changed[:MAX_PAGES_PER_SITE], record_only, max(0, len(changed) - MAX_PAGES_PER_SITE)
+
+def parse_date(value):
+    """Parse a lastmod / meta date into an aware datetime (None if invalid)."""
+    if not value:
+        return None
+    try:
+        parsed = parser.parse(value)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except (ValueError, OverflowError):
+        return None
+
+def meta_content(document, *keys) -> str:
+    """Return the first non-empty <meta property|name=key content> value."""
+    for key in keys:
+        for value in document.xpath('//meta[@property=$key or @name=$key]/@content', key=key):
+            value = " ".join(value.split())
+            if value:
+                return value
+    return ''
+
+def extract_article(session: requests.Session, site: str, url: str, lastmod: str) -> dict:
+    """Fetch an article page and extract title, date, summary and image.
+
+    Returns:
+        dict: Raw article in the RSS entry shape, or None if the page failed
+    """
+    try:
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        document = html.fromstring(response.content, base_url=response.url)
+    except Exception as e:
+        print(f"   ⚠️  Could not fetch {url}: {e}")
+        return None
+
+    title = meta_content(document, 'og:title', 'twitter:title') or \
+        " ".join((document.findtext('.//title') or '').split())
+    if not title:
+        return None
+
+    published = meta_content(document, 'article:published_time', 'og:published_time', 'date') or \
+        next(iter(document.xpath('//time/@datetime')), None) or lastmod
+    article = {"title": title, "link": url, "_feed_name": site}
+
+    # Optional fields are left out when missing, like in feedparser entries
+    summary = meta_content(document, 'og:description', 'description', 'twitter:description')
+    author = meta_content(document, 'author', 'article:author')
+    image = meta_content(document, 'og:image', 'twitter:image')
+    if published:
+        article['published'] = published
+    if summary:
+        article['summary'] = summary
+    if author:
+        article['author'] = author
+    if image:
+        article['media_content'] = [{"url": image}]
+    return article
+
+def fetch_articles(session: requests.Session, conn) -> tuple:
+    """Discover changes on all sites and fetch the changed article pages.
+
+    Args:
+        session: HTTP session
+        conn: Local state connection
+
+    Returns:
+        tuple: (raw articles, per-site results)
+    """
+    results = []
+    for name, config in SITEMAP_SITES.items():
+        try:
+            result = discover_changes(session, conn, name, config)
+        except Exception as e:
+            print(f"   ❌ Error reading sitemaps of {name}: {e}")
+            continue
+
+        to_fetch, record_only, deferred = select_pages(result)
+        result.update({"to_fetch": to_fetch, "urls": list(record_only), "articles": [], "complete": not deferred})
+        results.append(result)
+        print(f"   ✅ {name}: {len(result['changed'])} new/modified URLs "
+              f"({result['fetched']} sitemaps fetched, {result['skipped']} unchanged)")
+
+    # All article pages of all sites share one pool
+    jobs = [(result, url, lastmod) for result in results for url, lastmod in result['to_fetch']]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as pool:
+        pages = list(pool.map(lambda job: extract_article(session, job[0]['site'], job[1], job[2]), jobs))
+
+    for (result, url, lastmod), article in zip(jobs, pages):
+        if article is None:
+            result['complete'] = False
+            continue
+        result['articles'].append(article)
+        result['urls'].append((url, lastmod))
+
+    return [a for r in results for a in r['articles']], results
+
+def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
+    """Log scraper execution to scraper_runs table.
+
+    Args:
+        supabase: Supabase client
+        stats: Run statistics
+        success: Whether scraper completed successfully
+        error: Error message if failed
+    """
+    try:
+        supabase.table('scraper_runs').insert({
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
+            "articles_added": stats.get('inserted', 0),
+            "status": "completed" if success else "failed",
+            "error_message": error
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log scraper run: {e}")
+
+def main():
+    """Main scraper execution."""
+
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Scraper Started")
+    print(f"   Sources: {len(SITEMAP_SITES)} sites (new or modified URLs since last run)")
+    print(f"{'='*60}\n")
+
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+    state = open_state()
+
+    try:
+        # Initialize
+        print(f"🔌 Connecting to Supabase...")
+        with profiler.stage("connect"):
+            supabase = init_supabase()
+            session = create_session()
+        print(f"✅ Connected to Supabase\n")
+
+        # Discover changes and fetch changed pages
+        print(f"📡 Reading sitemaps...\n")
+        with profiler.stage("fetch"):
+            raw_articles, results = fetch_articles(session, state)
+        print(f"\n✅ Fetched {len(raw_articles)} new or modified articles\n")
+
+        stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+        relevant = []
+        if raw_articles:
+            # Normalize articles
+            print(f"🔄 Normalizing articles...")
+            with profiler.stage("normalize"):
+                normalized = [normalize_article(a) for a in raw_articles]
+            print(f"✅ Normalized {len(normalized)} articles\n")
+
+            # Score competitor relevance and drop low-scoring matches
+            print(f"🎯 Scoring competitor relevance...")
+            with profiler.stage("score"):
+                fields = [extract_fields(a) for a in raw_articles]
+                scores = score_articles(fields, COMPETITORS)
+                relevant = apply_scores(normalized, scores, COMPETITORS)
+                relevant = apply_watchlists(normalized, fields, relevant)
+            print(f"✅ Found {len(relevant)} articles above relevance threshold ({get_min_score()})\n")
+
+            # Keep every fetched article in the Parquet archive (if ARCHIVE_DIR is set)
+            with profiler.stage("archive"):
+                archive_articles(SOURCE_NAME, raw_articles, normalized, scores, RUN_STARTED_AT)
+
+            if relevant:
+                # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+                with profiler.stage("images"):
+                    attach_thumbnails(supabase, relevant)
+
+                print(f"💾 Storing articles in database...\n")
+                with profiler.stage("store"):
+                    stats = store_articles(supabase, relevant)
+        else:
+            print(f"ℹ️  No new or modified articles in the sitemaps")
+
+        # Advance sitemap and URL state only after storage
+        for result in results:
+            save_state(state, result)
+
+        # Log results
+        print(f"\n📝 Logging scraper run...")
+        with profiler.stage("log"):
+            log_scraper_run(supabase, stats, success=True)
+
+        # Summary
+        print(f"\n{'='*60}")
+        print(f"✅ {SOURCE_NAME} Scraper Complete")
+        print(f"{'='*60}")
+        print(f"   Sitemaps Fetched: {sum(r['fetched'] for r in results)} "
+              f"({sum(r['skipped'] for r in results)} unchanged)")
+        print(f"   New/Modified URLs: {sum(len(r['changed']) for r in results)}")
+        print(f"   Pages Fetched: {len(raw_articles)}")
+        print(f"   Competitor Mentions: {len(relevant)}")
+        print(f"   New Articles Stored: {stats['inserted']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
+        print(f"   Errors: {stats['errors']}")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Scraper failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+
+        # Log failure
+        try:
+            supabase = init_supabase()
+            log_scraper_run(supabase, {}, success=False, error=str(e))
+        except:
+            pass
+
+        sys.exit(1)
+
+    finally:
+        state.close()
+        profiler.report()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Twitter/X Scraper
+Fetches competitor announcements from official accounts and keyword searches
+and stores them in Supabase.
+
+- Each listing (an account timeline or a recent-search query) keeps a
+  since_id cursor in the local state DB; runs ask only for newer tweets, in
+  100-tweet pages
+- The first run of a listing takes its newest page within LOOKBACK_HOURS
+- Pages come newest first, so a listing cut off at MAX_PAGES_PER_LISTING
+  keeps its since_id and records the unfetched range (until_id = oldest
+  tweet fetched); the next run pages that range before the cursor advances
+- Account handles are resolved to user ids in batches of 100 (one request)
+  and cached, so later runs skip the lookup
+- Listings are fetched concurrently; one shared limiter tracks each
+  endpoint's 15-minute rate window (x-rate-limit-* headers) and waits for
+  the reset instead of hitting 429s
+- Tweets map to the standard article schema; scoring, archiving and storage
+  reuse the shared pipeline
+
+Uses the X API v2 directly with an app-only bearer token (TWITTER_BEARER_TOKEN)
+rather than tweepy, so cursors, paging and rate windows stay explicit.
+TWITTER_API_URL can point at a local fake (see test_twitter_scraper.py).
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from supabase import create_client, Client
+import requests
+from dateutil import parser
+from relevance import score_articles, apply_scores, get_min_score
+from watchlists import apply_watchlists
+from competitors import COMPETITORS
+from competitor_rules import matched_competitors
+from storage import store_articles
+from local_state import open_state
+from profiling import StageProfiler
+from article_archive import archive_articles
+from thumbnail_cache import attach_thumbnails
+
+# Load environment
+load_dotenv()
+
+# Constants
+SOURCE_NAME = "Twitter"
+LOOKBACK_HOURS = 24  # First run of a listing: tweets from last 24 hours
+RUN_STARTED_AT = datetime.now(timezone.utc)  # Logged as scraper_runs.started_at
+API_URL = "https://api.twitter.com"
+
+# Listing settings
+PAGE_SIZE = 100                 # API maximum for timelines and recent search
+MAX_PAGES_PER_LISTING = 5
+MAX_CONCURRENT_LISTINGS = 4
+USER_LOOKUP_BATCH = 100         # Usernames per /2/users/by request
+TITLE_LENGTH = 120
+MAX_RATE_WAIT_SECONDS = 120     # Longer waits fail the listing (retried next run)
+UNKNOWN_WINDOW_POLL_SECONDS = 0.05
+
+# App-only requests per 15-minute window, used until the API reports its own
+RATE_LIMITS = {
+    "users/by": 300,
+    "users/tweets": 1500,
+    "tweets/search/recent": 450,
+}
+
+TWEET_PARAMS = {
+    "max_results": PAGE_SIZE,
+    "tweet.fields": "created_at,author_id,attachments,lang",
+    "expansions": "author_id,attachments.media_keys",
+    "user.fields": "username,name",
+    "media.fields": "url,preview_image_url",
+}
+
+# Official accounts (handle -> competitor) and searches; override with
+# comma-separated TWITTER_ACCOUNTS (handle or handle:competitor) / TWITTER_QUERIES
+DEFAULT_ACCOUNTS = {
+    "Ledger": "ledger",
+    "Trezor": "trezor",
+    "Tangem": "tangem",
+    "coinbase": "coinbase",
+    "MetaMask": "metamask",
+    "RevolutApp": "revolut",
+    "Rabby_io": "raby",
+    "phantom": "phantom",
+}
+DEFAULT_QUERIES = ["ledger wallet", "trezor", "tangem", "metamask", "rabby wallet", "phantom wallet"]
+
+class RateLimited(Exception):
+    """Raised when an endpoint's window resets later than MAX_RATE_WAIT_SECONDS."""
+
+def init_supabase() -> Client:
+    """Initialize Supabase client."""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials in .env file")
+
+    return create_client(url, key)
+
+def env_list(name: str, default: list) -> list:
+    """Read a comma-separated list from the environment."""
+    value = os.getenv(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def get_accounts() -> dict:
+    """Return the watched accounts as handle -> competitor (None if unknown)."""
+    accounts = {}
+    for item in env_list('TWITTER_ACCOUNTS', [f"{h}:{c}" for h, c in DEFAULT_ACCOUNTS.items()]):
+        handle, _, competitor = item.lstrip('@').partition(':')
+        accounts[handle] = competitor.lower() or None
+    return accounts
+
+class RateWindows:
+    """Shared per-endpoint rate windows for all threads.
+
+    Every request takes one unit from its endpoint's window; when a window is
+    used up, callers wait for its reset. Windows follow the API's
+    x-rate-limit-remaining / x-rate-limit-reset headers once seen.
+    """
+
+    def __init__(self, limits: dict = None, max_wait: float = MAX_RATE_WAIT_SECONDS):
+        self.limits = dict(limits or RATE_LIMITS)
+        self.max_wait = max_wait
+        # reset 0 = not reported yet; expired = reset time of the last window used up
+        self.windows = {endpoint: {"remaining": limit, "reset": 0.0, "expired": 0.0}
+                        for endpoint, limit in self.limits.items()}
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint: str):
+        """Block until a request to the endpoint is allowed.
+
+        Raises:
+            RateLimited: If the window resets later than max_wait
+        """
+        while True:
+            with self._lock:
+                window = self.windows[endpoint]
+                now = time.time()
+                if window['remaining'] <= 0 and window['reset'] and window['reset'] <= now:
+                    window.update(remaining=self.limits[endpoint], reset=0.0, expired=window['reset'])
+                if window['remaining'] > 0:
+                    window['remaining'] -= 1
+                    return
+                if not window['reset']:
+                    # Used up before any response reported the window: wait
+                    # for the requests in flight
+                    wait = UNKNOWN_WINDOW_POLL_SECONDS
+                else:
+                    wait = window['reset'] - now
+                    if wait > self.max_wait:
+                        raise RateLimited(f"{endpoint} rate window resets in {wait:.0f}s")
+                self.waited += wait
+            time.sleep(wait)
+
+    def update(self, endpoint: str, headers):
+        """Sync the window with the API's rate headers."""
+        try:
+            limit = int(headers.get('x-rate-limit-limit', self.limits[endpoint]))
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset = float(headers['x-rate-limit-reset'])
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            window = self.windows[endpoint]
+            self.limits[endpoint] = limit
+            if reset < window['reset'] or reset <= window['expired']:
+                return  # Late response from an earlier window
+            # Requests still in flight are already counted locally, not yet by the API
+            window['remaining'] = min(window['remaining'], remaining)
+            window['reset'] = reset
+
+def create_session() -> requests.Session:
+    """Return a session authorized with the app-only bearer token."""
+    token = os.getenv('TWITTER_BEARER_TOKEN')
+    if not token:
+        raise ValueError("Missing TWITTER_BEARER_TOKEN in .env file")
+
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f"Bearer {token}",
+        'User-Agent': 'CryptoCompetitorDashboard/1.0',
+    })
+    return session
+
+def api_get(session: requests.Session, limiter: RateWindows, endpoint: str, path: str, params: dict) -> dict:
+    """GET an API path within its endpoint's rate window.
+
+    A 429 (window used elsewhere, e.g. by another process) retries once; its
+    rate headers make the retry wait for the reset.
+
+    Returns:
+        dict: Response JSON
+    """
+    for attempt in range(2):
+        limiter.acquire(endpoint)
+        response = session.get(os.getenv('TWITTER_API_URL', API_URL) + path, params=params, timeout=30)
+        limiter.update(endpoint, response.headers)
+        if response.status_code != 429:
+            break
+    response.raise_for_status()
+    return response.json()
+
+def lookup_users(session, limiter: RateWindows, handles: list, cached: dict) -> tuple:
+    """Resolve handles to user ids, 100 per request, skipping cached ones.
+
+    Args:
+        session: Authorized session
+        limiter: Shared rate windows
+        handles: Account handles
+        cached: Known ids by lowercase handle
+
+    Returns:
+        tuple: (ids by lowercase handle, newly resolved ids, requests made)
+    """
+    ids = {h.lower(): cached[h.lower()] for h in handles if h.lower() in cached}
+    missing = [h for h in handles if h.lower() not in ids]
+    resolved, requests_made = {}, 0
+
+    for i in range(0, len(missing), USER_LOOKUP_BATCH):
+        batch = missing[i:i + USER_LOOKUP_BATCH]
+        data = api_get(session, limiter, "users/by", "/2/users/by",
+                       {"usernames": ",".join(batch), "user.fields": "username"})
+        requests_made += 1
+        for user in data.get('data', []):
+            resolved[user['username'].lower()] = user['id']
+        for error in data.get('errors', []):
+            print(f"   ⚠️  @{error.get('value')}: {error.get('detail', 'not found')}")
+
+    ids.update(resolved)
+    return ids, resolved, requests_made
+
+def get_listings(accounts: dict, user_ids: dict, queries: list = None) -> list:
+    """Return the listings to poll.
+
+    Returns:
+        list: Dicts with key, endpoint, path, params, page token param and
+            competitor hints
+    """
+    listings = []
+    for handle, competitor in accounts.items():
+        user_id = user_ids.get(handle.lower())
+        if not user_id:
+            continue
+        listings.append({
+            "key": f"@{handle.lower()}",
+            "endpoint": "users/tweets",
+            "path": f"/2/users/{user_id}/tweets",
+            "params": {"exclude": "retweets,replies"},
+            "token_param": "pagination_token",
+            "hints": [competitor] if competitor else [],
+        })
+
+    for query in queries if queries is not None else env_list('TWITTER_QUERIES', DEFAULT_QUERIES):
+        listings.append({
+            "key": f"search:{query}",
+            "endpoint": "tweets/search/recent",
+            "path": "/2/tweets/search/recent",
+            "params": {"query": f"{query} -is:retweet"},
+            "token_param": "next_token",
+            "hints": [],
+        })
+    return listings
+
+def page_tweets(page: dict, hints: list) -> list:
+    """Return a page's tweets with their author's username and first image."""
+    includes = page.get('includes', {})
+    users = {u['id']: u['username'] for u in includes.get('users', [])}
+    media = {m['media_key']: m.get('url') or m.get('preview_image_url') for m in includes.get('media', [])}
+
+    tweets = []
+    for tweet in page.get('data', []):
+        keys = tweet.get('attachments', {}).get('media_keys', [])
+        tweet['_username'] = users.get(tweet.get('author_id'))
+        tweet['_image_url'] = next((media[k] for k in keys if media.get(k)), None)
+        tweet['_competitor_hints'] = hints
+        tweets.append(tweet)
+    return tweets
+
+def fetch_listing(session, limiter: RateWindows, listing: dict, since_id: str, cutoff: datetime,
+                  gap: dict = None) -> dict:
+    """Fetch the tweets of one listing newer than its since_id.
+
+    Args:
+        session: Authorized session
+        limiter: Shared rate windows
+        listing: Listing from get_listings()
+        since_id: Stored cursor or None
+        cutoff: Oldest tweet time for a listing without a cursor
+        gap: Unfetched range left by a truncated run ({until_id, newest_id}) or None
+
+    Returns:
+        dict: key, tweets, new since_id, gap still to fetch, truncated flag,
+            requests made, error (if any)
+    """
+    result = {"key": listing['key'], "tweets": [], "since_id": since_id, "gap": gap, "truncated": False,
+              "requests": 0, "error": None}
+    fetch = lambda params: api_get(session, limiter, listing['endpoint'], listing['path'],
+                                   {**TWEET_PARAMS, **listing['params'], **params})
+    first_page = {"start_time": cutoff.strftime('%Y-%m-%dT%H:%M:%SZ')}
+
+    try:
+        if not since_id:
+            page = fetch(first_page)
+            result['requests'] += 1
+            result['tweets'] = page_tweets(page, listing['hints'])
+        else:
+            # Fill the range a truncated run left behind before moving on
+            params = {"since_id": since_id, **({"until_id": gap['until_id']} if gap else {})}
+            try:
+                for _ in range(MAX_PAGES_PER_LISTING):
+                    page = fetch(params)
+                    result['requests'] += 1
+                    result['tweets'].extend(page_tweets(page, listing['hints']))
+                    token = page.get('meta', {}).get('next_token')
+                    if not token:
+                        break
+                    params = {**params, listing['token_param']: token}
+                else:
+                    result['truncated'] = True
+            except requests.HTTPError as e:
+                # since_id outside the searchable range (older than 7 days for
+                # recent search): newest page of the lookback window, filtered
+                # by id (ids grow with time)
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                page = fetch(first_page)
+                result['requests'] += 1
+                result['tweets'] = [t for t in page_tweets(page, listing['hints']) if int(t['id']) > int(since_id)]
+                result['truncated'] = False
+                if gap:
+                    result['tweets'] = [t for t in result['tweets'] if int(t['id']) < int(gap['until_id'])]
+
+        ids = [t['id'] for t in result['tweets']]
+        if result['truncated'] and ids:
+            # Tweets between since_id and the oldest one fetched are still missing
+            result['gap'] = {"until_id": min(ids, key=int),
+                             "newest_id": gap['newest_id'] if gap else max(ids, key=int)}
+        elif gap:
+            result['since_id'], result['gap'] = gap['newest_id'], None
+        elif ids:
+            result['since_id'] = max(ids, key=int)
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+def fetch_articles(session, cursors: dict, listings: list, limiter: RateWindows = None,
+                   gaps: dict = None) -> tuple:
+    """Fetch new tweets of all listings concurrently.
+
+    Args:
+        session: Authorized session
+        cursors: Stored since_ids by listing key
+        listings: Listings from get_listings()
+        limiter: Shared rate windows, defaults to RATE_LIMITS
+        gaps: Unfetched ranges of truncated listings by listing key
+
+    Returns:
+        tuple: (unique tweets, results per listing)
+    """
+    limiter = limiter or RateWindows()
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LISTINGS) as pool:
+        results = list(pool.map(
+            lambda listing: fetch_listing(session, limiter, listing, cursors.get(listing['key']), cutoff,
+                                          (gaps or {}).get(listing['key'])),
+            listings
+        ))
+
+    # The same tweet can appear in a timeline and in search results
+    tweets, seen = [], set()
+    for result in results:
+        if result['error']:
+            print(f"   ❌ {result['key']}: {result['error']}")
+            continue
+        more = ", more left for the next run" if result['truncated'] else ""
+        print(f"   ✓ {result['key']}: {len(result['tweets'])} new tweets ({result['requests']} requests{more})")
+        for tweet in result['tweets']:
+            if tweet['id'] not in seen:
+                seen.add(tweet['id'])
+                tweets.append(tweet)
+
+    return tweets, results
+
+def ensure_state_tables(conn):
+    """Create the cursor and user id tables if missing."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS twitter_cursors (
+            listing TEXT PRIMARY KEY,
+            since_id TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS twitter_gaps (
+            listing TEXT PRIMARY KEY,
+            until_id TEXT NOT NULL,
+            newest_id TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS twitter_users (
+            username TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL
+        );
+    """)
+
+def load_cursors(conn) -> dict:
+    """Return stored since_ids by listing key."""
+    ensure_state_tables(conn)
+    return {r[0]: r[1] for r in conn.execute("SELECT listing, since_id FROM twitter_cursors")}
+
+def load_gaps(conn) -> dict:
+    """Return the unfetched ranges of truncated listings by listing key."""
+    ensure_state_tables(conn)
+    return {r[0]: {"until_id": r[1], "newest_id": r[2]}
+            for r in conn.execute("SELECT listing, until_id, newest_id FROM twitter_gaps")}
+
+def save_cursors(conn, results: list, stats: dict = None, stored: list = None):
+    """Persist the new since_ids (and unfetched ranges) of successfully fetched listings.
+
+    Listings with tweets in a store that had errors keep their old since_id,
+    so the next run fetches those tweets again.
+
+    Args:
+        conn: Local state connection
+        results: Results per listing from fetch_articles()
+        stats: store_articles() statistics (None when nothing was stored)
+        stored: Normalized tweets passed to store_articles() (None: every listing)
+    """
+    stored_urls = {a['url'] for a in stored} if stored is not None else None
+    advanced = []
+    for r in results:
+        if not r['since_id'] or r['error']:
+            continue
+        if (stats or {}).get('errors') and (stored_urls is None
+                                            or any(tweet_url(t) in stored_urls for t in r['tweets'])):
+            print(f"   ⚠️  Keeping the {r['key']} cursor: not all of its tweets were stored")
+            continue
+        advanced.append(r)
+
+    ensure_state_tables(conn)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO twitter_cursors (listing, since_id) VALUES (?, ?)",
+                         [(r['key'], r['since_id']) for r in advanced])
+        conn.executemany("INSERT OR REPLACE INTO twitter_gaps (listing, until_id, newest_id) VALUES (?, ?, ?)",
+                         [(r['key'], r['gap']['until_id'], r['gap']['newest_id']) for r in advanced if r['gap']])
+        conn.executemany("DELETE FROM twitter_gaps WHERE listing = ?",
+                         [(r['key'],) for r in advanced if not r['gap']])
+
+def load_user_ids(conn) -> dict:
+    """Return cached user ids by lowercase handle."""
+    ensure_state_tables(conn)
+    return {r[0]: r[1] for r in conn.execute("SELECT username, user_id FROM twitter_users")}
+
+def save_user_ids(conn, user_ids: dict):
+    """Cache resolved user ids."""
+    ensure_state_tables(conn)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO twitter_users (username, user_id) VALUES (?, ?)",
+                         list(user_ids.items()))
+
+def extract_fields(tweet) -> tuple:
+    """Extract the text fields used for competitor matching.
+
+    Account hints (official competitor accounts) are appended to the body.
+
+    Args:
+        tweet: Raw tweet with _username and _competitor_hints
+
+    Returns:
+        tuple: (title, summary, body) strings
+    """
+    return ('', tweet.get('text') or '', " ".join(tweet.get('_competitor_hints') or []))
+
+def detect_competitors(tweet) -> list:
+    """Detect which competitors are mentioned in the tweet.
+
+    Args:
+        tweet: Raw tweet
+
+    Returns:
+        list: List of competitor names found (capitalized)
+    """
+    return matched_competitors(extract_fields(tweet))
+
+def tweet_title(text: str) -> str:
+    """First line of a tweet, shortened to TITLE_LENGTH characters."""
+    line = " ".join((text or '').strip().split('\n', 1)[0].split())
+    return line if len(line) <= TITLE_LENGTH else line[:TITLE_LENGTH - 1].rstrip() + "…"
+
+def tweet_url(tweet) -> str:
+    """Return the stored URL of a raw tweet."""
+    return f"https://x.com/{tweet.get('_username') or 'i'}/status/{tweet['id']}"
+
+def normalize_article(tweet) -> dict:
+    """Transform a tweet to our standard schema.
+
+    Args:
+        tweet: Raw tweet (API v2 object with _username and _image_url)
+
+    Returns:
+        dict: Normalized article matching Supabase schema
+    """
+    username = tweet.get('_username') or 'i'
+    text = tweet.get('text') or ''
+
+    return {
+        "title": tweet_title(text),
+        "url": tweet_url(tweet),
+        "source": f"X @{username}",
+        "competitors": detect_competitors(tweet),
+        "published_at": parser.isoparse(tweet['created_at']).isoformat(),
+        "summary": text[:300] or None,
+        "author": tweet.get('_username'),
+        "image_url": tweet.get('_image_url')
+    }
+
+def log_scraper_run(supabase: Client, stats: dict, success: bool, error: str = None):
+    """Log scraper execution to scraper_runs table.
+
+    Args:
+        supabase: Supabase client
+        stats: Run statistics
+        success: Whether scraper completed successfully
+        error: Error message if failed
+    """
+    try:
+        supabase.table('scraper_runs').insert({
+            "scraper_name": SOURCE_NAME,
+            "started_at": RUN_STARTED_AT.isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "articles_found": stats.get('inserted', 0) + stats.get('updated', 0) + stats.get('skipped', 0),
+            "articles_added": stats.get('inserted', 0),
+            "status": "completed" if success else "failed",
+            "error_message": error
+        }).execute()
+    except Exception as e:
+        print(f"   ⚠️  Failed to log scraper run: {e}")
+
+def main():
+    """Main scraper execution."""
+
+    if os.getenv('ENABLE_TWITTER_SCRAPING', 'false').lower() != 'true':
+        print(f"ℹ️  Twitter scraping disabled (ENABLE_TWITTER_SCRAPING)")
+        return
+
+    accounts = get_accounts()
+    queries = env_list('TWITTER_QUERIES', DEFAULT_QUERIES)
+
+    print(f"\n{'='*60}")
+    print(f"🚀 {SOURCE_NAME} Scraper Started")
+    print(f"   Accounts: {len(accounts)}, searches: {len(queries)} (new tweets since last run)")
+    print(f"{'='*60}\n")
+
+    profiler = StageProfiler.from_argv(SOURCE_NAME)
+    state = open_state()
+
+    try:
+        # Initialize
+        print(f"🔌 Connecting to Supabase...")
+        with profiler.stage("connect"):
+            supabase = init_supabase()
+            session = create_session()
+        print(f"✅ Connected to Supabase and X\n")
+
+        # Fetch new tweets
+        limiter = RateWindows()
+        with profiler.stage("fetch"):
+            user_ids, resolved, lookups = lookup_users(session, limiter, list(accounts), load_user_ids(state))
+            save_user_ids(state, resolved)
+            listings = get_listings(accounts, user_ids, queries)
+            print(f"📡 Fetching new tweets from {len(listings)} listings ({lookups} user lookups)...\n")
+            raw_tweets, results = fetch_articles(session, load_cursors(state), listings, limiter, load_gaps(state))
+        print(f"\n✅ Found {len(raw_tweets)} unique new tweets\n")
+
+        if not raw_tweets:
+            print(f"ℹ️  No new tweets since the last run")
+            save_cursors(state, results)
+            log_scraper_run(supabase, {"inserted": 0, "skipped": 0, "errors": 0}, success=True)
+            return
+
+        # Normalize tweets
+        print(f"🔄 Normalizing tweets...")
+        with profiler.stage("normalize"):
+            normalized = [normalize_article(t) for t in raw_tweets]
+        print(f"✅ Normalized {len(normalized)} tweets\n")
+
+        # Score competitor relevance and drop low-scoring matches
+        print(f"🎯 Scoring competitor relevance...")
+        with profiler.stage("score"):
+            fields = [extract_fields(t) for t in raw_tweets]
+            scores = score_articles(fields, COMPETITORS)
+            relevant = apply_scores(normalized, scores, COMPETITORS)
+            relevant = apply_watchlists(normalized, fields, relevant)
+        print(f"✅ Found {len(relevant)} tweets above relevance threshold ({get_min_score()})\n")
+
+        # Keep every fetched tweet in the Parquet archive (if ARCHIVE_DIR is set)
+        with profiler.stage("archive"):
+            archive_articles(SOURCE_NAME, raw_tweets, normalized, scores, RUN_STARTED_AT)
+
+        # Store tweets, then advance cursors
+        stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+        if relevant:
+            # Cache thumbnails of new images (if THUMBNAIL_CACHE_DIR is set)
+            with profiler.stage("images"):
+                attach_thumbnails(supabase, relevant)
+
+            print(f"💾 Storing tweets in database...\n")
+            with profiler.stage("store"):
+                stats = store_articles(supabase, relevant)
+        save_cursors(state, results, stats, relevant)
+
+        # Log results
+        print(f"\n📝 Logging scraper run...")
+        with profiler.stage("log"):
+            log_scraper_run(supabase, stats, success=True)
+
+        # Summary
+        print(f"\n{'='*60}")
+        print(f"✅ {SOURCE_NAME} Scraper Complete")
+        print(f"{'='*60}")
+        print(f"   Tweets Fetched: {len(raw_tweets)}")
+        print(f"   API Requests: {lookups + sum(r['requests'] for r in results)}")
+        print(f"   Rate Window Waits: {limiter.waited:.0f}s")
+        print(f"   Competitor Mentions: {len(relevant)}")
+        print(f"   New Articles Stored: {stats['inserted']}")
+        print(f"   Updated Articles: {stats.get('updated', 0)}")
+        print(f"   Unchanged Skipped: {stats['skipped']}")
+        print(f"   Errors: {stats['errors']}")
+        print(f"\n")
+
+    except Exception as e:
+        print(f"\n❌ Scraper failed: {e}")
+        print(f"   Error type: {type(e).__name__}\n")
+
+        # Log failure
+        try:
+            supabase = init_supabase()
+            log_scraper_run(supabase, {}, success=False, error=str(e))
+        except:
+            pass
+
+        sys.exit(1)
+
+    finally:
+        state.close()
+        profiler.report()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local Full-Text Search Index
+Mirrors stored articles into a local SQLite FTS5 index so analysts can search
+what was collected ("tangem card" last month) without Supabase.
+
+- store_articles() upserts every stored batch in one transaction; rows whose
+  content hash is unchanged are skipped
+- prune_retention.py removes the articles it deletes from Supabase
+- Indexed: title, summary, extracted text, competitors, source, published_at
+- Document rowids are ordered newest first (reversed publication seconds
+  << 10 plus a URL hash), so date facets become rowid ranges that FTS5
+  applies inside the index, and "newest N matches" is a forward scan that
+  stops early
+- Ranking is BM25 with column weights matching relevance.FIELD_WEIGHTS, over
+  the newest RANK_WINDOW matches (narrow with --since/--until, or pass --all
+  to rank every match; cost grows with the number of matches ranked)
+- 3- and 4-character prefix queries (walle*, stak*) use FTS5 prefix indexes
+
+Query syntax is FTS5's: AND / OR / NOT (uppercase), "exact phrases",
+prefix*, NEAR(a b, 5).
+
+Usage:
+    python3 tools/search_index.py "tangem AND card" --since 2026-09-01
+    python3 tools/search_index.py '"hardware wallet" NOT ledger' --competitor Trezor --facets
+    python3 tools/search_index.py "seed phrase" --all    # Rank every match, not just the newest
+    python3 tools/search_index.py --rebuild      # Re-index all stored articles
+"""
+
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+
+from dateutil import parser
+
+from local_state import get_state_path
+
+# Column weights for bm25(): title, summary, body, competitors, source
+BM25_WEIGHTS = (3.0, 2.0, 1.0, 0.5, 0.5)
+DEFAULT_LIMIT = 20
+RANK_WINDOW = 2000  # Newest matches considered for BM25 ranking
+ROWID_SHIFT = 10  # Low bits of the rowid disambiguate articles published in the same second
+EPOCH_LIMIT = 1 << 40  # Rowids count down from here, so newer articles get smaller rowids
+PAGE_SIZE = 1000
+
+def get_index_path() -> str:
+    """Return the search index path (SEARCH_INDEX_DB or next to the state DB)."""
+    return os.getenv('SEARCH_INDEX_DB') or os.path.join(os.path.dirname(get_state_path()), 'search.db')
+
+def open_index(path: str = None) -> sqlite3.Connection:
+    """Open (and create if needed) the search index."""
+    path = path or get_index_path()
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS docs (
+            rowid INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT,
+            summary TEXT,
+            body TEXT,
+            competitors TEXT,
+            source TEXT,
+            published_at TEXT,
+            content_hash TEXT
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+            title, summary, body, competitors, source,
+            content='docs', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='3 4'
+        );
+        CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+            INSERT INTO docs_fts(rowid, title, summary, body, competitors, source)
+            VALUES (new.rowid, new.title, new.summary, new.body, new.competitors, new.source);
+        END;
+        CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+            INSERT INTO docs_fts(docs_fts, rowid, title, summary, body, competitors, source)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.body, old.competitors, old.source);
+        END;
+    """)
+    return conn
+
+def to_timestamp(value) -> int:
+    """Parse a date or ISO timestamp into UTC epoch seconds."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = parser.parse(value)
+    if not parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def doc_rowid(conn, url: str, published_at) -> int:
+    """Pick a free rowid ordered by publication time (newest first) for a new document."""
+    base = (EPOCH_LIMIT - to_timestamp(published_at)) << ROWID_SHIFT
+    slot = zlib.crc32(url.encode('utf-8')) & ((1 << ROWID_SHIFT) - 1)
+    for probe in range(1 << ROWID_SHIFT):
+        rowid = base + ((slot + probe) & ((1 << ROWID_SHIFT) - 1))
+        if conn.execute("SELECT 1 FROM docs WHERE rowid = ?", (rowid,)).fetchone() is None:
+            return rowid
+    raise ValueError(f"More than {1 << ROWID_SHIFT} articles published in the same second")
+
+def index_articles(conn, articles: list, texts: dict = None) -> int:
+    """Upsert a batch of stored articles into the index (one transaction).
+
+    Args:
+        conn: Search index connection
+        articles: Normalized articles (with content_hash when available)
+        texts: Optional url -> extracted article text
+
+    Returns:
+        int: Number of documents written
+    """
+    texts = texts or {}
+    urls = [a['url'] for a in articles]
+    existing = {}
+    for start in range(0, len(urls), 500):
+        chunk = urls[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(f"SELECT url, rowid, content_hash FROM docs WHERE url IN ({placeholders})", chunk):
+            existing[row['url']] = row
+
+    written = 0
+    with conn:
+        for article in articles:
+            url = article['url']
+            old = existing.get(url)
+            content_hash = article.get('content_hash')
+            if old is not None and content_hash and old['content_hash'] == content_hash:
+                continue
+
+            # Updates go through delete + insert so the FTS rows stay in sync
+            if old is not None:
+                conn.execute("DELETE FROM docs WHERE rowid = ?", (old['rowid'],))
+
+            published_at = article.get('published_at') or datetime.now(timezone.utc).isoformat()
+            conn.execute("""
+                INSERT INTO docs (rowid, url, title, summary, body, competitors, source, published_at, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                doc_rowid(conn, url, published_at), url,
+                article.get('title') or '', article.get('summary') or '', texts.get(url) or '',
+                " ".join(article.get('competitors') or []), article.get('source') or '',
+                published_at, content_hash,
+            ))
+            written += 1
+
+    return written
+
+def mirror_articles(articles: list, texts: dict = None):
+    """Index a stored batch in the default index (never raises)."""
+    if not articles:
+        return
+    try:
+        conn = open_index()
+        try:
+            index_articles(conn, articles, texts)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"   ⚠️  Failed to update search index: {e}")
+
+def remove_urls(conn, urls: list) -> int:
+    """Delete documents by URL (one transaction, FTS rows via the delete trigger).
+
+    Args:
+        conn: Search index connection
+        urls: Article URLs
+
+    Returns:
+        int: Number of documents removed
+    """
+    removed = 0
+    with conn:
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            removed += conn.execute(f"DELETE FROM docs WHERE url IN ({placeholders})", chunk).rowcount
+    return removed
+
+def unmirror_articles(urls: list):
+    """Remove deleted articles from the default index (never raises)."""
+    if not urls:
+        return
+    try:
+        conn = open_index()
+        try:
+            remove_urls(conn, urls)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"   ⚠️  Failed to update search index: {e}")
+
+def build_match(query: str, competitor: str = None) -> str:
+    """Combine the user query with a competitor facet (FTS5 column filter)."""
+    if competitor:
+        facet = 'competitors : "' + competitor.replace('"', '""') + '"'
+        return f"{facet} AND ({query})" if query else facet
+    return query
+
+def rowid_range(since=None, until=None) -> tuple:
+    """Translate a date range [since, until) into the matching rowid range."""
+    low = ((EPOCH_LIMIT - to_timestamp(until) + 1) << ROWID_SHIFT) if until else 0
+    high = ((EPOCH_LIMIT - to_timestamp(since) + 1) << ROWID_SHIFT) - 1 if since else (1 << 62)
+    return low, high
+
+def search(conn, query: str, competitor: str = None, since=None, until=None,
+           limit: int = DEFAULT_LIMIT, rank_window: int = RANK_WINDOW) -> list:
+    """Run a ranked search.
+
+    Args:
+        conn: Search index connection
+        query: FTS5 query (boolean operators, phrases, prefixes)
+        competitor: Only articles tagged with this competitor
+        since: Earliest publication date (inclusive)
+        until: Latest publication date (exclusive)
+        limit: Maximum number of results
+        rank_window: Rank only the newest N matches (None ranks all)
+
+    Returns:
+        list: Dicts (url, title, source, competitors, published_at, score, snippet),
+            best match first
+    """
+    low, high = rowid_range(since, until)
+    match = build_match(query, competitor)
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+
+    # Rank the newest matches (a forward rowid scan that stops at the
+    # window), then build snippets for the top rows only
+    window = f"ORDER BY rowid LIMIT {int(rank_window)}" if rank_window else ""
+    top = conn.execute(f"""
+        SELECT rowid, score FROM (
+            SELECT rowid, bm25(docs_fts, {weights}) AS score
+            FROM docs_fts
+            WHERE docs_fts MATCH ? AND rowid BETWEEN ? AND ?
+            {window}
+        )
+        ORDER BY score
+        LIMIT ?
+    """, (match, low, high, limit)).fetchall()
+    if not top:
+        return []
+
+    rowids = [row['rowid'] for row in top]
+    placeholders = ",".join("?" * len(rowids))
+    snippets = dict(conn.execute(f"""
+        SELECT rowid, snippet(docs_fts, -1, '[', ']', '…', 12)
+        FROM docs_fts
+        WHERE docs_fts MATCH ? AND rowid IN ({placeholders})
+    """, [match] + rowids).fetchall())
+    docs = {row['rowid']: row for row in conn.execute(f"""
+        SELECT rowid, url, title, source, competitors, published_at
+        FROM docs WHERE rowid IN ({placeholders})
+    """, rowids)}
+
+    return [
+        {**dict(docs[row['rowid']]), "score": row['score'], "snippet": snippets.get(row['rowid'], '')}
+        for row in top
+    ]
+
+def facets(conn, query: str, competitor: str = None, since=None, until=None) -> dict:
+    """Count matches per competitor and per month.
+
+    Returns:
+        dict: {"competitors": {name: count}, "months": {YYYY-MM: count}}
+    """
+    low, high = rowid_range(since, until)
+    counts = {"competitors": {}, "months": {}}
+    rows = conn.execute("""
+        SELECT d.competitors, substr(d.published_at, 1, 7) AS month
+        FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid
+        WHERE docs_fts MATCH ? AND docs_fts.rowid BETWEEN ? AND ?
+    """, (build_match(query, competitor), low, high))
+    for row in rows:
+        for name in (row['competitors'] or '').split():
+            counts['competitors'][name] = counts['competitors'].get(name, 0) + 1
+        counts['months'][row['month']] = counts['months'].get(row['month'], 0) + 1
+    return counts
+
+def rebuild(supabase, conn) -> int:
+    """Re-index every stored article from Supabase (keyset pagination on id)."""
+    total, last_id = 0, None
+    while True:
+        query = supabase.table('articles').select('id, url, title, summary, competitors, source, published_at, content_hash')
+        if last_id:
+            query = query.gt('id', last_id)
+        rows = query.order('id').limit(PAGE_SIZE).execute().data or []
+        if not rows:
+            return total
+        total += index_articles(conn, rows)
+        last_id = rows[-1]['id']
+        print(f"   Indexed {total} articles...")
+
+def parse_args(argv: list) -> dict:
+    """Parse CLI arguments: QUERY [--competitor X] [--since D] [--until D] [--limit N] [--facets] [--all]."""
+    args = {"query": None, "competitor": None, "since": None, "until": None,
+            "limit": DEFAULT_LIMIT, "facets": False, "rebuild": False, "all": False}
+    options = {"--competitor": "competitor", "--since": "since", "--until": "until", "--limit": "limit"}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in options:
+            if i + 1 >= len(argv):
+                raise ValueError(f"{arg} needs a value")
+            args[options[arg]] = argv[i + 1]
+            i += 2
+            continue
+        if arg == '--facets':
+            args['facets'] = True
+        elif arg == '--rebuild':
+            args['rebuild'] = True
+        elif arg == '--all':
+            args['all'] = True
+        elif args['query'] is None:
+            args['query'] = arg
+        else:
+            raise ValueError(f"Unexpected argument: {arg}")
+        i += 1
+    args['limit'] = int(args['limit'])
+    return args
+
+def main():
+    """Search the local index from the command line."""
+    try:
+        args = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        print(__doc__.split("Usage:")[1])
+        sys.exit(2)
+
+    conn = open_index()
+
+    if args['rebuild']:
+        from scrape_rss import init_supabase
+        print(f"🔄 Re-indexing stored articles into {get_index_path()}...")
+        total = rebuild(init_supabase(), conn)
+        print(f"✅ Indexed {total} articles")
+        return
+
+    if not args['query'] and not args['competitor']:
+        print(__doc__.split("Usage:")[1])
+        sys.exit(2)
+
+    started = time.perf_counter()
+    try:
+        results = search(conn, args['query'], args['competitor'], args['since'], args['until'],
+                         args['limit'], rank_window=None if args['all'] else RANK_WINDOW)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Invalid query: {e}")
+        sys.exit(2)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"\n🔎 {len(results)} results in {elapsed:.1f} ms\n")
+    for row in results:
+        print(f"   {row['published_at'][:10]}  {row['title'][:70]}")
+        print(f"   {'':10}  {row['source']} · {row['competitors'] or '-'} · {row['url']}")
+        print(f"   {'':10}  {row['snippet']}\n")
+
+    if args['facets']:
+        counts = facets(conn, args['query'], args['competitor'], args['since'], args['until'])
+        print("   Competitors: " + ", ".join(f"{k} ({v})" for k, v in sorted(counts['competitors'].items(), key=lambda kv: -kv[1])))
+        print("   Months:      " + ", ".join(f"{k} ({v})" for k, v in sorted(counts['months'].items())))
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Source Shard Coordinator
+Splits the source list across several worker processes or machines without
+double-fetching.
+
+- Workers register with a renewable lease; only workers with a live lease
+  take part in the hash ring
+- Sources map to workers by consistent hashing, so adding or losing a worker
+  only moves that worker's share
+- Before fetching, a worker claims (round, source) with a short lease; a
+  source completed in a round is never fetched again in that round, and the
+  claim of a dead worker expires so a live worker picks it up
+- While a source is processed, a background heartbeat keeps renewing both the
+  worker lease and the claim, so a slow source is not handed to a second
+  worker halfway through
+- A worker that finishes its share early takes unclaimed sources from the
+  tail of other shares, so uneven shards don't stretch the round
+- A source whose processing raises is logged and its claim released, so
+  another worker can retry it; the worker skips it for the rest of the round
+  and carries on with its other sources
+
+Backends: SQLiteLeaseBackend (local runs and tests) and SupabaseLeaseBackend
+(production, migration 007).
+"""
+
+import bisect
+import hashlib
+import os
+import sqlite3
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from local_state import get_state_path
+
+# Lease settings
+DEFAULT_LEASE_SECONDS = 60
+VIRTUAL_NODES = 64  # Ring points per worker
+MEMBERSHIP_CHECK_SECONDS = 2  # How often a busy worker re-reads the live worker list
+
+def hash_key(value: str) -> int:
+    """Stable 64-bit hash for ring placement."""
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+class HashRing:
+    """Consistent hash ring over worker IDs."""
+
+    def __init__(self, workers: list, virtual_nodes: int = VIRTUAL_NODES):
+        points = sorted(
+            (hash_key(f"{worker}#{i}"), worker)
+            for worker in workers
+            for i in range(virtual_nodes)
+        )
+        self._keys = [p[0] for p in points]
+        self._workers = [p[1] for p in points]
+
+    def owner(self, source_id: str):
+        """Return the worker responsible for a source (None if no workers)."""
+        if not self._keys:
+            return None
+        idx = bisect.bisect(self._keys, hash_key(source_id)) % len(self._keys)
+        return self._workers[idx]
+
+class SQLiteLeaseBackend:
+    """Lease store in a shared SQLite file (one machine, many processes)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(os.path.dirname(get_state_path()), 'leases.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS worker_leases (
+                    worker_id TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS source_leases (
+                    round TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    worker_id TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (round, source_id)
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    def renew_worker(self, worker_id: str, ttl: float):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO worker_leases VALUES (?, ?)", (worker_id, time.time() + ttl))
+
+    def release_worker(self, worker_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM worker_leases WHERE worker_id = ?", (worker_id,))
+
+    def live_workers(self) -> list:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT worker_id FROM worker_leases WHERE expires_at > ?", (time.time(),))
+            return sorted(r[0] for r in rows)
+
+    def claim_source(self, round_id: str, source_id: str, worker_id: str, ttl: float) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                INSERT INTO source_leases (round, source_id, worker_id, expires_at, completed)
+                VALUES (?, ?, ?, ?, 0)
+                ON CONFLICT(round, source_id) DO UPDATE
+                    SET worker_id = excluded.worker_id, expires_at = excluded.expires_at
+                    WHERE source_leases.completed = 0
+                      AND (source_leases.expires_at < ? OR source_leases.worker_id = excluded.worker_id)
+            """, (round_id, source_id, worker_id, now + ttl, now))
+            return cursor.rowcount == 1
+
+    def release_source(self, round_id: str, source_id: str, worker_id: str):
+        with self._connect() as conn:
+            conn.execute("""
+                DELETE FROM source_leases
+                WHERE round = ? AND source_id = ? AND worker_id = ? AND completed = 0
+            """, (round_id, source_id, worker_id))
+
+    def complete_source(self, round_id: str, source_id: str, worker_id: str):
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE source_leases SET completed = 1
+                WHERE round = ? AND source_id = ? AND worker_id = ?
+            """, (round_id, source_id, worker_id))
+
+    def completed_sources(self, round_id: str) -> set:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT source_id FROM source_leases WHERE round = ? AND completed = 1", (round_id,))
+            return {r[0] for r in rows}
+
+class SupabaseLeaseBackend:
+    """Lease store in Supabase (multiple machines). Uses server-side time."""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    def renew_worker(self, worker_id: str, ttl: float):
+        self.supabase.rpc('renew_worker_lease', {"p_worker_id": worker_id, "p_ttl_seconds": int(ttl)}).execute()
+
+    def release_worker(self, worker_id: str):
+        self.supabase.table('worker_leases').delete().eq('worker_id', worker_id).execute()
+
+    def live_workers(self) -> list:
+        result = self.supabase.rpc('live_workers', {}).execute()
+        return sorted(row['worker_id'] for row in result.data or [])
+
+    def claim_source(self, round_id: str, source_id: str, worker_id: str, ttl: float) -> bool:
+        result = self.supabase.rpc('claim_source', {
+            "p_round": round_id, "p_source_id": source_id,
+            "p_worker_id": worker_id, "p_ttl_seconds": int(ttl),
+        }).execute()
+        return bool(result.data)
+
+    def release_source(self, round_id: str, source_id: str, worker_id: str):
+        self.supabase.table('source_leases').delete() \
+            .eq('round', round_id).eq('source_id', source_id).eq('worker_id', worker_id) \
+            .eq('completed', False).execute()
+
+    def complete_source(self, round_id: str, source_id: str, worker_id: str):
+        self.supabase.table('source_leases').update({"completed": True}) \
+            .eq('round', round_id).eq('source_id', source_id).eq('worker_id', worker_id).execute()
+
+    def completed_sources(self, round_id: str) -> set:
+        result = self.supabase.table('source_leases').select('source_id') \
+            .eq('round', round_id).eq('completed', True).execute()
+        return {row['source_id'] for row in result.data or []}
+
+def current_round(interval_hours: float = None) -> str:
+    """Round ID shared by all workers of one scheduled run."""
+    if os.getenv('SHARD_ROUND'):
+        return os.getenv('SHARD_ROUND')
+    interval_hours = interval_hours or float(os.getenv('SCRAPER_INTERVAL_HOURS', 24))
+    return str(int(time.time() // (interval_hours * 3600)))
+
+class ShardCoordinator:
+    """One worker's view of the shared source assignment."""
+
+    def __init__(self, backend, worker_id: str = None, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.backend = backend
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self._last_renewal = 0.0
+
+    def heartbeat(self, force: bool = False):
+        """Renew this worker's lease (at most every third of the TTL)."""
+        now = time.monotonic()
+        if force or now - self._last_renewal >= self.lease_seconds / 3:
+            self.backend.renew_worker(self.worker_id, self.lease_seconds)
+            self._last_renewal = now
+
+    @contextmanager
+    def holding(self, round_id: str, source_id: str):
+        """Keep this worker's lease and its claim on a source alive while it is processed.
+
+        Renews both every third of the TTL from a background thread, so
+        process_fn may take longer than the lease.
+        """
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    self.backend.renew_worker(self.worker_id, self.lease_seconds)
+                    self._last_renewal = time.monotonic()
+                    # Re-claiming our own claim extends it
+                    if not self.backend.claim_source(round_id, source_id, self.worker_id, self.lease_seconds):
+                        print(f"   ⚠️  Lost the claim on {source_id} while processing it")
+                except Exception as e:
+                    print(f"   ⚠️  Could not renew leases for {source_id}: {e}")
+
+        thread = threading.Thread(target=renew, name=f"lease-{source_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def process(self, round_id: str, source_id: str, process_fn) -> bool:
+        """Run process_fn on a claimed source and mark it completed.
+
+        An exception from process_fn is logged and the claim released, so one
+        bad source doesn't stop the worker.
+
+        Returns:
+            bool: True if the source was processed
+        """
+        try:
+            with self.holding(round_id, source_id):
+                process_fn(source_id)
+        except Exception as e:
+            print(f"   ❌ {source_id} failed: {e} (released for another worker)")
+            try:
+                self.backend.release_source(round_id, source_id, self.worker_id)
+            except Exception as release_error:
+                print(f"   ⚠️  Could not release {source_id}, its claim will lapse: {release_error}")
+            return False
+
+        self.backend.complete_source(round_id, source_id, self.worker_id)
+        return True
+
+    def owned_sources(self, source_ids: list) -> list:
+        """Return the sources this worker owns on the current ring."""
+        self._members = self.backend.live_workers() or [self.worker_id]
+        self._members_checked = time.monotonic()
+        ring = HashRing(self._members)
+        return [s for s in source_ids if ring.owner(s) == self.worker_id]
+
+    def membership_changed(self) -> bool:
+        """Check (at most every MEMBERSHIP_CHECK_SECONDS) whether workers joined or left."""
+        if time.monotonic() - self._members_checked < MEMBERSHIP_CHECK_SECONDS:
+            return False
+        self._members_checked = time.monotonic()
+        return (self.backend.live_workers() or [self.worker_id]) != self._members
+
+    def run(self, source_ids: list, process_fn, round_id: str = None, settle_seconds: float = None) -> dict:
+        """Process this worker's share of sources for one round.
+
+        Args:
+            source_ids: All source IDs (identical list on every worker)
+            process_fn: Called with a source ID; does the fetch/store work
+            round_id: Round shared by all workers, defaults to current_round()
+            settle_seconds: Wait after finishing for sources of dead workers to
+                become claimable (defaults to twice the lease TTL)
+
+        Returns:
+            dict: Statistics (processed, lost_claims, rebalanced, failed)
+        """
+        round_id = round_id or current_round()
+        settle_seconds = 2 * self.lease_seconds if settle_seconds is None else settle_seconds
+        stats = {"processed": 0, "lost_claims": 0, "rebalanced": 0, "failed": 0}
+        failed = set()  # Sources that raised here; left to other workers this round
+        initial = None
+        idle_since = None
+
+        self.heartbeat(force=True)
+        try:
+            while True:
+                self.heartbeat()
+                done = self.backend.completed_sources(round_id)
+                remaining = [s for s in source_ids if s not in done and s not in failed]
+                if not remaining:
+                    break
+
+                owned = self.owned_sources(remaining)
+                if initial is None:
+                    initial = set(owned)
+
+                progressed = replan = False
+                for source_id in owned:
+                    self.heartbeat()
+
+                    # Re-plan when a worker joins or dies mid-round
+                    if self.membership_changed():
+                        replan = True
+                        break
+
+                    if not self.backend.claim_source(round_id, source_id, self.worker_id, self.lease_seconds):
+                        stats['lost_claims'] += 1
+                        continue
+
+                    progressed = True
+                    if not self.process(round_id, source_id, process_fn):
+                        failed.add(source_id)
+                        stats['failed'] += 1
+                        continue
+                    stats['processed'] += 1
+                    stats['rebalanced'] += 0 if source_id in initial else 1
+
+                # Own share done: take one unclaimed source from the tail of
+                # another worker's share (owners work from the head)
+                if not progressed and not replan:
+                    for source_id in reversed(remaining):
+                        if source_id in owned:
+                            continue
+                        if self.backend.claim_source(round_id, source_id, self.worker_id, self.lease_seconds):
+                            progressed = True
+                            if self.process(round_id, source_id, process_fn):
+                                stats['processed'] += 1
+                                stats['rebalanced'] += 1
+                            else:
+                                failed.add(source_id)
+                                stats['failed'] += 1
+                            break
+
+                if progressed or replan:
+                    idle_since = None
+                    continue
+
+                # Nothing claimable: wait for dead workers' leases to expire
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since > settle_seconds:
+                    break
+                time.sleep(min(1.0, self.lease_seconds / 4))
+        finally:
+            self.backend.release_worker(self.worker_id)
+
+        return stats
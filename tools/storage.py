@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Article Storage
+Shared Supabase storage path for all scrapers: batched duplicate checks,
+bulk inserts, and the write-time hooks (local URL cache, competitor rollup,
+mention time series, local search index, relevance corpus statistics).
+
+Articles already stored under the same URL are compared by content hash
+(normalized title, summary and author):
+- unchanged: hash matches the local cache, no request at all
+- changed:   PATCH the differing columns plus the tags from the fresh scoring;
+             if the matched competitors changed, the rollup and mention
+             series move from the old tags to the new ones
+- new:       bulk insert
+"""
+
+import hashlib
+import re
+from supabase import Client
+
+from local_state import open_state, known_hashes, remember_articles
+from rollup_stats import increment_stats
+from mention_timeseries import update_mentions
+from search_index import mirror_articles
+from relevance import add_documents
+
+# Articles checked and inserted per request
+BATCH_SIZE = 50
+
+# Columns covered by the content hash (and patched when they change)
+FINGERPRINT_FIELDS = ("title", "summary", "author")
+
+# Tag columns rewritten from the fresh scoring when an article changed
+TAG_FIELDS = ("competitors", "relevance_score", "relevance_scores", "watchlist_tags", "tag_version")
+
+# Stored columns needed to move an edited article's rollup counts
+ROLLUP_FIELDS = ("competitors", "source", "published_at")
+
+def normalize_text(value) -> str:
+    """Lowercase and collapse whitespace for fingerprinting."""
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+def content_fingerprint(article: dict) -> str:
+    """Hash the normalized title, summary and author of an article."""
+    payload = "\x1f".join(normalize_text(article.get(f)) for f in FINGERPRINT_FIELDS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def article_exists(supabase: Client, url: str) -> bool:
+    """Check if article already exists in database.
+
+    Args:
+        supabase: Supabase client
+        url: Article URL to check
+
+    Returns:
+        bool: True if article exists
+    """
+    return url in existing_urls(supabase, [url])
+
+def existing_urls(supabase: Client, urls: list) -> set:
+    """Return the subset of URLs already stored, in one request.
+
+    Args:
+        supabase: Supabase client
+        urls: Article URLs to check
+
+    Returns:
+        set: URLs present in the articles table
+    """
+    return set(stored_rows(supabase, urls))
+
+def stored_rows(supabase: Client, urls: list) -> dict:
+    """Fetch the fingerprinted columns of already stored articles.
+
+    Args:
+        supabase: Supabase client
+        urls: Article URLs to look up
+
+    Returns:
+        dict: url -> row (url, content_hash, FINGERPRINT_FIELDS and ROLLUP_FIELDS)
+    """
+    if not urls:
+        return {}
+
+    try:
+        columns = ", ".join(("url", "content_hash") + FINGERPRINT_FIELDS + ROLLUP_FIELDS)
+        result = supabase.table('articles').select(columns).in_('url', urls).execute()
+        return {row['url']: row for row in result.data or []}
+    except:
+        return {}
+
+def patch_changed(supabase: Client, article: dict, stored: dict, stats: dict, verbose: bool = True) -> bool:
+    """Update the columns of a stored article that changed, and its tags.
+
+    Args:
+        supabase: Supabase client
+        article: Freshly scraped normalized article
+        stored: Stored row from stored_rows()
+        stats: Statistics dict updated in place
+        verbose: Print a line for the update
+
+    Returns:
+        bool: True if the row was patched
+    """
+    changes = {f: article.get(f) for f in FINGERPRINT_FIELDS if article.get(f) != stored.get(f)}
+    changes['content_hash'] = article['content_hash']
+    # The edited text was scored afresh, so its tags replace the stored ones
+    changes.update({f: article[f] for f in TAG_FIELDS if f in article})
+
+    try:
+        supabase.table('articles').update(changes).eq('url', article['url']).execute()
+    except Exception as e:
+        print(f"   ❌ Error updating article: {e}")
+        stats['errors'] += 1
+        return False
+
+    stats['updated'] += 1
+    if verbose:
+        fields = ", ".join(f for f in changes if f in FINGERPRINT_FIELDS) or "hash only"
+        print(f"   ✏️  Updated: {article['title'][:50]}... ({fields})")
+    return True
+
+def insert_batch(supabase: Client, articles: list, stats: dict, verbose: bool = True) -> list:
+    """Insert a batch in one request, falling back to row-by-row on failure.
+
+    Args:
+        supabase: Supabase client
+        articles: New normalized articles
+        stats: Statistics dict updated in place
+        verbose: Print one line per stored article
+
+    Returns:
+        list: Articles that were inserted
+    """
+    try:
+        supabase.table('articles').insert(articles).execute()
+        inserted = articles
+    except Exception as e:
+        print(f"   ⚠️  Bulk insert failed ({e}), retrying one by one...")
+        inserted = []
+        for article in articles:
+            try:
+                supabase.table('articles').insert(article).execute()
+                inserted.append(article)
+            except Exception as e:
+                print(f"   ❌ Error storing article: {e}")
+                stats['errors'] += 1
+
+    stats['inserted'] += len(inserted)
+    if verbose:
+        for article in inserted:
+            print(f"   ✅ Stored: {article['title'][:50]}... (Competitors: {', '.join(article['competitors'])})")
+
+    return inserted
+
+def store_articles(supabase: Client, articles: list, verbose: bool = True, texts: dict = None) -> dict:
+    """Store articles in Supabase: insert new, patch changed, skip unchanged.
+
+    Args:
+        supabase: Supabase client
+        articles: List of normalized articles
+        verbose: Print one line per stored/updated/skipped article
+        texts: Optional url -> extracted article text for the search index
+
+    Returns:
+        dict: Statistics (inserted, updated, skipped, errors)
+    """
+    stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": 0}
+    cache = open_state()
+    inserted = []
+    stored_articles = []
+    retagged, untagged = [], []  # Edited articles with new competitors, and their old rows
+
+    # Collapse duplicate URLs within the batch itself
+    unique = {}
+    for article in articles:
+        if article['url'] in unique:
+            stats['skipped'] += 1
+        else:
+            article['content_hash'] = content_fingerprint(article)
+            unique[article['url']] = article
+    articles = list(unique.values())
+
+    try:
+        for start in range(0, len(articles), BATCH_SIZE):
+            batch = articles[start:start + BATCH_SIZE]
+            cached = known_hashes(cache, [a['url'] for a in batch])
+
+            # Unchanged per the local cache: free
+            pending = [a for a in batch if cached.get(a['url']) != a['content_hash']]
+            pending_urls = {a['url'] for a in pending}
+            for article in batch:
+                if article['url'] not in pending_urls:
+                    stats['skipped'] += 1
+                    stored_articles.append(article)
+                    if verbose:
+                        print(f"   ⏭  Unchanged: {article['title'][:50]}...")
+
+            if not pending:
+                continue
+
+            # One lookup for everything else
+            stored = stored_rows(supabase, [a['url'] for a in pending])
+            new, seen = [], []
+            for article in pending:
+                row = stored.get(article['url'])
+                if row is None:
+                    new.append(article)
+                elif row.get('content_hash') == article['content_hash']:
+                    stats['skipped'] += 1
+                    seen.append(article)
+                    if verbose:
+                        print(f"   ⏭  Unchanged: {article['title'][:50]}...")
+                elif patch_changed(supabase, article, row, stats, verbose):
+                    seen.append(article)
+                    if sorted(row.get('competitors') or []) != sorted(article['competitors']):
+                        # Counted under the stored row's day and source
+                        untagged.append(row)
+                        retagged.append({**article, "published_at": row.get('published_at'),
+                                         "source": row.get('source')})
+
+            remember_articles(cache, seen)
+            stored_articles.extend(seen)
+
+            if not new:
+                continue
+
+            # Insert new articles
+            batch_inserted = insert_batch(supabase, new, stats, verbose)
+            remember_articles(cache, batch_inserted)
+            inserted.extend(batch_inserted)
+            stored_articles.extend(batch_inserted)
+    finally:
+        cache.close()
+
+    # Update the competitor rollup for this batch in one call (plus one to
+    # take edited articles off their old competitors)
+    increment_stats(supabase, inserted + retagged)
+    if untagged:
+        increment_stats(supabase, untagged, sign=-1)
+
+    # Feed the hourly mention series and spike detector
+    update_mentions(inserted + retagged, removed=untagged)
+
+    # Only first-time articles count toward the relevance IDF
+    add_documents(inserted, texts)
+
+    # Mirror everything now stored into the local search index (unchanged
+    # documents are skipped there by content hash)
+    mirror_articles(stored_articles, texts)
+
+    return stats
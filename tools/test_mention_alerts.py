@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Mention Spike Alert Test Script
+Feeds a synthetic hourly history with one spike through the mention time
+series and checks that exactly one alert reaches a local webhook stand-in,
+that a spike made of late articles for an already processed hour is still
+alerted once, and that concurrent updates don't lose counts.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mention_timeseries import MentionSeries, update_mentions, REEVALUATE_HOURS
+
+class WebhookStandIn(BaseHTTPRequestHandler):
+    """Collects POSTed alert payloads."""
+
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        WebhookStandIn.received.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def add_batches(path: str, batches: list):
+    """Worker process: store several small batches one update at a time."""
+    for batch in batches:
+        update_mentions(batch, path=path, webhook_url="")
+
+def test_mention_alerts():
+    """Test spike detection and webhook delivery."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing Mention Spike Alerts")
+    print("="*60 + "\n")
+
+    server = HTTPServer(('127.0.0.1', 0), WebhookStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webhook_url = f"http://127.0.0.1:{server.server_port}/alerts"
+
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    spike_hour = now - timedelta(hours=3)
+
+    # 72 quiet hours (one Ledger mention every other hour), then a spike of 12
+    articles = []
+    for h in range(72, 0, -1):
+        hour = now - timedelta(hours=h)
+        if h % 2 == 0:
+            articles.append({"published_at": hour.isoformat(), "competitors": ["Ledger"]})
+    articles += [{"published_at": spike_hour.isoformat(), "competitors": ["Ledger", "Trezor"]}] * 12
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mentions.npz')
+        alerts = update_mentions(articles, path=path, webhook_url=webhook_url)
+
+        series = MentionSeries.load(path)
+        hour = int(spike_hour.timestamp() // 3600)
+        counts = series.window("Ledger", hour, hour + 1)
+
+        # A second update with no new data must not re-alert
+        repeat = update_mentions([], path=path, webhook_url=webhook_url)
+        received = list(WebhookStandIn.received)
+
+        # Late articles turn an already processed quiet hour into a spike
+        late_hour = now - timedelta(hours=5)
+        late = update_mentions([{"published_at": late_hour.isoformat(), "competitors": ["Ledger"]}] * 12,
+                               path=path, webhook_url=webhook_url)
+        late_repeat = update_mentions([{"published_at": late_hour.isoformat(), "competitors": ["Ledger"]}],
+                                      path=path, webhook_url=webhook_url)
+
+        # Late articles older than the kept detector history replay the series
+        old_hour = now - timedelta(hours=REEVALUATE_HOURS + 5)
+        replayed = update_mentions([{"published_at": old_hour.isoformat(), "competitors": ["Ledger"]}],
+                                   path=path, webhook_url=webhook_url)
+        series = MentionSeries.load(path)
+        replay_ok = series.last_processed == int(now.timestamp() // 3600) - 1 and series.processed_from == series.start_hour
+
+        # Concurrent writers (shard workers, WebSub thread) must not lose counts
+        concurrent_path = os.path.join(tmp, 'concurrent.npz')
+        batch = [{"published_at": spike_hour.isoformat(), "competitors": ["Tangem"]}]
+        procs = [multiprocessing.Process(target=add_batches, args=(concurrent_path, [batch] * 10)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        concurrent = MentionSeries.load(concurrent_path).window("Tangem", hour, hour + 1)
+
+    server.shutdown()
+
+    alerted = sorted(a['competitor'] for a in received)
+    checks = [
+        ("Spike hour counted", int(counts[0]) == 12),
+        ("Ledger and Trezor spikes alerted once each", alerted == ["Ledger", "Trezor"]),
+        ("Alert payload delivered", len(received) == len(alerts)),
+        ("No repeat alerts", repeat == []),
+        ("Late spike for a processed hour alerted", [(a['competitor'], a['count']) for a in late] == [("Ledger", 12)]
+                                                     and len(WebhookStandIn.received) == len(received) + 1),
+        ("Late spike not alerted again", late_repeat == []),
+        ("Old late article replays without re-alerting", replayed == [] and replay_ok),
+        ("Concurrent updates keep every count", int(concurrent[0]) == 40),
+    ]
+
+    failed = 0
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+        failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ Mention spike alerts working\n")
+
+if __name__ == "__main__":
+    test_mention_alerts()
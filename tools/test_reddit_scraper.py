@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Reddit Scraper Test Script
+Runs the Reddit listing fetcher against a local fake of Reddit's OAuth and
+listing endpoints and checks cursor-based incremental fetching, paging,
+deleted-anchor fallback, cursor persistence (kept on store failures) and
+request spacing.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scrape_reddit
+from local_state import open_state
+
+class FakeReddit(BaseHTTPRequestHandler):
+    """Serves /api/v1/access_token, /api/info, /r/<sub>/new and /search from in-memory posts."""
+
+    posts = {}          # listing path -> posts, newest first
+    request_times = []
+    token_requests = 0
+    clock = time.time() - 3600  # created_utc of the next post (one second apart)
+    lock = threading.Lock()
+
+    @classmethod
+    def add_posts(cls, path: str, count: int, label: str):
+        with cls.lock:
+            existing = cls.posts.setdefault(path, [])
+            start = int(cls.clock)
+            new = [{
+                "name": f"t3_{label}{start + i}",
+                "title": f"Ledger post {label}{start + i}",
+                "selftext": "",
+                "permalink": f"/r/test/comments/{label}{start + i}/",
+                "subreddit": "test",
+                "author": "someone",
+                "created_utc": cls.clock + i,
+            } for i in range(count)]
+            cls.clock += count
+            cls.posts[path] = list(reversed(new)) + existing
+
+    def send_json(self, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-Ratelimit-Remaining', '99')
+        self.send_header('X-Ratelimit-Reset', '60')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        FakeReddit.token_requests += 1
+        self.send_json({"access_token": "fake-token", "token_type": "bearer"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with FakeReddit.lock:
+            FakeReddit.request_times.append(time.monotonic())
+            posts = list(FakeReddit.posts.get(url.path, []))
+            every_post = {p['name']: p for listing in FakeReddit.posts.values() for p in listing}
+
+        if url.path == '/api/info':
+            found = [every_post[name] for name in params.get('id', '').split(',') if name in every_post]
+            self.send_json({"kind": "Listing", "data": {
+                "children": [{"kind": "t3", "data": p} for p in found], "before": None, "after": None,
+            }})
+            return
+
+        limit = int(params.get('limit', 25))
+        before = params.get('before')
+        if before:
+            names = [p['name'] for p in posts]
+            idx = names.index(before) if before in names else 0
+            newer = posts[:idx]
+            page = newer[-limit:]
+            more = len(newer) > limit
+        else:
+            page = posts[:limit]
+            more = False
+
+        self.send_json({"kind": "Listing", "data": {
+            "children": [{"kind": "t3", "data": p} for p in page],
+            "before": page[0]['name'] if page and more else None,
+            "after": page[-1]['name'] if page else None,
+        }})
+
+    def log_message(self, format, *args):
+        pass
+
+def test_reddit_scraper():
+    """Test incremental listing fetches against the fake."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing Reddit Scraper")
+    print("="*60 + "\n")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeReddit)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    os.environ.update({
+        'REDDIT_AUTH_URL': f"{base}/api/v1/access_token",
+        'REDDIT_API_URL': base,
+        'REDDIT_CLIENT_ID': 'id',
+        'REDDIT_CLIENT_SECRET': 'secret',
+    })
+
+    listings = [
+        ("r/wallets", "/r/wallets/new", {}),
+        ("search:ledger", "/search", {"q": "ledger", "sort": "new", "type": "link"}),
+    ]
+    FakeReddit.add_posts("/r/wallets/new", 250, "w")
+    FakeReddit.add_posts("/search", 30, "s")
+
+    interval = 0.02
+    limiter = scrape_reddit.RateLimiter(60 / interval)
+    session = scrape_reddit.create_session()
+    checks = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_state(os.path.join(tmp, 'state.db'))
+
+        # Run 1: no cursors, newest page of each listing
+        posts, results = scrape_reddit.fetch_articles(session, scrape_reddit.load_cursors(conn), listings, limiter)
+        scrape_reddit.save_cursors(conn, results)
+        checks.append(("First run takes the newest page", len(posts) == 100 + 30))
+
+        # Run 2: 230 new posts in one listing -> three 100-item pages
+        FakeReddit.add_posts("/r/wallets/new", 230, "w")
+        FakeReddit.request_times.clear()
+        posts, results = scrape_reddit.fetch_articles(session, scrape_reddit.load_cursors(conn), listings, limiter)
+        scrape_reddit.save_cursors(conn, results)
+        wallet = next(r for r in results if r['key'] == "r/wallets")
+        checks.append(("Second run fetches only the 230 new posts", len(posts) == 230))
+        checks.append(("New posts fetched in 100-item pages", wallet['requests'] == 3))
+
+        gaps = [b - a for a, b in zip(FakeReddit.request_times, FakeReddit.request_times[1:])]
+        checks.append(("Requests spaced by the rate limiter", min(gaps) >= interval * 0.8))
+
+        # Run 3: nothing new
+        posts, results = scrape_reddit.fetch_articles(session, scrape_reddit.load_cursors(conn), listings, limiter)
+        scrape_reddit.save_cursors(conn, results)
+        wallet = next(r for r in results if r['key'] == "r/wallets")
+        checks.append(("Third run finds nothing new", posts == []))
+        checks.append(("Quiet listing checks the anchor instead of refetching", wallet['requests'] == 2))
+
+        # Run 4: the cursor post is deleted, then 5 new posts arrive
+        cursor = scrape_reddit.load_cursors(conn)["r/wallets"]
+        FakeReddit.posts["/r/wallets/new"] = [p for p in FakeReddit.posts["/r/wallets/new"] if p['name'] != cursor['fullname']]
+        FakeReddit.add_posts("/r/wallets/new", 5, "w")
+        posts, results = scrape_reddit.fetch_articles(session, scrape_reddit.load_cursors(conn), listings, limiter)
+        scrape_reddit.save_cursors(conn, results)
+        wallet = next(r for r in results if r['key'] == "r/wallets")
+        checks.append(("Deleted cursor post falls back to time filter", len(posts) == 5 and wallet['requests'] == 3))
+
+        stored = scrape_reddit.load_cursors(conn)
+        newest = FakeReddit.posts["/r/wallets/new"][0]['name']
+        checks.append(("Cursor persisted as newest fullname", stored["r/wallets"]['fullname'] == newest))
+
+        # Run 5: storing the r/wallets posts fails -> only that cursor stays
+        FakeReddit.add_posts("/r/wallets/new", 3, "w")
+        FakeReddit.add_posts("/search", 2, "s")
+        posts, results = scrape_reddit.fetch_articles(session, scrape_reddit.load_cursors(conn), listings, limiter)
+        failed_posts = [scrape_reddit.normalize_article(p) for p in posts if p['name'].startswith("t3_w")]
+        scrape_reddit.save_cursors(conn, results, {"inserted": 0, "errors": 1}, failed_posts)
+        after = scrape_reddit.load_cursors(conn)
+        checks.append(("Store failure leaves the listing cursor where it was",
+                       after["r/wallets"] == stored["r/wallets"]
+                       and after["search:ledger"]['fullname'] == FakeReddit.posts["/search"][0]['name']))
+
+        posts, results = scrape_reddit.fetch_articles(session, after, listings, limiter)
+        checks.append(("Posts that failed to store are fetched again", len(posts) == 3))
+        conn.close()
+
+    normalized = scrape_reddit.normalize_article(FakeReddit.posts["/search"][0])
+    checks.append(("Posts normalize with competitor match", normalized['competitors'] == ["Ledger"]))
+    checks.append(("One OAuth token per run", FakeReddit.token_requests == 1))
+
+    server.shutdown()
+
+    failed = 0
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+        failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ Reddit scraper working\n")
+
+if __name__ == "__main__":
+    test_reddit_scraper()
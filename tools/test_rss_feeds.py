@@ -9,6 +9,8 @@ import feedparser
 from datetime import datetime, timezone
 import requests
 
+from feed_catalog import open_catalog, list_feeds
+
 def test_rss_feeds():
     """Test RSS feeds from crypto wallet company blogs."""
 
@@ -16,14 +18,10 @@ def test_rss_feeds():
     print("🧪 Testing Company Blog RSS Feeds")
     print("="*60 + "\n")
 
-    # RSS feed URLs to test
-    feeds = {
-        "Trezor Blog": "https://blog.trezor.io/feed",
-        "Ledger Blog": "https://www.ledger.com/blog/feed",
-        "Tangem Blog": "https://tangem.com/en/blog/rss.xml",
-        "Coinbase Blog": "https://blog.coinbase.com/feed",
-        "Consensys Blog (Metamask)": "https://consensys.io/blog/feed"
-    }
+    # Every feed in the catalog, including disabled candidates
+    catalog = open_catalog()
+    feeds = {feed['name']: feed['url'] for feed in list_feeds(catalog)}
+    catalog.close()
 
     working_feeds = []
     failed_feeds = []
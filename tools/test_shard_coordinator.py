@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shard Coordinator Test Script
+Runs several local worker processes against a SQLite lease backend and checks
+that every source is processed exactly once, that a dead worker's sources are
+taken over, that sources taking longer than the lease are not handed to a
+second worker, that a source whose processing raises doesn't stop its
+worker, and how throughput scales with the number of workers.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shard_coordinator import ShardCoordinator, SQLiteLeaseBackend
+
+SOURCES = [f"feed-{i:03d}" for i in range(60)]
+WORK_SECONDS = 0.05   # Simulated fetch time per source
+LEASE_SECONDS = 1.0
+SLOW_SECONDS = 2.5 * LEASE_SECONDS  # Processing time of the "slow" sources
+
+def worker(db_path: str, log_path: str, round_id: str, start_at: float, die_after: int = None,
+           slow: tuple = (), failing: tuple = ()):
+    """Worker process: processes its shard and appends source IDs to a log."""
+    coordinator = ShardCoordinator(SQLiteLeaseBackend(db_path), lease_seconds=LEASE_SECONDS)
+    coordinator.heartbeat(force=True)
+    time.sleep(max(0.0, start_at - time.time()))
+
+    processed = []
+
+    def process(source_id):
+        if die_after is not None and len(processed) >= die_after:
+            os._exit(1)  # Simulated crash while holding a claim
+        time.sleep(SLOW_SECONDS if source_id in slow else WORK_SECONDS)
+        if source_id in failing:
+            raise RuntimeError("simulated storage error")
+        processed.append(source_id)
+        with open(log_path, 'a') as f:
+            f.write(source_id + "\n")
+
+    coordinator.run(SOURCES, process, round_id=round_id, settle_seconds=3 * LEASE_SECONDS)
+
+def run_workers(count: int, die_after: int = None, slow: tuple = (), failing: tuple = ()) -> tuple:
+    """Run `count` workers (the first one optionally crashing) and return (log lines, seconds, exit codes)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'leases.db')
+        log_path = os.path.join(tmp, 'processed.log')
+        SQLiteLeaseBackend(db_path)
+        open(log_path, 'w').close()
+
+        start_at = time.time() + 0.5
+        procs = [
+            multiprocessing.Process(target=worker, args=(db_path, log_path, "test", start_at,
+                                                         die_after if i == 0 else None, slow, failing))
+            for i in range(count)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        elapsed = time.time() - start_at
+        with open(log_path) as f:
+            return [line.strip() for line in f if line.strip()], elapsed, [p.exitcode for p in procs]
+
+def test_shard_coordinator():
+    """Test exactly-once processing, failover and scaling."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing Shard Coordinator")
+    print("="*60 + "\n")
+
+    failed = 0
+    timings = {}
+
+    for count in (1, 2, 4):
+        lines, elapsed, _ = run_workers(count)
+        ok = sorted(lines) == sorted(SOURCES)
+        timings[count] = elapsed
+        print(f"{'✅' if ok else '❌'} {count} worker(s): {len(lines)} sources processed, "
+              f"{len(set(lines))} unique, {elapsed:.2f}s")
+        failed += 0 if ok else 1
+
+    for count in (2, 4):
+        print(f"   Speedup with {count} workers: {timings[1] / timings[count]:.2f}x")
+
+    lines, elapsed, _ = run_workers(3, die_after=3)
+    ok = sorted(lines) == sorted(SOURCES)
+    print(f"{'✅' if ok else '❌'} Failover: one of 3 workers crashed, "
+          f"{len(set(lines))}/{len(SOURCES)} sources completed exactly once in {elapsed:.2f}s")
+    failed += 0 if ok else 1
+
+    slow = tuple(SOURCES[::15])
+    lines, elapsed, _ = run_workers(3, slow=slow)
+    ok = sorted(lines) == sorted(SOURCES)
+    print(f"{'✅' if ok else '❌'} Slow sources: {len(slow)} took {SLOW_SECONDS / LEASE_SECONDS:.1f}x the lease, "
+          f"{len(lines)} processed, {len(set(lines))} unique in {elapsed:.2f}s")
+    failed += 0 if ok else 1
+
+    failing = tuple(SOURCES[3::20])
+    lines, elapsed, exit_codes = run_workers(2, failing=failing)
+    ok = sorted(lines) == sorted(s for s in SOURCES if s not in failing) and exit_codes == [0, 0]
+    print(f"{'✅' if ok else '❌'} Failing sources: {len(failing)} raised, workers exited with {exit_codes}, "
+          f"{len(set(lines))}/{len(SOURCES) - len(failing)} other sources completed in {elapsed:.2f}s")
+    failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ Shard coordinator working\n")
+
+if __name__ == "__main__":
+    test_shard_coordinator()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Cache Test Script
+Runs the thumbnail stage against images served by a local HTTP server and
+checks the size cap, non-image rejection, URL and content dedup, recorded
+dimensions, the failed-URL retry window and LRU eviction under a budget.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+import thumbnail_cache
+from thumbnail_cache import ThumbnailCache, thumbnail_path, RETRY_FAILED_HOURS
+from local_state import open_state
+
+def make_jpeg(width: int, height: int, color: tuple) -> bytes:
+    out = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(out, 'JPEG', quality=90)
+    return out.getvalue()
+
+class FakeImages(BaseHTTPRequestHandler):
+    """Serves /<name> from `files` as (content type, body)."""
+
+    files = {}
+    requests = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests[self.path] = self.requests.get(self.path, 0) + 1
+        if self.path not in self.files:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content_type, body = self.files[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # Client gave up on an oversized image
+
+    def log_message(self, *args):
+        pass
+
+def test_thumbnail_cache():
+    """Check the thumbnail cache end to end."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing Thumbnail Cache")
+    print("="*60 + "\n")
+
+    big = make_jpeg(1600, 1200, (200, 40, 40))
+    FakeImages.files = {
+        "/big.jpg": ("image/jpeg", big),
+        "/big-copy.jpg": ("image/jpeg", big),
+        "/wide.jpg": ("image/jpeg", make_jpeg(2000, 500, (40, 200, 40))),
+        "/small.jpg": ("image/jpeg", make_jpeg(120, 80, (40, 40, 200))),
+        "/page.html": ("text/html; charset=utf-8", b"<html>not an image</html>"),
+        "/huge.jpg": ("image/jpeg", b"\xff" * (thumbnail_cache.MAX_IMAGE_BYTES + 1)),
+        "/broken.jpg": ("image/jpeg", b"definitely not a jpeg"),
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeImages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    checks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_state(os.path.join(tmp, "state.db"))
+        cache = ThumbnailCache(os.path.join(tmp, "thumbs"), conn=conn, budget=10 * 1024 * 1024,
+                               base_url="https://img.example.com/", workers=4)
+
+        def article(name: str, url: str = None) -> dict:
+            return {"url": f"https://news.example.com/{url or name}", "image_url": f"{base}/{name}"}
+
+        articles = [article("big.jpg"), article("big.jpg", "other"), article("big-copy.jpg"),
+                    article("wide.jpg"), article("small.jpg"), article("page.html"),
+                    article("huge.jpg"), article("broken.jpg"), article("missing.jpg"),
+                    {"url": "https://news.example.com/no-image", "image_url": None}]
+        stats = cache.attach(articles, now=1000.0)
+
+        checks.append(("Distinct image URLs fetched once each",
+                       stats["images"] == 8 and FakeImages.requests.get("/big.jpg") == 1))
+        checks.append(("Good images cached, bad ones failed", stats["fetched"] == 4 and stats["failed"] == 4))
+
+        big_row, shared, copy = articles[0], articles[1], articles[2]
+        checks.append(("Thumbnail fits the box and keeps the aspect ratio",
+                       (big_row["thumbnail_width"], big_row["thumbnail_height"]) == (480, 360)))
+        checks.append(("Original dimensions recorded",
+                       (big_row["image_width"], big_row["image_height"]) == (1600, 1200)))
+        checks.append(("Wide image limited by width",
+                       (articles[3]["thumbnail_width"], articles[3]["thumbnail_height"]) == (640, 160)))
+        checks.append(("Small image not enlarged",
+                       (articles[4]["thumbnail_width"], articles[4]["thumbnail_height"]) == (120, 80)))
+        checks.append(("Same bytes behind two URLs share one thumbnail",
+                       big_row["thumbnail_url"] == shared["thumbnail_url"] == copy["thumbnail_url"]
+                       and conn.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0] == 3))
+        digest = big_row["thumbnail_url"].rsplit("/", 1)[1][:-5]
+        checks.append(("Thumbnail URL under the base URL, content addressed",
+                       big_row["thumbnail_url"] == f"https://img.example.com/{digest[:2]}/{digest}.webp"
+                       and os.path.exists(thumbnail_path(cache.cache_dir, digest))))
+        checks.append(("Failed images keep image_url only",
+                       all("thumbnail_url" not in a for a in articles[5:])
+                       and articles[5]["image_url"].endswith("/page.html")))
+        errors = dict(conn.execute("SELECT image_url, error FROM thumbnail_sources WHERE error IS NOT NULL"))
+        checks.append(("Non-image and oversized responses rejected",
+                       "not an image" in errors[f"{base}/page.html"] and "too large" in errors[f"{base}/huge.jpg"]))
+
+        FakeImages.requests.clear()
+        again = [article("big.jpg"), article("broken.jpg")]
+        stats = cache.attach(again, now=2000.0)
+        checks.append(("Second run served from the cache", stats["cached"] == 1 and stats["fetched"] == 0
+                       and again[0]["thumbnail_url"] == big_row["thumbnail_url"]))
+        checks.append(("Failed URL not retried inside the window", not FakeImages.requests))
+
+        FakeImages.files["/broken.jpg"] = ("image/jpeg", make_jpeg(300, 300, (9, 9, 9)))
+        late = 1000.0 + RETRY_FAILED_HOURS * 3600 + 1
+        retried = [article("broken.jpg")]
+        stats = cache.attach(retried, now=late)
+        checks.append(("Failed URL retried after the window",
+                       stats["fetched"] == 1 and retried[0].get("thumbnail_width") == 300))
+
+        # Budget for about two thumbnails: the least recently used go first
+        sizes = dict(conn.execute("SELECT digest, bytes FROM thumbnails"))
+        recent = {a["thumbnail_url"].rsplit("/", 1)[1][:-5] for a in again[:1] + retried}
+        cache.budget = sum(sizes[d] for d in recent)
+        evicted = cache.evict()
+        remaining = {row[0] for row in conn.execute("SELECT digest FROM thumbnails")}
+        checks.append(("LRU eviction keeps the recently used thumbnails",
+                       evicted == 2 and remaining == recent and cache.size() <= cache.budget))
+        checks.append(("Evicted files and URL mappings removed",
+                       not os.path.exists(thumbnail_path(cache.cache_dir, articles[3]["thumbnail_url"].rsplit("/", 1)[1][:-5]))
+                       and conn.execute("SELECT COUNT(*) FROM thumbnail_sources WHERE image_url = ?",
+                                        (f"{base}/wide.jpg",)).fetchone()[0] == 0))
+
+        FakeImages.requests.clear()
+        refetched = [article("wide.jpg")]
+        cache.budget = 10 * 1024 * 1024
+        stats = cache.attach(refetched, now=late + 1)
+        checks.append(("Evicted image fetched again when it comes back",
+                       stats["fetched"] == 1 and FakeImages.requests.get("/wide.jpg") == 1
+                       and refetched[0]["thumbnail_url"] == articles[3]["thumbnail_url"]))
+        conn.close()
+
+        os.environ.pop("THUMBNAIL_CACHE_DIR", None)
+        checks.append(("Stage is a no-op without THUMBNAIL_CACHE_DIR",
+                       thumbnail_cache.attach_thumbnails(None, [article("big.jpg")]) is None))
+
+    server.shutdown()
+
+    failed = 0
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+        failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ Thumbnail cache working\n")
+
+if __name__ == "__main__":
+    test_thumbnail_cache()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Twitter Scraper Test Script
+Runs the Twitter/X fetcher against a local fake of the API v2 user lookup,
+user timeline and recent search endpoints and checks batched user lookups,
+since_id incremental fetching, paging (and resuming past the page cap),
+stale-cursor fallback, cursor persistence (kept on store failures) and
+per-endpoint rate windows.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scrape_twitter
+from local_state import open_state
+
+class FakeX(BaseHTTPRequestHandler):
+    """Serves /2/users/by, /2/users/<id>/tweets and /2/tweets/search/recent."""
+
+    users = {"ledger": "101", "trezor": "102"}
+    tweets = {}         # listing path -> tweets, newest first
+    next_id = 1_800_000_000_000_000_000
+    oldest_search_id = 0  # since_id below this is rejected (7-day limit)
+    limits = {"users/by": (100, 60), "users/tweets": (100, 60), "tweets/search/recent": (100, 60)}
+    windows = {}        # endpoint -> [reset, used]
+    requests = {}       # endpoint -> count
+    throttled = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def add_tweets(cls, path: str, count: int, text: str, author: str):
+        with cls.lock:
+            now = datetime.now(timezone.utc)
+            new = []
+            for i in range(count):
+                cls.next_id += 1
+                new.append({
+                    "id": str(cls.next_id),
+                    "text": f"{text} {cls.next_id}\nMore details",
+                    "author_id": cls.users.get(author, "999"),
+                    "created_at": (now - timedelta(seconds=count - i)).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                    "attachments": {"media_keys": [f"m{cls.next_id}"]},
+                })
+            cls.tweets[path] = list(reversed(new)) + cls.tweets.get(path, [])
+
+    def send_json(self, payload: dict, status: int = 200, headers: dict = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def rate_window(self, endpoint: str) -> tuple:
+        """Count the request in its window; returns (allowed, headers)."""
+        limit, seconds = FakeX.limits[endpoint]
+        with FakeX.lock:
+            now = time.time()
+            window = FakeX.windows.get(endpoint)
+            if window is None or now >= window[0]:
+                window = FakeX.windows[endpoint] = [now + seconds, 0]
+            window[1] += 1
+            allowed = window[1] <= limit
+            FakeX.requests[endpoint] = FakeX.requests.get(endpoint, 0) + 1
+            if not allowed:
+                FakeX.throttled += 1
+        return allowed, {"x-rate-limit-limit": str(limit),
+                         "x-rate-limit-remaining": str(max(0, limit - window[1])),
+                         "x-rate-limit-reset": f"{window[0]:.3f}"}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/2/users/by":
+            endpoint = "users/by"
+        elif url.path.startswith("/2/users/"):
+            endpoint = "users/tweets"
+        else:
+            endpoint = "tweets/search/recent"
+
+        allowed, headers = self.rate_window(endpoint)
+        if not allowed:
+            self.send_json({"title": "Too Many Requests"}, 429, headers)
+            return
+
+        if endpoint == "users/by":
+            names = params['usernames'].split(',')
+            self.send_json({
+                "data": [{"id": FakeX.users[n.lower()], "username": n} for n in names if n.lower() in FakeX.users],
+                "errors": [{"value": n, "detail": "Could not find user"} for n in names if n.lower() not in FakeX.users],
+            }, headers=headers)
+            return
+
+        since_id = params.get('since_id')
+        if endpoint == "tweets/search/recent" and since_id and int(since_id) < FakeX.oldest_search_id:
+            self.send_json({"title": "Invalid Request", "detail": "since_id too old"}, 400, headers)
+            return
+
+        with FakeX.lock:
+            tweets = list(FakeX.tweets.get(url.path, []))
+        if since_id:
+            tweets = [t for t in tweets if int(t['id']) > int(since_id)]
+        if params.get('until_id'):
+            tweets = [t for t in tweets if int(t['id']) < int(params['until_id'])]
+        if params.get('start_time'):
+            start = params['start_time'].replace('Z', '+00:00')
+            tweets = [t for t in tweets if t['created_at'].replace('Z', '+00:00')[:19] >= start[:19]]
+
+        limit = int(params.get('max_results', 10))
+        offset = int(params.get('pagination_token') or params.get('next_token') or 0)
+        page = tweets[offset:offset + limit]
+        names = {v: k.capitalize() for k, v in FakeX.users.items()}
+        meta = {"result_count": len(page)}
+        if offset + limit < len(tweets):
+            meta['next_token'] = str(offset + limit)
+
+        self.send_json({
+            "data": page,
+            "includes": {
+                "users": [{"id": t['author_id'], "username": names.get(t['author_id'], "someone")} for t in page],
+                "media": [{"media_key": f"m{t['id']}", "type": "photo", "url": f"https://pbs.example.com/{t['id']}.jpg"} for t in page],
+            },
+            "meta": meta,
+        }, headers=headers)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_twitter_scraper():
+    """Test incremental timeline and search fetches against the fake."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing Twitter Scraper")
+    print("="*60 + "\n")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeX)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.update({
+        'TWITTER_API_URL': f"http://127.0.0.1:{server.server_port}",
+        'TWITTER_BEARER_TOKEN': 'token',
+    })
+
+    accounts = {"Ledger": "ledger", "Trezor": "trezor", "GhostAccount": None}
+    queries = ["tangem"]
+    FakeX.add_tweets("/2/users/101/tweets", 150, "Ledger Live update", "ledger")
+    FakeX.add_tweets("/2/users/102/tweets", 10, "Firmware release", "trezor")
+    FakeX.add_tweets("/2/tweets/search/recent", 20, "Tangem card review", "someone")
+
+    session = scrape_twitter.create_session()
+    limiter = scrape_twitter.RateWindows()
+    checks = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_state(os.path.join(tmp, 'state.db'))
+
+        # Run 1: user lookup in one batch, newest page of each listing
+        user_ids, resolved, lookups = scrape_twitter.lookup_users(session, limiter, list(accounts),
+                                                                  scrape_twitter.load_user_ids(conn))
+        scrape_twitter.save_user_ids(conn, resolved)
+        checks.append(("Three handles resolved in one lookup", lookups == 1 and len(user_ids) == 2))
+        listings = scrape_twitter.get_listings(accounts, user_ids, queries)
+        checks.append(("Unknown account skipped", [l['key'] for l in listings] == ["@ledger", "@trezor", "search:tangem"]))
+
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings, limiter)
+        scrape_twitter.save_cursors(conn, results)
+        checks.append(("First run takes the newest page", len(tweets) == 100 + 10 + 20))
+
+        # Run 2: cached user ids; 230 new tweets on one timeline -> three pages
+        _, _, lookups = scrape_twitter.lookup_users(session, limiter, list(accounts), scrape_twitter.load_user_ids(conn))
+        # Only the unknown handle is looked up again
+        checks.append(("Cached user ids skip known handles", lookups == 1))
+        FakeX.add_tweets("/2/users/101/tweets", 230, "Ledger Stax shipping", "ledger")
+        FakeX.add_tweets("/2/tweets/search/recent", 5, "Tangem ring", "someone")
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings, limiter)
+        scrape_twitter.save_cursors(conn, results)
+        ledger = next(r for r in results if r['key'] == "@ledger")
+        checks.append(("Second run fetches only the 235 new tweets", len(tweets) == 235))
+        checks.append(("New tweets fetched in 100-tweet pages", ledger['requests'] == 3))
+
+        # Run 3: nothing new
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings, limiter)
+        scrape_twitter.save_cursors(conn, results)
+        checks.append(("Third run finds nothing new", tweets == []))
+
+        # Run 4: the search cursor falls out of the searchable range
+        FakeX.add_tweets("/2/tweets/search/recent", 3, "Tangem news", "someone")
+        FakeX.oldest_search_id = FakeX.next_id
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings, limiter)
+        scrape_twitter.save_cursors(conn, results)
+        checks.append(("Stale since_id falls back to the lookback window", len(tweets) == 3))
+
+        # Run 5: 650 new tweets on one timeline, more than MAX_PAGES_PER_LISTING pages
+        FakeX.add_tweets("/2/users/101/tweets", 650, "Ledger Nano update", "ledger")
+        before = scrape_twitter.load_cursors(conn)["@ledger"]
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings[:1],
+                                                        limiter, scrape_twitter.load_gaps(conn))
+        scrape_twitter.save_cursors(conn, results)
+        fetched = {t['id'] for t in tweets}
+        checks.append(("Page cap truncates the listing and keeps its since_id",
+                       len(tweets) == 500 and results[0]['truncated']
+                       and scrape_twitter.load_cursors(conn)["@ledger"] == before))
+
+        # Run 6: the rest of the range first, then the cursor moves to the newest tweet
+        FakeX.add_tweets("/2/users/101/tweets", 3, "Ledger Nano update", "ledger")
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings[:1],
+                                                        limiter, scrape_twitter.load_gaps(conn))
+        scrape_twitter.save_cursors(conn, results)
+        fetched |= {t['id'] for t in tweets}
+        backlog = {t['id'] for t in FakeX.tweets["/2/users/101/tweets"][3:653]}
+        checks.append(("Truncated range fetched on the next run", len(tweets) == 150 and fetched == backlog))
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings[:1],
+                                                        limiter, scrape_twitter.load_gaps(conn))
+        scrape_twitter.save_cursors(conn, results)
+        checks.append(("Tweets newer than the range come after it", len(tweets) == 3
+                       and not scrape_twitter.load_gaps(conn)))
+
+        stored = scrape_twitter.load_cursors(conn)
+        checks.append(("Cursor persisted as newest id", stored["@ledger"] == FakeX.tweets["/2/users/101/tweets"][0]['id']))
+
+        # Rate windows: 6 searches against a 2-per-second window
+        FakeX.limits["tweets/search/recent"] = (2, 1.0)
+        FakeX.windows.clear()
+        throttled = FakeX.throttled
+        searches = scrape_twitter.get_listings({}, {}, [f"q{i}" for i in range(6)])
+        window_limiter = scrape_twitter.RateWindows({**scrape_twitter.RATE_LIMITS, "tweets/search/recent": 2})
+        _, results = scrape_twitter.fetch_articles(session, {}, searches, window_limiter)
+        checks.append(("Searches wait for the rate window instead of 429s",
+                       all(not r['error'] for r in results) and FakeX.throttled == throttled and window_limiter.waited > 0))
+
+        # A window resetting too far ahead fails the listing and keeps its cursor
+        FakeX.limits["tweets/search/recent"] = (1, 30.0)
+        FakeX.windows.clear()
+        short_limiter = scrape_twitter.RateWindows(max_wait=0.5)
+        scrape_twitter.fetch_articles(session, {}, searches[:1], short_limiter)  # uses up the window
+        FakeX.add_tweets("/2/tweets/search/recent", 2, "Tangem again", "someone")
+        _, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings[2:], short_limiter)
+        scrape_twitter.save_cursors(conn, results)
+        checks.append(("Long rate wait fails the listing", results[0]['error'] and "rate window" in results[0]['error']))
+        checks.append(("Failed listing keeps its cursor",
+                       scrape_twitter.load_cursors(conn)["search:tangem"] == stored["search:tangem"]))
+
+        # Storing the @ledger tweets fails -> only that cursor stays
+        FakeX.add_tweets("/2/users/101/tweets", 4, "Ledger Stax shipping", "ledger")
+        FakeX.add_tweets("/2/users/102/tweets", 2, "Trezor Safe", "trezor")
+        tweets, results = scrape_twitter.fetch_articles(session, scrape_twitter.load_cursors(conn), listings[:2], limiter)
+        failed_tweets = [scrape_twitter.normalize_article(t) for t in tweets if t['author_id'] == "101"]
+        scrape_twitter.save_cursors(conn, results, {"inserted": 0, "errors": 1}, failed_tweets)
+        after = scrape_twitter.load_cursors(conn)
+        checks.append(("Store failure leaves the listing cursor where it was",
+                       after["@ledger"] == stored["@ledger"]
+                       and after["@trezor"] == FakeX.tweets["/2/users/102/tweets"][0]['id']))
+        tweets, _ = scrape_twitter.fetch_articles(session, after, listings[:2], limiter)
+        checks.append(("Tweets that failed to store are fetched again", len(tweets) == 4))
+        conn.close()
+
+    tweet = FakeX.tweets["/2/users/101/tweets"][0]
+    page = {"data": [dict(tweet)], "includes": {"users": [{"id": "101", "username": "Ledger"}],
+            "media": [{"media_key": f"m{tweet['id']}", "url": "https://pbs.example.com/x.jpg"}]}}
+    normalized = scrape_twitter.normalize_article(scrape_twitter.page_tweets(page, ["ledger"])[0])
+    checks.append(("Tweets normalize to the article schema",
+                   normalized['url'] == f"https://x.com/Ledger/status/{tweet['id']}"
+                   and normalized['title'] == f"Ledger Stax shipping {tweet['id']}"
+                   and normalized['image_url'] == "https://pbs.example.com/x.jpg"))
+    checks.append(("Official account counts as competitor mention", normalized['competitors'] == ["Ledger"]))
+
+    server.shutdown()
+
+    failed = 0
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+        failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ Twitter scraper working\n")
+
+if __name__ == "__main__":
+    test_twitter_scraper()
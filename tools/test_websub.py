@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+WebSub Test Script
+Runs a feed with a rel="hub" link and a local fake hub, then checks hub
+discovery during a normal fetch, subscription verification, signed content
+delivery (and rejection of bad signatures), the feed leaving the poll
+schedule while pushed, and lease renewal.
+"""
+
+import hashlib
+import hmac
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scrape_rss
+import websub
+from feed_catalog import open_catalog, add_feed, list_feeds, due_feeds, get_feed
+
+def feed_document(base: str, titles: list) -> bytes:
+    now = datetime.now(timezone.utc)
+    items = "".join(f"""
+    <item>
+      <title>{title}</title>
+      <link>https://example.com/news/{i}</link>
+      <pubDate>{format_datetime(now - timedelta(minutes=i))}</pubDate>
+      <description>Ledger firmware news</description>
+    </item>""" for i, title in enumerate(titles))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel><title>Example</title><link>https://example.com</link><description>News</description>
+    <atom:link rel="hub" href="{base}/hub"/>
+    <atom:link rel="self" href="{base}/feed.xml"/>{items}
+  </channel>
+</rss>""".encode('utf-8')
+
+class FakeHub(BaseHTTPRequestHandler):
+    """Serves /feed.xml and a /hub that verifies subscribers like a real hub."""
+
+    base = None
+    subscriptions = {}  # callback -> {"secret", "topic", "lease"}
+    verified = []       # callbacks that echoed the challenge
+    lease_seconds = 6 * 3600
+    lock = threading.Lock()
+
+    @classmethod
+    def verify(cls, params: dict):
+        """Hub side of the handshake: GET the callback with a challenge."""
+        callback = params['hub.callback']
+        challenge = f"challenge-{time.monotonic_ns()}"
+        response = requests.get(callback, timeout=5, params={
+            "hub.mode": params['hub.mode'],
+            "hub.topic": params['hub.topic'],
+            "hub.challenge": challenge,
+            "hub.lease_seconds": cls.lease_seconds,
+        })
+        if response.status_code == 200 and response.text == challenge:
+            with cls.lock:
+                cls.subscriptions[callback] = {"secret": params['hub.secret'], "topic": params['hub.topic']}
+                cls.verified.append(callback)
+
+    @classmethod
+    def publish(cls, body: bytes, secret: str = None) -> float:
+        """Push content to every verified subscriber; returns the send time."""
+        sent = time.monotonic()
+        for callback, subscription in list(cls.subscriptions.items()):
+            key = (secret or subscription['secret']).encode('utf-8')
+            signature = hmac.new(key, body, hashlib.sha256).hexdigest()
+            requests.post(callback, data=body, timeout=5, headers={
+                "Content-Type": "application/rss+xml",
+                "X-Hub-Signature": f"sha256={signature}",
+            })
+        return sent
+
+    def do_GET(self):
+        body = feed_document(FakeHub.base, ["Ledger news 1", "Ledger news 2"])
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        params = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        self.send_response(202)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        # Verification is asynchronous, after the 202
+        threading.Thread(target=FakeHub.verify, args=(params,), daemon=True).start()
+
+    def log_message(self, format, *args):
+        pass
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_websub():
+    """Test hub discovery, subscription and push delivery against the fake hub."""
+
+    print("\n" + "="*60)
+    print("🧪 Testing WebSub Subscriber")
+    print("="*60 + "\n")
+
+    hub = ThreadingHTTPServer(('127.0.0.1', 0), FakeHub)
+    threading.Thread(target=hub.serve_forever, daemon=True).start()
+    FakeHub.base = f"http://127.0.0.1:{hub.server_port}"
+    feed_url = f"{FakeHub.base}/feed.xml"
+    checks = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.db')
+        catalog = open_catalog(path)
+        with catalog:
+            add_feed(catalog, feed_url, "Example Feed", priority=100, competitor_hints=["Ledger"])
+        feed = next(f for f in list_feeds(catalog) if f['url'] == feed_url)
+
+        # Normal poll discovers the hub
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+        polled = scrape_rss.fetch_articles_from_feed(feed, cutoff, catalog)
+        feed = get_feed(catalog, feed['id'])
+        checks.append(("Poll still returns entries", len(polled) == 2))
+        checks.append(("Hub discovered from rel=hub link", feed['hub_url'] == f"{FakeHub.base}/hub"))
+        checks.append(("Topic taken from rel=self link", feed['topic_url'] == feed_url))
+
+        # Subscribe
+        received = []
+        arrived = threading.Event()
+
+        def process(entries):
+            received.append((time.monotonic(), entries))
+            arrived.set()
+
+        subscriber = websub.WebSubSubscriber("http://127.0.0.1:0", process, catalog_path=path,
+                                             port=0, host='127.0.0.1')
+        subscriber.callback_url = f"http://127.0.0.1:{subscriber.port}"
+        subscriber.start()
+
+        requested = subscriber.renew()
+        checks.append(("Subscription request accepted", requested == 1))
+        checks.append(("Hub verified the callback", wait_for(lambda: FakeHub.verified)))
+
+        feed = get_feed(catalog, feed['id'])
+        now = time.time()
+        checks.append(("Lease stored", abs(feed['push_until'] - (now + FakeHub.lease_seconds)) < 30))
+        checks.append(("Pushed feed leaves the poll schedule",
+                       feed['id'] not in [f['id'] for f in due_feeds(catalog, now + 2 * 3600)]))
+        checks.append(("Nothing to renew right after subscribing", websub.push_renewals(catalog, now) == []))
+
+        # Push
+        sent = FakeHub.publish(feed_document(FakeHub.base, ["Ledger pushed news"]))
+        delivered = arrived.wait(5)
+        latency = (received[0][0] - sent) * 1000 if delivered else None
+        entries = received[0][1] if delivered else []
+        checks.append(("Pushed entry delivered", [e['title'] for e in entries] == ["Ledger pushed news"]))
+        checks.append(("Pushed entry tagged with feed and hints",
+                       entries and entries[0]['_feed_name'] == "Example Feed" and entries[0]['_competitor_hints'] == ["Ledger"]))
+        checks.append(("Push delivered within 1 s", latency is not None and latency < 1000))
+        if entries:
+            normalized = scrape_rss.normalize_article(entries[0])
+            checks.append(("Pushed entry normalizes with competitor", "Ledger" in normalized['competitors']))
+
+        # Bad signature is ignored
+        arrived.clear()
+        FakeHub.publish(feed_document(FakeHub.base, ["Forged"]), secret="wrong")
+        checks.append(("Bad signature ignored", not arrived.wait(0.5) and subscriber.stats['rejected'] == 1))
+
+        # Lease near its end is renewed (same secret)
+        secret = feed['push_secret']
+        FakeHub.verified.clear()
+        requested = subscriber.renew(now=feed['push_until'] - 60)
+        checks.append(("Lease renewed near expiry", requested == 1 and wait_for(lambda: FakeHub.verified)))
+        checks.append(("Secret kept across renewals", get_feed(catalog, feed['id'])['push_secret'] == secret))
+
+        subscriber.stop()
+        catalog.close()
+
+    hub.shutdown()
+
+    failed = 0
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+        failed += 0 if ok else 1
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed\n")
+        sys.exit(1)
+
+    print("\n✅ WebSub subscriber working\n")
+
+if __name__ == "__main__":
+    test_websub()
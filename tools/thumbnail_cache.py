@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Article Thumbnail Cache
+Optional image stage between scoring and storage: downloads each article's
+image_url once, stores a small WebP thumbnail addressed by the content hash
+of the original, and points the stored row at it, so dashboard cards load
+small, predictable assets instead of hotlinking third-party originals.
+
+- Enabled by setting THUMBNAIL_CACHE_DIR; needs Pillow (pip install Pillow),
+  scrapers run unchanged without either
+- Images are fetched concurrently (THUMBNAIL_WORKERS threads); downloads over
+  MAX_IMAGE_BYTES (Content-Length or streamed) and non-image responses are
+  dropped, and image URLs that failed are retried after RETRY_FAILED_HOURS
+- Dedup: an image URL is fetched once (url -> content hash in the local state
+  database), and identical bytes behind different URLs share one thumbnail
+- Thumbnails are <cache>/<sha1[:2]>/<sha1>.webp, at most THUMBNAIL_SIZE, with
+  the original and thumbnail dimensions recorded
+- The cache is kept under THUMBNAIL_CACHE_MB by evicting least recently used
+  thumbnails (every article using one counts as a use)
+- Thumbnails are published to the public `thumbnails` Storage bucket
+  (migration 011; immutable, cached for a year), or served from
+  THUMBNAIL_BASE_URL if the cache directory is hosted directly
+- Stored rows get thumbnail_url, thumbnail_width/height and image_width/height;
+  image_url keeps the original
+
+Usage:
+    python3 tools/thumbnail_cache.py            # Cache statistics
+    python3 tools/thumbnail_cache.py --evict    # Apply the size budget now
+"""
+
+import hashlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+import requests
+
+from local_state import open_state, known_hashes
+
+# Load environment
+load_dotenv()
+
+# Download and thumbnail settings
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000  # Decompression bomb guard
+THUMBNAIL_SIZE = (640, 360)    # 2x the dashboard card image box
+THUMBNAIL_QUALITY = 78
+FETCH_TIMEOUT = 10
+DEFAULT_WORKERS = 8            # Override with THUMBNAIL_WORKERS
+DEFAULT_CACHE_MB = 512         # Override with THUMBNAIL_CACHE_MB
+RETRY_FAILED_HOURS = 24
+USER_AGENT = "Mozilla/5.0 (compatible; CompetitorIntelBot/1.0)"
+
+BUCKET = "thumbnails"
+IMMUTABLE_CACHE_SECONDS = 31536000
+
+def get_cache_dir():
+    """Return the thumbnail cache directory, or None if the stage is disabled."""
+    return os.getenv('THUMBNAIL_CACHE_DIR') or None
+
+def get_cache_budget() -> int:
+    """Return the cache size budget in bytes."""
+    try:
+        return int(float(os.getenv('THUMBNAIL_CACHE_MB', DEFAULT_CACHE_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_CACHE_MB * 1024 * 1024
+
+def ensure_schema(conn):
+    """Create the thumbnail cache tables if missing."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            digest TEXT PRIMARY KEY,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            thumb_width INTEGER NOT NULL,
+            thumb_height INTEGER NOT NULL,
+            bytes INTEGER NOT NULL,
+            public_url TEXT,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_thumbnails_last_used ON thumbnails(last_used);
+        CREATE TABLE IF NOT EXISTS thumbnail_sources (
+            image_url TEXT PRIMARY KEY,
+            digest TEXT,
+            error TEXT,
+            checked_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_thumbnail_sources_digest ON thumbnail_sources(digest);
+    """)
+
+def thumbnail_path(cache_dir: str, digest: str) -> str:
+    """Local path of a thumbnail."""
+    return os.path.join(cache_dir, digest[:2], f"{digest}.webp")
+
+def download_image(url: str, session: requests.Session = None, max_bytes: int = MAX_IMAGE_BYTES) -> bytes:
+    """Download an image, refusing anything larger than max_bytes.
+
+    Raises:
+        ValueError: If the response is not an image or is too large
+        requests.RequestException: On HTTP errors
+    """
+    http = session or requests
+    with http.get(url, timeout=FETCH_TIMEOUT, stream=True, headers={"User-Agent": USER_AGENT}) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            raise ValueError(f"not an image ({content_type.split(';')[0]})")
+
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise ValueError(f"image too large ({int(length) / 1e6:.1f} MB)")
+
+        data = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            data += chunk
+            if len(data) > max_bytes:
+                raise ValueError(f"image too large (over {max_bytes / 1e6:.1f} MB)")
+    return bytes(data)
+
+def make_thumbnail(data: bytes, size: tuple = THUMBNAIL_SIZE) -> tuple:
+    """Decode an image and encode a WebP thumbnail that fits in size.
+
+    Returns:
+        tuple: (webp bytes, (width, height) of the original, (width, height) of the thumbnail)
+
+    Raises:
+        ValueError: If the data is not a decodable image
+    """
+    from PIL import Image, ImageOps
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        original = image.size
+        # EXIF orientations 5-8 are rotated by 90 degrees: record the displayed size
+        if image.getexif().get(0x0112) in (5, 6, 7, 8):
+            original = original[::-1]
+        # JPEG: decode at a reduced scale straight away (much faster for big originals)
+        image.draft('RGB', (size[0] * 2, size[1] * 2))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        image.thumbnail(size, Image.LANCZOS)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ValueError(f"not a decodable image: {e}") from None
+
+    out = io.BytesIO()
+    image.save(out, 'WEBP', quality=THUMBNAIL_QUALITY, method=4)
+    return out.getvalue(), original, image.size
+
+def fetch_thumbnail(url: str, session: requests.Session = None) -> dict:
+    """Download one image and build its thumbnail (runs in a fetch thread).
+
+    Returns:
+        dict: url, digest, webp, size, thumb_size (or url and error)
+    """
+    try:
+        data = download_image(url, session)
+        digest = hashlib.sha1(data).hexdigest()
+        webp, size, thumb_size = make_thumbnail(data)
+        return {"url": url, "digest": digest, "webp": webp, "size": size, "thumb_size": thumb_size}
+    except Exception as e:
+        return {"url": url, "error": str(e)[:300]}
+
+class ThumbnailCache:
+    """Content-addressed thumbnail cache with LRU eviction under a size budget."""
+
+    def __init__(self, cache_dir: str, conn=None, supabase=None, budget: int = None,
+                 base_url: str = None, workers: int = None):
+        """Open the cache.
+
+        Args:
+            cache_dir: Directory holding the thumbnails
+            conn: Local state connection (opened if not given)
+            supabase: Supabase client used to publish thumbnails to Storage
+            budget: Size budget in bytes (default get_cache_budget())
+            base_url: Public URL of cache_dir (default THUMBNAIL_BASE_URL);
+                thumbnails are not uploaded when set
+            workers: Concurrent downloads (default THUMBNAIL_WORKERS)
+        """
+        self.cache_dir = cache_dir
+        self.conn = conn or open_state()
+        self.supabase = supabase
+        self.budget = get_cache_budget() if budget is None else budget
+        self.base_url = (base_url or os.getenv('THUMBNAIL_BASE_URL') or '').rstrip('/') or None
+        self.workers = workers or int(os.getenv('THUMBNAIL_WORKERS', DEFAULT_WORKERS))
+        ensure_schema(self.conn)
+
+    def lookup(self, urls: list, now: float) -> tuple:
+        """Split image URLs into cached thumbnails and URLs to fetch.
+
+        Returns:
+            tuple: (url -> thumbnail row, urls to fetch)
+        """
+        cached, to_fetch = {}, []
+        retry_before = now - RETRY_FAILED_HOURS * 3600
+        for url in urls:
+            row = self.conn.execute("""
+                SELECT s.error, s.checked_at, t.* FROM thumbnail_sources s
+                LEFT JOIN thumbnails t ON t.digest = s.digest
+                WHERE s.image_url = ?
+            """, (url,)).fetchone()
+            if row is None:
+                to_fetch.append(url)
+            elif row['digest'] is not None and os.path.exists(thumbnail_path(self.cache_dir, row['digest'])):
+                cached[url] = dict(row)
+            elif row['error'] is None or row['checked_at'] < retry_before:
+                to_fetch.append(url)
+        return cached, to_fetch
+
+    def add(self, result: dict, now: float) -> dict:
+        """Store a fetched thumbnail (deduplicated by content hash).
+
+        Returns:
+            dict: Thumbnail row, or None if the fetch failed
+        """
+        url = result['url']
+        if 'error' in result:
+            with self.conn:
+                self.conn.execute("""
+                    INSERT INTO thumbnail_sources (image_url, digest, error, checked_at) VALUES (?, NULL, ?, ?)
+                    ON CONFLICT(image_url) DO UPDATE SET digest = NULL, error = excluded.error,
+                        checked_at = excluded.checked_at
+                """, (url, result['error'], now))
+            return None
+
+        digest = result['digest']
+        path = thumbnail_path(self.cache_dir, digest)
+        row = self.conn.execute("SELECT * FROM thumbnails WHERE digest = ?", (digest,)).fetchone()
+        if row is None or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(result['webp'])
+            os.replace(tmp_path, path)
+
+        public_url = row['public_url'] if row else None
+        if public_url is None:
+            public_url = self.publish(digest, result['webp'])
+
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO thumbnails (digest, width, height, thumb_width, thumb_height, bytes, public_url, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(digest) DO UPDATE SET bytes = excluded.bytes,
+                    public_url = COALESCE(excluded.public_url, thumbnails.public_url), last_used = excluded.last_used
+            """, (digest, *result['size'], *result['thumb_size'], len(result['webp']), public_url, now))
+            self.conn.execute("""
+                INSERT INTO thumbnail_sources (image_url, digest, error, checked_at) VALUES (?, ?, NULL, ?)
+                ON CONFLICT(image_url) DO UPDATE SET digest = excluded.digest, error = NULL,
+                    checked_at = excluded.checked_at
+            """, (url, digest, now))
+        return dict(self.conn.execute("SELECT * FROM thumbnails WHERE digest = ?", (digest,)).fetchone())
+
+    def publish(self, digest: str, webp: bytes):
+        """Public URL of a thumbnail, uploading it to Storage if needed (None on failure)."""
+        relative = f"{digest[:2]}/{digest}.webp"
+        if self.base_url:
+            return f"{self.base_url}/{relative}"
+        if self.supabase is None:
+            return None
+        try:
+            bucket = self.supabase.storage.from_(BUCKET)
+            bucket.upload(relative, webp, file_options={
+                "content-type": "image/webp",
+                "cache-control": str(IMMUTABLE_CACHE_SECONDS),
+                "upsert": "true",
+            })
+            return bucket.get_public_url(relative)
+        except Exception as e:
+            print(f"   ⚠️  Could not upload thumbnail {digest[:10]}: {e}")
+            return None
+
+    def attach(self, articles: list, now: float = None) -> dict:
+        """Point articles at cached thumbnails of their image_url.
+
+        Args:
+            articles: Normalized articles (modified in place)
+            now: Current time (for tests)
+
+        Returns:
+            dict: Statistics (images, cached, fetched, failed, evicted)
+        """
+        now = time.time() if now is None else now
+        urls = list(dict.fromkeys(a['image_url'] for a in articles if a.get('image_url')))
+        stats = {"images": len(urls), "cached": 0, "fetched": 0, "failed": 0, "evicted": 0}
+        if not urls:
+            return stats
+
+        thumbnails, to_fetch = self.lookup(urls, now)
+        stats['cached'] = len(thumbnails)
+
+        # Cached but never published (e.g. an earlier upload failed)
+        for thumbnail in thumbnails.values():
+            if thumbnail['public_url'] is None:
+                with open(thumbnail_path(self.cache_dir, thumbnail['digest']), 'rb') as f:
+                    thumbnail['public_url'] = self.publish(thumbnail['digest'], f.read())
+                if thumbnail['public_url']:
+                    with self.conn:
+                        self.conn.execute("UPDATE thumbnails SET public_url = ? WHERE digest = ?",
+                                          (thumbnail['public_url'], thumbnail['digest']))
+
+        if to_fetch:
+            with requests.Session() as session, ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for result in pool.map(lambda url: fetch_thumbnail(url, session), to_fetch):
+                    row = self.add(result, now)
+                    if row:
+                        thumbnails[result['url']] = row
+                        stats['fetched'] += 1
+                    else:
+                        stats['failed'] += 1
+
+        used = set()
+        for article in articles:
+            thumbnail = thumbnails.get(article.get('image_url'))
+            if thumbnail and thumbnail['public_url']:
+                article['thumbnail_url'] = thumbnail['public_url']
+                article['thumbnail_width'] = thumbnail['thumb_width']
+                article['thumbnail_height'] = thumbnail['thumb_height']
+                article['image_width'] = thumbnail['width']
+                article['image_height'] = thumbnail['height']
+                used.add(thumbnail['digest'])
+
+        with self.conn:
+            self.conn.executemany("UPDATE thumbnails SET last_used = ? WHERE digest = ?",
+                                  [(now, digest) for digest in used])
+        stats['evicted'] = self.evict()
+        return stats
+
+    def size(self) -> int:
+        """Bytes of thumbnails in the cache."""
+        return self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM thumbnails").fetchone()[0]
+
+    def evict(self) -> int:
+        """Remove least recently used thumbnails until the cache fits the budget.
+
+        Published copies stay in Storage, so rows already pointing at them keep
+        working; evicted images are fetched again if they come back.
+
+        Returns:
+            int: Number of thumbnails evicted
+        """
+        excess = self.size() - self.budget
+        if excess <= 0:
+            return 0
+
+        victims, freed = [], 0
+        for row in self.conn.execute("SELECT digest, bytes FROM thumbnails ORDER BY last_used, digest"):
+            if freed >= excess:
+                break
+            victims.append(row['digest'])
+            freed += row['bytes']
+
+        for digest in victims:
+            try:
+                os.remove(thumbnail_path(self.cache_dir, digest))
+            except FileNotFoundError:
+                pass
+
+        with self.conn:
+            self.conn.executemany("DELETE FROM thumbnails WHERE digest = ?", [(d,) for d in victims])
+            self.conn.executemany("DELETE FROM thumbnail_sources WHERE digest = ?", [(d,) for d in victims])
+        return len(victims)
+
+def attach_thumbnails(supabase, articles: list) -> dict:
+    """Run the thumbnail stage on new articles about to be stored.
+
+    No-op unless THUMBNAIL_CACHE_DIR is set and Pillow is installed. Never
+    raises: a failing image stage must not fail the scrape.
+
+    Args:
+        supabase: Supabase client (for publishing to Storage)
+        articles: Normalized articles (modified in place)
+
+    Returns:
+        dict or None: Statistics, None when disabled
+    """
+    cache_dir = get_cache_dir()
+    if not cache_dir or not articles:
+        return None
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print(f"   ⚠️  THUMBNAIL_CACHE_DIR is set but Pillow is not installed; skipping thumbnails")
+        return None
+
+    try:
+        cache = ThumbnailCache(cache_dir, supabase=supabase)
+        try:
+            # Stored rows are not rewritten, so only new articles need a thumbnail
+            known = known_hashes(cache.conn, [a['url'] for a in articles])
+            stats = cache.attach([a for a in articles if a['url'] not in known])
+        finally:
+            cache.conn.close()
+        print(f"   🖼  Thumbnails: {stats['images']} images, {stats['cached']} cached, "
+              f"{stats['fetched']} fetched, {stats['failed']} failed, {stats['evicted']} evicted")
+        return stats
+    except Exception as e:
+        print(f"   ⚠️  Thumbnail stage failed: {e}")
+        return None
+
+def main():
+    """Show cache statistics or apply the size budget."""
+    cache_dir = get_cache_dir()
+    if not cache_dir:
+        print("❌ Set THUMBNAIL_CACHE_DIR to use the thumbnail cache")
+        sys.exit(1)
+
+    cache = ThumbnailCache(cache_dir)
+    if '--evict' in sys.argv:
+        print(f"✅ Evicted {cache.evict()} thumbnails")
+
+    count = cache.conn.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0]
+    sources = cache.conn.execute("SELECT COUNT(*) FROM thumbnail_sources WHERE digest IS NOT NULL").fetchone()[0]
+    failed = cache.conn.execute("SELECT COUNT(*) FROM thumbnail_sources WHERE error IS NOT NULL").fetchone()[0]
+    print(f"\n🖼  Thumbnail cache ({cache_dir})")
+    print(f"   Thumbnails: {count} ({cache.size() / 1e6:.1f} MB of {cache.budget / 1e6:.0f} MB)")
+    print(f"   Image URLs: {sources} cached, {failed} failed\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Watchlists
+Named keyword lists matched on top of the competitor config, so one fetch
+and parse pass serves every team instead of one scraper copy per team.
+
+The default list is COMPETITORS (competitors.py); it still drives relevance
+scoring and the `competitors` column. Team lists are read from
+WATCHLISTS_FILE (default tools/watchlists.json, see watchlists.example.json):
+
+    {
+      "exchanges": {
+        "competitors": ["binance", "kraken", "coinbase"],
+        "aliases": {"binance": ["bnb chain"]},
+        "rules": {"kraken": "kraken AND $crypto"},
+        "terms": {"venues": ["exchange", "listing"]}
+      },
+      "payments": ["revolut", "wise", "paypal"]
+    }
+
+Rules use the language of competitor_rules.py and may use RULE_TERMS.
+
+Matching plan:
+- Every team list is added to one RuleMatcher; entries with the same name,
+  aliases and rule are shared across lists
+- Each article is scanned once for all lists; only entries whose words
+  occur have their rule evaluated, and each matched entry is mapped back to
+  the lists that contain it
+- Results are stored per list in `watchlist_tags` ({"exchanges": ["Kraken"]});
+  articles tagged by any list are stored even without a competitor match
+
+Usage:
+    python3 tools/watchlists.py --list
+    python3 tools/watchlists.py "Kraken lists a new token"
+"""
+
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+from competitors import config_hash
+from competitor_rules import RuleMatcher
+
+DEFAULT_WATCHLISTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'watchlists.json')
+
+def get_watchlists_file() -> str:
+    """Return the watchlist config path from the environment."""
+    return os.getenv('WATCHLISTS_FILE') or DEFAULT_WATCHLISTS_FILE
+
+def load_watchlists(path: str = None) -> dict:
+    """Load the team watchlists.
+
+    Args:
+        path: JSON config (default get_watchlists_file()); a missing file
+            means no team watchlists
+
+    Returns:
+        dict: name -> {"competitors", "aliases", "rules", "terms"}, all lowercase
+
+    Raises:
+        ValueError: If the file is not a valid watchlist config
+    """
+    path = path or get_watchlists_file()
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid watchlist config {path}: {e}") from None
+
+    if not isinstance(config, dict):
+        raise ValueError(f"Invalid watchlist config {path}: expected an object of named lists")
+
+    watchlists = {}
+    for name, spec in config.items():
+        if isinstance(spec, list):
+            spec = {"competitors": spec}
+        if not isinstance(spec, dict) or not spec.get("competitors"):
+            raise ValueError(f"Watchlist {name!r} needs a non-empty competitors list")
+        watchlists[name] = {
+            "competitors": [c.lower() for c in spec["competitors"]],
+            "aliases": {k.lower(): v for k, v in (spec.get("aliases") or {}).items()},
+            "rules": {k.lower(): v for k, v in (spec.get("rules") or {}).items()},
+            "terms": spec.get("terms") or {},
+        }
+    return watchlists
+
+def watchlists_version(watchlists: dict) -> str:
+    """Tag version covering the competitor config and the team watchlists.
+
+    Equal to TAG_VERSION while no team watchlists are configured, so adding
+    the first list (or editing one) marks every stored row for re-tagging.
+    """
+    if not watchlists:
+        return config_hash()
+    payload = json.dumps(watchlists, sort_keys=True)
+    return f"{config_hash()}-{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:8]}"
+
+class WatchlistMatcher:
+    """Tags articles against every team watchlist in one scan."""
+
+    def __init__(self, watchlists: dict):
+        """Compile all watchlists into one matcher.
+
+        Args:
+            watchlists: Lists from load_watchlists()
+
+        Raises:
+            ValueError: If a rule is invalid
+        """
+        self.names = list(watchlists)
+        self.version = watchlists_version(watchlists)
+        self.matcher = RuleMatcher([]) if watchlists else None
+        self.owners = {}   # entry index -> [(watchlist, position in it, display name)]
+
+        for name, spec in watchlists.items():
+            try:
+                entries = self.matcher.add_list(spec["competitors"], spec["rules"],
+                                                spec["aliases"], spec["terms"])
+            except ValueError as e:
+                raise ValueError(f"Watchlist {name!r}: {e}") from None
+
+            for position, (entry, competitor) in enumerate(zip(entries, spec["competitors"])):
+                self.owners.setdefault(entry, []).append((name, position, competitor.capitalize()))
+
+    @property
+    def entries(self) -> int:
+        """Distinct entries matched per article (after sharing)."""
+        return len(self.owners)
+
+    def tag(self, fields: tuple) -> dict:
+        """Match an article against every watchlist.
+
+        Args:
+            fields: (title, summary, body) strings
+
+        Returns:
+            dict: watchlist -> matched names (config order), only lists with a match
+        """
+        if self.matcher is None:
+            return {}
+
+        matched, _ = self.matcher.match(fields)
+        tags = {}
+        for entry in matched:
+            for name, position, display in self.owners.get(entry, ()):
+                tags.setdefault(name, []).append((position, display))
+        return {name: [display for _, display in sorted(tags[name])] for name in self.names if name in tags}
+
+@lru_cache(maxsize=1)
+def get_watchlist_matcher() -> WatchlistMatcher:
+    """Shared matcher for the configured watchlists (compiled once per process)."""
+    return WatchlistMatcher(load_watchlists())
+
+def apply_watchlists(articles: list, fields_list: list, relevant: list, tags: list = None) -> list:
+    """Attach watchlist tags to normalized articles.
+
+    Sets `watchlist_tags` and bumps `tag_version` to cover the watchlists.
+    Does nothing while no team watchlists are configured.
+
+    Args:
+        articles: Normalized articles after apply_scores() (modified in place)
+        fields_list: (title, summary, body) per article, same order
+        relevant: Articles kept by apply_scores()
+        tags: Optional precomputed WatchlistMatcher.tag() per article
+            (e.g. from cpu_pool.py workers)
+
+    Returns:
+        list: relevant plus the articles only a team watchlist matched, in
+            the original order
+    """
+    watchlists = get_watchlist_matcher()
+    if watchlists.matcher is None:
+        return relevant
+
+    kept = {id(a) for a in relevant}
+    result = []
+    for a, (article, fields) in enumerate(zip(articles, fields_list)):
+        article['watchlist_tags'] = tags[a] if tags is not None else watchlists.tag(fields)
+        article['tag_version'] = watchlists.version
+        if id(article) in kept or article['watchlist_tags']:
+            result.append(article)
+    return result
+
+def main():
+    """List the watchlists or show which ones a text matches."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    watchlists = load_watchlists()
+    matcher = WatchlistMatcher(watchlists)
+
+    if sys.argv[1] == '--list':
+        print(f"\n📋 Watchlists ({get_watchlists_file()})\n")
+        if not watchlists:
+            print("   ℹ️  No team watchlists configured\n")
+            return
+        for name, spec in watchlists.items():
+            print(f"   {name}: {', '.join(spec['competitors'])}")
+        total = sum(len(spec['competitors']) for spec in watchlists.values())
+        print(f"\n   {total} names, {matcher.entries} distinct entries, version {matcher.version}\n")
+        return
+
+    tags = matcher.tag((" ".join(sys.argv[1:]), '', ''))
+    if not tags:
+        print("ℹ️  No watchlist matched")
+    for name, names in tags.items():
+        print(f"✅ {name}: {', '.join(names)}")
+
+if __name__ == "__main__":
+    main()
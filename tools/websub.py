@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+WebSub Subscriber
+Receives new posts pushed by WebSub (PubSubHubbub) hubs instead of polling.
+
+- scrape_rss.py records the hub of every feed that advertises one
+  (<atom:link rel="hub">, or an HTTP Link header) in the feed catalog
+- This service subscribes to those hubs, with a per-feed HMAC secret, and
+  renews leases RENEW_MARGIN_SECONDS before they end
+- Hubs verify subscriptions (GET with hub.challenge) and push new content
+  (POST) to a small HTTP endpoint: /websub/<feed id>
+- Pushed entries with a valid X-Hub-Signature go through the normal
+  normalize / score / archive / store path (scrape_rss.process_articles)
+- While a lease is active the feed is not polled (its next due time is the
+  lease end, a safety poll); denied or lapsed subscriptions are polled again
+
+The endpoint must be reachable by the hubs: set WEBSUB_CALLBACK_URL to its
+public base URL (e.g. https://intel.example.com) and WEBSUB_PORT to the
+local port.
+
+Usage:
+    python3 tools/websub.py            # Serve and keep subscriptions renewed
+"""
+
+import hashlib
+import hmac
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from dotenv import load_dotenv
+
+from feed_catalog import (open_catalog, get_feed, push_renewals, set_push_secret,
+                          activate_push, deactivate_push)
+from feed_stream import parse_feed_stream, USER_AGENT
+
+# Load environment
+load_dotenv()
+
+DEFAULT_PORT = 8088
+LEASE_SECONDS = 7 * 24 * 3600     # Requested lease (hubs may grant less)
+RENEW_MARGIN_SECONDS = 12 * 3600  # Renew this long before a lease ends
+RENEW_CHECK_SECONDS = 300         # How often the service looks for leases to renew
+MAX_BODY_BYTES = 10 * 1024 * 1024
+CALLBACK_PREFIX = "/websub/"
+
+def verify_signature(secret: str, body: bytes, header: str) -> bool:
+    """Check an X-Hub-Signature header ("sha1=..." / "sha256=...") against the body."""
+    if not secret or not header or '=' not in header:
+        return False
+    method, signature = header.split('=', 1)
+    if method not in ('sha1', 'sha256', 'sha384', 'sha512'):
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, getattr(hashlib, method)).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+class WebSubHandler(BaseHTTPRequestHandler):
+    """Serves hub verification (GET) and content delivery (POST) callbacks."""
+
+    def feed_id(self):
+        path = urlparse(self.path).path
+        if not path.startswith(CALLBACK_PREFIX):
+            return None
+        try:
+            return int(path[len(CALLBACK_PREFIX):].strip('/'))
+        except ValueError:
+            return None
+
+    def reply(self, status: int, body: bytes = b''):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        status, body = self.server.subscriber.verify(self.feed_id(), params)
+        self.reply(status, body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self.reply(413)
+            return
+        body = self.rfile.read(length)
+        self.server.subscriber.deliver(self.feed_id(), body, self.headers.get('X-Hub-Signature'))
+        # Always 2xx so hubs don't retry deliveries we chose to ignore
+        self.reply(202)
+
+    def log_message(self, format, *args):
+        pass
+
+class WebSubSubscriber:
+    """Subscribes to hubs and feeds pushed entries to a processing function."""
+
+    def __init__(self, callback_url: str, process, catalog_path: str = None,
+                 port: int = DEFAULT_PORT, host: str = '0.0.0.0', lease_seconds: int = LEASE_SECONDS):
+        """Create the subscriber.
+
+        Args:
+            callback_url: Public base URL of the endpoint (without /websub/<id>)
+            process: Called with a list of raw entries (feedparser-style dicts)
+            catalog_path: State DB holding the feed catalog (default location if None)
+            port: Local port to listen on (0 picks a free port)
+            host: Local interface to listen on
+            lease_seconds: Lease requested from hubs
+        """
+        self.callback_url = callback_url.rstrip('/')
+        self.process = process
+        self.catalog_path = catalog_path
+        self.lease_seconds = lease_seconds
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        self.deliveries = queue.Queue()
+        self.pending = {}  # feed id -> mode of the request awaiting hub verification
+        self.lock = threading.Lock()
+        self.stats = {"verified": 0, "delivered": 0, "rejected": 0, "entries": 0}
+
+        self.server = ThreadingHTTPServer((host, port), WebSubHandler)
+        self.server.subscriber = self
+        self.port = self.server.server_port
+        self.threads = []
+
+    def start(self):
+        """Start the HTTP endpoint and the delivery worker (background threads)."""
+        for target in (self.server.serve_forever, self.process_deliveries):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Stop serving and wait for queued deliveries to be processed."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.deliveries.put(None)
+        for thread in self.threads:
+            thread.join(timeout=10)
+
+    def callback_for(self, feed_id: int) -> str:
+        return f"{self.callback_url}{CALLBACK_PREFIX}{feed_id}"
+
+    def subscribe(self, feed: dict, mode: str = 'subscribe') -> bool:
+        """Send a (un)subscription request to the feed's hub.
+
+        Returns:
+            bool: True if the hub accepted the request (verification follows)
+        """
+        secret = feed.get('push_secret') or secrets.token_hex(20)
+        catalog = open_catalog(self.catalog_path)
+        try:
+            set_push_secret(catalog, feed['id'], secret)
+        finally:
+            catalog.close()
+
+        with self.lock:
+            self.pending[feed['id']] = mode
+
+        try:
+            response = self.session.post(feed['hub_url'], timeout=30, data={
+                "hub.mode": mode,
+                "hub.topic": feed['topic_url'] or feed['url'],
+                "hub.callback": self.callback_for(feed['id']),
+                "hub.secret": secret,
+                "hub.lease_seconds": str(self.lease_seconds),
+            })
+        except Exception as e:
+            print(f"   ⚠️  WebSub {mode} failed for {feed['name']}: {e}")
+            return False
+
+        if response.status_code not in (202, 204):
+            print(f"   ⚠️  Hub refused {mode} for {feed['name']}: HTTP {response.status_code}")
+            with self.lock:
+                self.pending.pop(feed['id'], None)
+            return False
+        return True
+
+    def renew(self, now: float = None) -> int:
+        """Subscribe every hub feed without a lease or whose lease ends soon.
+
+        Returns:
+            int: Number of subscription requests accepted by hubs
+        """
+        now = time.time() if now is None else now
+        catalog = open_catalog(self.catalog_path)
+        try:
+            feeds = push_renewals(catalog, now + RENEW_MARGIN_SECONDS)
+        finally:
+            catalog.close()
+        return sum(1 for feed in feeds if self.subscribe(feed))
+
+    def verify(self, feed_id, params: dict) -> tuple:
+        """Answer a hub's verification request.
+
+        Returns:
+            tuple: (HTTP status, body)
+        """
+        mode = params.get('hub.mode')
+        catalog = open_catalog(self.catalog_path)
+        try:
+            feed = get_feed(catalog, feed_id) if feed_id is not None else None
+            if feed is None:
+                return 404, b''
+
+            if mode == 'denied':
+                deactivate_push(catalog, feed_id)
+                print(f"   ⚠️  Hub denied the subscription for {feed['name']}: {params.get('hub.reason', '')}")
+                return 200, b''
+
+            with self.lock:
+                expected = self.pending.get(feed_id)
+            topic = feed['topic_url'] or feed['url']
+            if mode not in ('subscribe', 'unsubscribe') or mode != expected or params.get('hub.topic') != topic:
+                return 404, b''
+
+            if mode == 'subscribe':
+                lease = float(params.get('hub.lease_seconds') or self.lease_seconds)
+                activate_push(catalog, feed_id, lease)
+            else:
+                deactivate_push(catalog, feed_id)
+            with self.lock:
+                self.pending.pop(feed_id, None)
+                self.stats['verified'] += 1
+            return 200, params.get('hub.challenge', '').encode('utf-8')
+        finally:
+            catalog.close()
+
+    def deliver(self, feed_id, body: bytes, signature: str):
+        """Check a pushed document's signature and queue its entries."""
+        catalog = open_catalog(self.catalog_path)
+        try:
+            feed = get_feed(catalog, feed_id) if feed_id is not None else None
+        finally:
+            catalog.close()
+
+        if feed is None or not verify_signature(feed['push_secret'], body, signature):
+            with self.lock:
+                self.stats['rejected'] += 1
+            return
+
+        try:
+            entries, _ = parse_feed_stream([body])
+        except Exception as e:
+            print(f"   ⚠️  Unreadable WebSub delivery for {feed['name']}: {e}")
+            return
+
+        for entry in entries:
+            entry['_feed_name'] = feed['name']
+            entry['_competitor_hints'] = feed['competitor_hints']
+        with self.lock:
+            self.stats['delivered'] += 1
+            self.stats['entries'] += len(entries)
+        if entries:
+            self.deliveries.put(entries)
+
+    def process_deliveries(self):
+        """Worker thread: hand queued entries to the processing function."""
+        while True:
+            entries = self.deliveries.get()
+            if entries is None:
+                return
+            try:
+                self.process(entries)
+            except Exception as e:
+                print(f"   ❌ Failed to process pushed entries: {e}")
+
+def main():
+    """Run the WebSub endpoint and keep subscriptions renewed."""
+    from scrape_rss import init_supabase, process_articles
+
+    callback_url = os.getenv('WEBSUB_CALLBACK_URL')
+    if not callback_url:
+        print("❌ Set WEBSUB_CALLBACK_URL to the public URL of this endpoint")
+        sys.exit(2)
+
+    supabase = init_supabase()
+
+    def process(entries: list):
+        stats = process_articles(supabase, entries)
+        print(f"   📥 Pushed: {len(entries)} entries from {entries[0]['_feed_name']} "
+              f"({stats['inserted']} new articles)")
+
+    subscriber = WebSubSubscriber(callback_url, process, port=int(os.getenv('WEBSUB_PORT', DEFAULT_PORT)))
+    subscriber.start()
+
+    print(f"\n{'='*60}")
+    print(f"🚀 WebSub Subscriber Started")
+    print(f"   Listening on port {subscriber.port}, callbacks at {callback_url}{CALLBACK_PREFIX}<feed id>")
+    print(f"{'='*60}\n")
+
+    try:
+        while True:
+            requested = subscriber.renew()
+            if requested:
+                print(f"   🔁 Sent {requested} subscription request(s)")
+            time.sleep(RENEW_CHECK_SECONDS)
+    except KeyboardInterrupt:
+        print(f"\n⏹  Stopping...")
+    finally:
+        subscriber.stop()
+
+if __name__ == "__main__":
+    main()